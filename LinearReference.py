@@ -28,6 +28,13 @@ from PyQt5 import QtCore, QtGui, QtWidgets
 
 from LinearReferencing.map_tools.PolEvt import PolEvt
 from LinearReferencing.map_tools.LolEvt import LolEvt
+from LinearReferencing.tools.RouteIndex import invalidate_route_index
+from LinearReferencing.tools.MyTools import close_sqlite_conns, invalidate_reference_layer_profile
+from LinearReferencing.tools.TransformCache import close_transform_cache
+from LinearReferencing.tools.GeometryCache import invalidate_reference_geom, unwatch_reference_layer
+from LinearReferencing.tools.FeatureIndex import invalidate_feature_value_index
+from LinearReferencing.tools.MaterializedShowLayer import close_materialized_show_layers
+from LinearReferencing.tools.ExpressionFunctions import register_expression_functions, unregister_expression_functions
 
 # pyrcc5-compiled icons,
 # path-like-addressable in all PyQt-scripts of this plugin
@@ -123,6 +130,9 @@ class LinearReference(object):
             self.iface.addPluginToMenu('LinearReferencing', self.qact_ShowHelp)
             self.qact_ShowHelp.setToolTip(MY_DICT.tr('qact_show_help_ttp'))
 
+        # expression-functions lr_point_n, lr_point_m, lr_segment_n, lr_segment_m and lr_locate
+        register_expression_functions()
+
 
     def unload(self):
         """standard-to_implement-function for each plugin:
@@ -147,6 +157,31 @@ class LinearReference(object):
             self.iface.removeToolBarIcon(self.qact_LolEvt)
             self.iface.removePluginMenu('LinearReferencing', self.qact_LolEvt)
 
+        # release the cached route-indexes shared by both MapTools
+        invalidate_route_index()
+
+        # close the spatialite-connections opened by the MapTools and background-threads
+        close_sqlite_conns()
+
+        # release the cached CRS/transforms and disconnect the canvas- and project-signals
+        close_transform_cache()
+
+        # release the cached layer-profiles and disconnect their layer-signals
+        invalidate_reference_layer_profile()
+
+        # release the cached reference-geometries and disconnect the signals of the watched reference-layers
+        invalidate_reference_geom()
+        unwatch_reference_layer()
+
+        # release the attribute-value-indexes and disconnect their layer-signals
+        invalidate_feature_value_index()
+
+        # stop the maintenance of materialized Show-Layers and disconnect their layer-signals
+        close_materialized_show_layers()
+
+        # unregister the expression-functions and disconnect the layer-signals of their reference-sources
+        unregister_expression_functions()
+
 
         self.iface.removeToolBarIcon(self.qact_ShowHelp)
         self.iface.removePluginMenu('LinearReferencing', self.qact_ShowHelp)
@@ -0,0 +1,126 @@
+"""micro-benchmark for the __slots__-versions of LinearReferencing.tools.MyTools.PoLFeature/LoLFeature
+compares creation, attribute-access, __copy__ and memory of 100k instances
+    legacy: class-attribute-defaults, instance-__dict__, __copy__ via dir() + inspect (former implementation)
+    slots: __slots__, defaults set in __init__, field-wise __copy__ (current implementation)
+usage: python console inside QGis
+exec(open('/path/to/LinearReferencing/docs/scripts/benchmark_feature_slots.py').read())
+"""
+import inspect
+import time
+import tracemalloc
+from LinearReferencing.tools.MyTools import PoLFeature, LoLFeature
+
+
+class LegacyPoLFeature:
+    """former implementation, only the properties and __copy__"""
+    data_fid = None
+    geom_defined_by = 'ref_fid'
+    screen_x = None
+    screen_y = None
+    map_x = None
+    map_y = None
+    ref_lyr_id = None
+    ref_fid = None
+    cached_geom = None
+    reference_authid = None
+    snap_x = None
+    snap_y = None
+    snap_z_abs = None
+    snap_n_abs = None
+    snap_n_fract = None
+    snap_m_abs = None
+    snap_m_fract = None
+    is_valid = False
+    last_error = 'not_initialized'
+
+    def __copy__(self):
+        my_clone = LegacyPoLFeature()
+        property_list = [prop for prop in dir(self) if not prop.startswith('__') and not callable(getattr(self, prop)) and not inspect.isclass(getattr(self, prop))]
+        for prop_name in property_list:
+            setattr(my_clone, prop_name, getattr(self, prop_name))
+        if self.cached_geom:
+            my_clone.cached_geom = self.cached_geom
+        return my_clone
+
+
+class LegacyLoLFeature:
+    """former implementation, only the properties and __copy__"""
+    data_fid = None
+    geom_defined_by = 'ref_fid'
+    ref_lyr_id = None
+    ref_fid = None
+    cached_geom = None
+    reference_authid = None
+    pol_from = None
+    pol_to = None
+    offset = 0
+    delta_n_abs = None
+    delta_n_fract = None
+    delta_m_abs = None
+    delta_m_fract = None
+    delta_z_abs = None
+    is_valid = True
+    last_error = ''
+
+    def __copy__(self):
+        my_clone = LegacyLoLFeature()
+        property_list = [prop for prop in dir(self) if not prop.startswith('__') and not callable(getattr(self, prop)) and not inspect.isclass(getattr(self, prop))]
+        for prop_name in property_list:
+            setattr(my_clone, prop_name, getattr(self, prop_name))
+        if self.cached_geom:
+            my_clone.cached_geom = self.cached_geom
+        if self.pol_from:
+            my_clone.pol_from = self.pol_from.__copy__()
+        if self.pol_to:
+            my_clone.pol_to = self.pol_to.__copy__()
+        return my_clone
+
+
+def create_instances(pol_class, lol_class, num_instances):
+    """typical usage: LoLFeature with two PoLFeatures, all stationing-attributes set"""
+    result = []
+    for i in range(num_instances):
+        pol_from = pol_class()
+        pol_to = pol_class()
+        for pol, n_abs in ((pol_from, i * 0.5), (pol_to, i * 0.5 + 10)):
+            pol.ref_lyr_id = 'ref_lyr'
+            pol.ref_fid = i
+            pol.snap_x = pol.snap_y = pol.snap_z_abs = pol.snap_m_abs = n_abs
+            pol.snap_n_abs = n_abs
+            pol.snap_n_fract = pol.snap_m_fract = 0.5
+            pol.is_valid = True
+            pol.last_error = ''
+        lol = lol_class()
+        lol.ref_lyr_id = 'ref_lyr'
+        lol.ref_fid = i
+        lol.pol_from = pol_from
+        lol.pol_to = pol_to
+        lol.offset = 1.5
+        result.append(lol)
+    return result
+
+
+def benchmark(label, pol_class, lol_class, num_instances=100000):
+    tracemalloc.start()
+    start_time = time.perf_counter()
+    instances = create_instances(pol_class, lol_class, num_instances)
+    create_s = time.perf_counter() - start_time
+    memory_mb = tracemalloc.get_traced_memory()[0] / 1024 / 1024
+    tracemalloc.stop()
+
+    start_time = time.perf_counter()
+    total = 0
+    for lol in instances:
+        total += lol.pol_to.snap_n_abs - lol.pol_from.snap_n_abs + lol.offset
+    access_s = time.perf_counter() - start_time
+
+    start_time = time.perf_counter()
+    for lol in instances:
+        lol.__copy__()
+    copy_s = time.perf_counter() - start_time
+
+    print(f"{label:<8} create {create_s:6.3f} s   access {access_s:6.3f} s   copy {copy_s:6.3f} s   memory {memory_mb:7.1f} MB")
+
+
+benchmark('legacy', LegacyPoLFeature, LegacyLoLFeature)
+benchmark('slots', PoLFeature, LoLFeature)
@@ -0,0 +1,132 @@
+"""benchmark for the SQL of the virtual Show-Layers, see sys_create_show_layer in LinearReferencing.map_tools.LolEvt/PolEvt
+compares the former query, which evaluates the route-geometry-expressions per event, with the current query, which joins the per-route sub-select
+the current queries are built with the generators used by the Show-Layers, see MyTools.get_route_sub_select_sql and MyTools.get_data_sub_select_sql
+    old: st_linemerge(ref_lyr.geometry) three times and st_length(st_linemerge(ref_lyr.geometry)) twice per event (LoL Nabs)
+    new: ST_LineMerge and ST_Length once per route, "LIMIT -1" prevents the SQLite query-flattener from copying the expressions back into the outer query
+    string-keys: old join "ON (data_lyr.ref = ref_lyr.id) = True" without index-usage, new join with the materialized data-sub-select
+synthetic network: num_routes reference-lines with num_vertices vertices (N and M), num_events_per_route events per route
+the reference- and data-tables are plain spatialite-tables named like the layer-IDs inside the virtual layer,
+inside QGis the virtual layer additionally converts the geometry on each access to ref_lyr.geometry
+usage: python console inside QGis (plugin LinearReferencing installed, the sqlite3-module of the QGis-python is compiled with extension-support)
+exec(open('/path/to/LinearReferencing/docs/scripts/benchmark_show_layer_sql.py').read())
+
+results 2026-10-17, 1000 routes with 20 vertices, 50000 events, best of 3 runs,
+standalone python 3.11/SQLite 3.40 without mod_spatialite, the used ST_*-functions registered as python-functions (shapely 2.2, WKB-blobs),
+so the absolute times are far higher than with spatialite, the factors show the effect of the saved geometry-function-calls:
+    LoL Nabs        old:  8041.8 ms   new:  4999.3 ms   factor:   1.6
+    LoL Nfract      old:  6826.9 ms   new:  4915.8 ms   factor:   1.4
+    LoL Mabs        old: 10848.9 ms   new: 12366.3 ms   factor:   0.9
+    PoL Nabs        old:  2092.0 ms   new:   658.2 ms   factor:   3.2
+    PoL Nabs str    old:  7227.2 ms   new:   746.1 ms   factor:   9.7
+    LoL Mabs: no saved function-calls with plain tables, the sub-select only saves the per-access geometry-conversion of the virtual table,
+    which is not part of this benchmark, the materialization costs ~10 %
+"""
+import random
+import sqlite3
+import time
+
+from LinearReferencing.tools.MyTools import get_route_sub_select_sql, get_data_sub_select_sql
+
+num_routes = 1000
+num_events_per_route = 50
+num_vertices = 20
+num_runs = 3
+
+# table-names, inside the virtual layer the layer-IDs
+ref_layer_id = 'reference_layer_id'
+ref_m_layer_id = 'reference_m_layer_id'
+data_layer_id = 'data_layer_id'
+data_str_layer_id = 'data_str_layer_id'
+
+data_field_names = ['id', 'ref_id', 'stationing_from', 'stationing_to', 'stationing_fract_from', 'stationing_fract_to', 'offset']
+
+sqlite_conn = sqlite3.connect(':memory:')
+sqlite_conn.enable_load_extension(True)
+sqlite_conn.execute('SELECT load_extension("mod_spatialite")')
+
+sqlite_conn.execute(f"CREATE TABLE '{ref_layer_id}' (id INTEGER PRIMARY KEY, route_code TEXT, geometry BLOB)")
+sqlite_conn.execute(f"CREATE TABLE '{ref_m_layer_id}' (id INTEGER PRIMARY KEY, geometry BLOB)")
+sqlite_conn.execute(f"CREATE TABLE '{data_layer_id}' (id INTEGER PRIMARY KEY, ref_id INTEGER, stationing_from REAL, stationing_to REAL, stationing_fract_from REAL, stationing_fract_to REAL, offset REAL)")
+# same events with string-key, f.e. route-codes like 'R-00012'
+sqlite_conn.execute(f"CREATE TABLE '{data_str_layer_id}' (id INTEGER PRIMARY KEY, ref_id TEXT, stationing_from REAL, stationing_to REAL, stationing_fract_from REAL, stationing_fract_to REAL, offset REAL)")
+
+random.seed(1)
+for route_id in range(1, num_routes + 1):
+    vertices = [(x * 100, random.uniform(-20, 20)) for x in range(num_vertices)]
+    wkt = "LINESTRING(" + ','.join(f"{x} {y}" for x, y in vertices) + ")"
+    # strict ascending M-values => valid trajectory
+    wkt_m = "LINESTRING M(" + ','.join(f"{x} {y} {x}" for x, y in vertices) + ")"
+    sqlite_conn.execute(f"INSERT INTO '{ref_layer_id}' (id, route_code, geometry) VALUES (?, ?, ST_GeomFromText(?, 25832))", (route_id, f"R-{route_id:05d}", wkt))
+    sqlite_conn.execute(f"INSERT INTO '{ref_m_layer_id}' (id, geometry) VALUES (?, ST_GeomFromText(?, 25832))", (route_id, wkt_m))
+
+route_length = (num_vertices - 1) * 100
+data_rows = []
+for route_id in range(1, num_routes + 1):
+    for event_i in range(num_events_per_route):
+        stationing_from = random.uniform(0, route_length * 0.9)
+        stationing_to = random.uniform(stationing_from, route_length)
+        data_rows.append((route_id, stationing_from, stationing_to, stationing_from / route_length, stationing_to / route_length, random.uniform(-10, 10)))
+sqlite_conn.executemany(f"INSERT INTO '{data_layer_id}' (ref_id, stationing_from, stationing_to, stationing_fract_from, stationing_fract_to, offset) VALUES (?, ?, ?, ?, ?, ?)", data_rows)
+sqlite_conn.executemany(f"INSERT INTO '{data_str_layer_id}' (ref_id, stationing_from, stationing_to, stationing_fract_from, stationing_fract_to, offset) VALUES (?, ?, ?, ?, ?, ?)", [(f"R-{data_row[0]:05d}",) + data_row[1:] for data_row in data_rows])
+sqlite_conn.commit()
+
+
+def old_from_sql(ref_table: str) -> str:
+    """former join of data- and reference-layer"""
+    return f"\nFROM '{data_layer_id}' as data_lyr INNER JOIN '{ref_table}' as ref_lyr ON data_lyr.'ref_id' = ref_lyr.'id'"
+
+
+def new_from_sql(ref_table: str, lr_mode: str) -> str:
+    """current join with the per-route sub-select, same as sys_create_show_layer"""
+    return f"\nFROM '{data_layer_id}' as data_lyr INNER JOIN {get_route_sub_select_sql(ref_table, 'id', lr_mode)} as ref_lyr ON data_lyr.'ref_id' = ref_lyr.route_id"
+
+
+queries = {
+    'LoL Nabs': (
+        """SELECT data_lyr.id, ST_OffsetCurve(ST_Line_Substring(st_linemerge(ref_lyr.geometry), data_lyr.stationing_from/st_length(st_linemerge(ref_lyr.geometry)), data_lyr.stationing_to/st_length(st_linemerge(ref_lyr.geometry))), data_lyr.offset)""" + old_from_sql(ref_layer_id),
+        """SELECT data_lyr.id, ST_OffsetCurve(ST_Line_Substring(ref_lyr.merged_geom, data_lyr.stationing_from/ref_lyr.merged_length, data_lyr.stationing_to/ref_lyr.merged_length), data_lyr.offset)""" + new_from_sql(ref_layer_id, 'Nabs'),
+    ),
+    'LoL Nfract': (
+        """SELECT data_lyr.id, ST_OffsetCurve(ST_Line_Substring(ST_LineMerge(ref_lyr.geometry), data_lyr.stationing_fract_from, data_lyr.stationing_fract_to), data_lyr.offset)""" + old_from_sql(ref_layer_id),
+        """SELECT data_lyr.id, ST_OffsetCurve(ST_Line_Substring(ref_lyr.merged_geom, data_lyr.stationing_fract_from, data_lyr.stationing_fract_to), data_lyr.offset)""" + new_from_sql(ref_layer_id, 'Nfract'),
+    ),
+    'LoL Mabs': (
+        """SELECT data_lyr.id, ST_OffsetCurve(ST_Line_Substring(ref_lyr.geometry, ST_Line_Locate_Point(ref_lyr.geometry, ST_TrajectoryInterpolatePoint(ref_lyr.geometry, data_lyr.stationing_from)), ST_Line_Locate_Point(ref_lyr.geometry, ST_TrajectoryInterpolatePoint(ref_lyr.geometry, data_lyr.stationing_to))), data_lyr.offset)""" + old_from_sql(ref_m_layer_id),
+        """SELECT data_lyr.id, ST_OffsetCurve(ST_Line_Substring(ref_lyr.route_geom, ST_Line_Locate_Point(ref_lyr.route_geom, ST_TrajectoryInterpolatePoint(ref_lyr.route_geom, data_lyr.stationing_from)), ST_Line_Locate_Point(ref_lyr.route_geom, ST_TrajectoryInterpolatePoint(ref_lyr.route_geom, data_lyr.stationing_to))), data_lyr.offset)""" + new_from_sql(ref_m_layer_id, 'Mabs'),
+    ),
+    'PoL Nabs': (
+        """SELECT data_lyr.id, ST_Line_Interpolate_Point(st_linemerge(ref_lyr.geometry), data_lyr.stationing_from/st_length(st_linemerge(ref_lyr.geometry)))""" + old_from_sql(ref_layer_id),
+        """SELECT data_lyr.id, ST_Line_Interpolate_Point(ref_lyr.merged_geom, data_lyr.stationing_from/ref_lyr.merged_length)""" + new_from_sql(ref_layer_id, 'Nabs'),
+    ),
+    'PoL Nabs str': (
+        f"""SELECT data_lyr.id, ST_Line_Interpolate_Point(st_linemerge(ref_lyr.geometry), data_lyr.stationing_from/st_length(st_linemerge(ref_lyr.geometry)))
+FROM '{data_str_layer_id}' as data_lyr INNER JOIN '{ref_layer_id}' as ref_lyr ON (data_lyr.'ref_id' = ref_lyr.'route_code') = True""",
+        f"""SELECT data_lyr.id, ST_Line_Interpolate_Point(ref_lyr.merged_geom, data_lyr.stationing_from/ref_lyr.merged_length)
+FROM {get_data_sub_select_sql(data_str_layer_id, data_field_names)} as data_lyr INNER JOIN {get_route_sub_select_sql(ref_layer_id, 'route_code', 'Nabs')} as ref_lyr ON data_lyr.'ref_id' = ref_lyr.route_id""",
+    ),
+}
+
+
+def run_query(sql: str) -> tuple:
+    """best of num_runs
+    :returns: tuple(duration in ms, number of result-rows, number of result-geometries)
+    """
+    best_ms = None
+    for run_i in range(num_runs):
+        start = time.perf_counter()
+        rows = sqlite_conn.execute(sql).fetchall()
+        duration_ms = (time.perf_counter() - start) * 1000
+        if best_ms is None or duration_ms < best_ms:
+            best_ms = duration_ms
+    return best_ms, len(rows), sum(1 for row in rows if row[1] is not None)
+
+
+print(f"{num_routes} routes with {num_vertices} vertices, {num_routes * num_events_per_route} events, best of {num_runs} runs")
+for query_name, (old_sql, new_sql) in queries.items():
+    old_ms, old_num_rows, old_num_geoms = run_query(old_sql)
+    new_ms, new_num_rows, new_num_geoms = run_query(new_sql)
+    # check: same result
+    assert (old_num_rows, old_num_geoms) == (new_num_rows, new_num_geoms), query_name
+    print(f"{query_name:<15} old: {old_ms:8.1f} ms   new: {new_ms:8.1f} ms   factor: {old_ms / new_ms:5.1f}   ({new_num_geoms} geometries)")
+
+sqlite_conn.close()
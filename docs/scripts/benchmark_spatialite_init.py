@@ -0,0 +1,39 @@
+"""benchmark for the spatialite-initialisation in LinearReferencing.tools.MyTools
+compares the former eager import-time-init with the current lazy lightweight init, see MyTools.get_sqlite_conn
+    eager_full: load_extension("mod_spatialite") + InitSpatialMetaData() on every plugin-import (former behaviour)
+    lazy_light: load_extension("mod_spatialite") without InitSpatialMetaData(), only on first usage
+    import: nothing, the cost of the plugin-import, if the spatialite-functions are never used (current behaviour)
+usage: python console inside QGis (the sqlite3-module of the QGis-python is compiled with extension-support)
+exec(open('/path/to/LinearReferencing/docs/scripts/benchmark_spatialite_init.py').read())
+or standalone python with extension-enabled sqlite3 and mod_spatialite in library-path
+"""
+import sqlite3
+import timeit
+
+
+def init_eager_full():
+    sqlite_conn = sqlite3.connect(':memory:')
+    sqlite_conn.enable_load_extension(True)
+    sqlite_conn.execute('SELECT load_extension("mod_spatialite")')
+    sqlite_conn.execute('SELECT InitSpatialMetaData();')
+    sqlite_conn.close()
+
+
+def init_lazy_light():
+    sqlite_conn = sqlite3.connect(':memory:')
+    sqlite_conn.enable_load_extension(True)
+    sqlite_conn.execute('SELECT load_extension("mod_spatialite")')
+    # check: the used functions work without metadata-tables
+    sqlite_conn.execute("SELECT ST_IsValidTrajectory(ST_GeomFromText('LINESTRING M(0 0 0, 10 0 10)'))").fetchone()
+    sqlite_conn.close()
+
+
+num_runs = 20
+
+eager_full_ms = timeit.timeit(init_eager_full, number=num_runs) / num_runs * 1000
+lazy_light_ms = timeit.timeit(init_lazy_light, number=num_runs) / num_runs * 1000
+
+print(f"eager_full (former, on every plugin-import): {eager_full_ms:.1f} ms")
+print(f"lazy_light (on first spatialite-usage):      {lazy_light_ms:.1f} ms")
+print(f"saved on plugin-import:                      {eager_full_ms:.1f} ms")
+print(f"saved on first spatialite-usage:             {eager_full_ms - lazy_light_ms:.1f} ms")
@@ -43,7 +43,13 @@ import numpy as np
 from PyQt5 import QtCore, QtGui, QtWidgets
 
 from LinearReferencing import tools, dialogs
-from LinearReferencing.tools.MyTools import PoLFeature, LoLFeature
+from LinearReferencing.tools.MyTools import PoLFeature, LoLFeature, PoLOutputs, LR_MODE_OUTPUTS, get_reference_layer_profile, invalidate_reference_layer_profile
+from LinearReferencing.tools.RouteIndex import get_route_index, invalidate_route_index
+from LinearReferencing.tools.EventTable import EventTable
+from LinearReferencing.tools.GeometryCache import get_reference_geom, invalidate_reference_geom, watch_reference_layer
+from LinearReferencing.tools.FeatureIndex import RouteEventIndex, get_feature_value_index, get_route_event_index, set_feature_value_index_dirty
+from LinearReferencing.tools.MaterializedShowLayer import create_materialized_show_layer, get_materialized_show_layer, get_source_settings, is_materialized_show_layer
+from LinearReferencing.tools.TransformCache import get_transform, get_canvas_crs, transform_coords, invalidate_canvas_crs, invalidate_transforms
 from LinearReferencing.qt import MyQtWidgets
 from LinearReferencing.tools.MyDebugFunctions import debug_log, debug_print, get_debug_pos, get_debug_file_line
 from LinearReferencing.i18n.SQLiteDict import SQLiteDict
@@ -87,15 +93,16 @@ class SessionData:
     edit_feature = None
 
     # current selected post-processing-Feature, type LoLFeature
-    # po_pro_cached_feature available via self.session_data.po_pro_data_cache[po_pro_feature.data_fid]
+    # cached stationings available via self.session_data.po_pro_data_cache.row(po_pro_feature.data_fid)
     # po_pro_cached_geom available via self.session_data.po_pro_reference_cache[po_pro_feature.ref_fid]
     po_pro_feature = None
 
     # list of selected Data-Layer-fids (integers) for "Feature-Selection"
     selected_fids = []
 
-    # dictionary for cached data-features, key = fid of data-layer, value collections.namedtuple with properties StationingN and StationingM
-    po_pro_data_cache = {}
+    # cached data-features, one row per fid of data-layer with the stationings on the cached reference-geometry, type EventTable
+    # stationing_from/stationing_to in lrMode, n_abs_from/n_abs_to, offset and ref_fid of the cached LoL-Feature
+    po_pro_data_cache = EventTable()
 
     # dictionary of cached geometries, key = fid of reference-layer, value original version of geometry
     po_pro_reference_cache = {}
@@ -1588,7 +1595,7 @@ class LolEvt(qgis.gui.QgsMapToolEmitPoint):
 
                 # calculate the new offset from event-position allready on mousePress
                 point_geom = qgis.core.QgsGeometry.fromPointXY(event.mapPoint())
-                point_geom.transform(qgis.core.QgsCoordinateTransform(self.iface.mapCanvas().mapSettings().destinationCrs(), self.derived_settings.refLyr.crs(), qgis.core.QgsProject.instance()))
+                point_geom.transform(get_transform(get_canvas_crs(), self.derived_settings.refLyr.crs()))
                 point_on_line = reference_geom.closestSegmentWithContext(point_geom.asPoint())
                 sqr_dist = point_on_line[0]
                 # <0 left, >0 right, ==0 on the line
@@ -1616,7 +1623,7 @@ class LolEvt(qgis.gui.QgsMapToolEmitPoint):
                 reference_geom, error_msg = self.tool_get_reference_geom(ref_fid=self.session_data.measure_feature.ref_fid)
                 if reference_geom:
                     point_geom = qgis.core.QgsGeometry.fromPointXY(event.mapPoint())
-                    point_geom.transform(qgis.core.QgsCoordinateTransform(self.iface.mapCanvas().mapSettings().destinationCrs(), self.derived_settings.refLyr.crs(), qgis.core.QgsProject.instance()))
+                    point_geom.transform(get_transform(get_canvas_crs(), self.derived_settings.refLyr.crs()))
                     point_on_line = reference_geom.closestSegmentWithContext(point_geom.asPoint())
                     sqr_dist = point_on_line[0]
                     # <0 left, >0 right, ==0 on the line
@@ -1702,7 +1709,7 @@ class LolEvt(qgis.gui.QgsMapToolEmitPoint):
                 up_pt_map = event.mapPoint()
 
             selection_geom = qgis.core.QgsGeometry.fromRect(qgis.core.QgsRectangle(down_pt_map, up_pt_map))
-            selection_geom.transform(qgis.core.QgsCoordinateTransform(self.iface.mapCanvas().mapSettings().destinationCrs(), self.derived_settings.refLyr.crs(), qgis.core.QgsProject.instance()))
+            selection_geom.transform(get_transform(get_canvas_crs(), self.derived_settings.refLyr.crs()))
 
             request = qgis.core.QgsFeatureRequest()
             request.setFilterRect(selection_geom.boundingBox())
@@ -2099,7 +2106,7 @@ class LolEvt(qgis.gui.QgsMapToolEmitPoint):
                 self.session_data.pol_mouse_down = self.session_data.edit_feature.pol_from.__copy__()
 
                 point_geom = qgis.core.QgsGeometry.fromPointXY(event.mapPoint())
-                point_geom.transform(qgis.core.QgsCoordinateTransform(self.iface.mapCanvas().mapSettings().destinationCrs(), self.derived_settings.refLyr.crs(), qgis.core.QgsProject.instance()))
+                point_geom.transform(get_transform(get_canvas_crs(), self.derived_settings.refLyr.crs()))
                 point_on_line = reference_geom.closestSegmentWithContext(point_geom.asPoint())
                 sqr_dist = point_on_line[0]
                 # <0 left, >0 right, ==0 on the line
@@ -2119,7 +2126,7 @@ class LolEvt(qgis.gui.QgsMapToolEmitPoint):
             reference_geom, error_msg = self.tool_get_reference_geom(ref_fid=self.session_data.edit_feature.ref_fid)
             if reference_geom:
                 point_geom = qgis.core.QgsGeometry.fromPointXY(event.mapPoint())
-                point_geom.transform(qgis.core.QgsCoordinateTransform(self.iface.mapCanvas().mapSettings().destinationCrs(), self.derived_settings.refLyr.crs(), qgis.core.QgsProject.instance()))
+                point_geom.transform(get_transform(get_canvas_crs(), self.derived_settings.refLyr.crs()))
                 point_on_line = reference_geom.closestSegmentWithContext(point_geom.asPoint())
                 sqr_dist = point_on_line[0]
                 # <0 left, >0 right, ==0 on the line
@@ -2138,7 +2145,7 @@ class LolEvt(qgis.gui.QgsMapToolEmitPoint):
             reference_geom, error_msg = self.tool_get_reference_geom(ref_fid=self.session_data.edit_feature.ref_fid)
             if reference_geom:
                 point_geom = qgis.core.QgsGeometry.fromPointXY(event.mapPoint())
-                point_geom.transform(qgis.core.QgsCoordinateTransform(self.iface.mapCanvas().mapSettings().destinationCrs(), self.derived_settings.refLyr.crs(), qgis.core.QgsProject.instance()))
+                point_geom.transform(get_transform(get_canvas_crs(), self.derived_settings.refLyr.crs()))
                 point_on_line = reference_geom.closestSegmentWithContext(point_geom.asPoint())
                 sqr_dist = point_on_line[0]
                 # <0 left, >0 right, ==0 on the line
@@ -2509,6 +2516,10 @@ class LolEvt(qgis.gui.QgsMapToolEmitPoint):
             for cl in qgis.core.QgsProject.instance().mapLayers().values():
                 if cl.isValid() and cl.dataProvider().name() == 'virtual' and layer_id in cl.dataProvider().uri().uri():
                     affected_virtual_layer_ids.append(cl.id())
+                # Rev. 2026-10-17
+                # materialized Show-Layer, the source-layers are stored in a custom property
+                elif cl.isValid() and is_materialized_show_layer(cl) and layer_id in get_source_settings(cl).values():
+                    affected_virtual_layer_ids.append(cl.id())
 
             # check if it was a plugin-used layer
             re_init_dialog |= layer_id in [self.stored_settings.refLyrId, self.stored_settings.dataLyrId, self.stored_settings.showLyrId]
@@ -2709,7 +2720,7 @@ class LolEvt(qgis.gui.QgsMapToolEmitPoint):
         self.my_dialog.pb_open_show_tbl.pressed.connect(self.s_open_show_tbl)
         self.my_dialog.pb_open_show_tbl_2.pressed.connect(self.s_open_show_tbl)
         self.my_dialog.pb_edit_show_layer_display_expression.pressed.connect(self.s_define_show_layer_display_expression)
-        self.my_dialog.pbtn_create_show_layer.pressed.connect(self.sys_create_show_layer)
+        self.my_dialog.pbtn_create_show_layer.pressed.connect(self.s_create_show_layer)
 
         self.my_dialog.qcbn_show_layer_back_reference_field.currentIndexChanged.connect(self.ssc_show_layer_back_reference_field)
 
@@ -2774,6 +2785,24 @@ class LolEvt(qgis.gui.QgsMapToolEmitPoint):
 
         self.my_dialog.status_bar.clearMessage()
 
+    def dlg_get_visible_outputs(self) -> PoLOutputs:
+        """PoLOutputs of the expanded measure-groups in dialog, only these are read from the PoLFeatures and calculated, see PoLFeature.recalc_by_stationing
+        Note: isHidden instead of isVisible, which would be False, if the dialog itself is not shown
+        """
+        # Rev. 2026-10-17
+        visible_outputs = PoLOutputs.NONE
+        if self.my_dialog:
+            if not self.my_dialog.qlbl_n_fract.isHidden():
+                visible_outputs |= PoLOutputs.N_FRACT
+            if self.SVS.REFERENCE_LAYER_M_ENABLED in self.system_vs:
+                if not self.my_dialog.qlbl_m_abs.isHidden():
+                    visible_outputs |= PoLOutputs.M_ABS
+                if not self.my_dialog.qlbl_m_fract.isHidden():
+                    visible_outputs |= PoLOutputs.M_FRACT
+            if self.SVS.REFERENCE_LAYER_Z_ENABLED in self.system_vs and not self.my_dialog.qlbl_z.isHidden():
+                visible_outputs |= PoLOutputs.Z_ABS
+        return visible_outputs
+
     def dlg_toggle_n_abs_grp(self):
         """toggle visibility of dialog-part"""
         # Rev. 2024-07-28
@@ -2823,6 +2852,9 @@ class LolEvt(qgis.gui.QgsMapToolEmitPoint):
             self.my_dialog.pb_toggle_n_fract_grp.setIcon(minus_icon)
             for wdg in toggle_widgets:
                 wdg.setVisible(True)
+            # the values of this group are calculated lazily, see dlg_get_visible_outputs
+            if self.session_data.measure_feature is not None:
+                self.dlg_refresh_measurements(self.session_data.measure_feature)
 
     def dlg_toggle_m_abs_grp(self):
         """toggle visibility of dialog-part"""
@@ -2849,6 +2881,9 @@ class LolEvt(qgis.gui.QgsMapToolEmitPoint):
             self.my_dialog.pb_toggle_m_abs_grp.setIcon(minus_icon)
             for wdg in toggle_widgets:
                 wdg.setVisible(True)
+            # the values of this group are calculated lazily, see dlg_get_visible_outputs
+            if self.session_data.measure_feature is not None:
+                self.dlg_refresh_measurements(self.session_data.measure_feature)
 
     def dlg_toggle_m_fract_grp(self):
         """toggle visibility of dialog-part"""
@@ -2875,6 +2910,9 @@ class LolEvt(qgis.gui.QgsMapToolEmitPoint):
             self.my_dialog.pb_toggle_m_fract_grp.setIcon(minus_icon)
             for wdg in toggle_widgets:
                 wdg.setVisible(True)
+            # the values of this group are calculated lazily, see dlg_get_visible_outputs
+            if self.session_data.measure_feature is not None:
+                self.dlg_refresh_measurements(self.session_data.measure_feature)
 
     def dlg_toggle_z_grp(self):
         """toggle visibility of dialog-part"""
@@ -2900,6 +2938,9 @@ class LolEvt(qgis.gui.QgsMapToolEmitPoint):
             self.my_dialog.pb_toggle_z_grp.setIcon(minus_icon)
             for wdg in toggle_widgets:
                 wdg.setVisible(True)
+            # the values of this group are calculated lazily, see dlg_get_visible_outputs
+            if self.session_data.measure_feature is not None:
+                self.dlg_refresh_measurements(self.session_data.measure_feature)
 
     def dlg_refresh_stored_settings_section(self):
         """re-populates the list with the stored Configurations"""
@@ -3074,6 +3115,8 @@ class LolEvt(qgis.gui.QgsMapToolEmitPoint):
             if layer == self.derived_settings.refLyr:
                 if conn_signal == 'subsetStringChanged':
                     # filter altered or cleared
+                    self.sys_set_show_layer_index_dirty()
+                    invalidate_reference_geom(layer_id)
                     self.dlg_refresh_feature_selection_section()
                     self.dlg_refresh_qcbn_reference_feature()
                     self.dlg_refresh_po_pro_section()
@@ -3089,11 +3132,14 @@ class LolEvt(qgis.gui.QgsMapToolEmitPoint):
                         self.dlg_append_log_message('INFO',MY_DICT.tr('reset_po_pro_cache'))
 
                     self.session_data.po_pro_reference_cache = {}
-                    self.session_data.po_pro_data_cache = {}
+                    self.session_data.po_pro_data_cache = EventTable()
                     self.dlg_refresh_po_pro_section()
                     self.cvs_hide_markers(['cnf', 'cnt', 'csgn', 'crfl', 'cuca', 'cacu'])
                 elif conn_signal == 'afterCommitChanges':
                     # edits in reference-layer committed
+                    # cached reference-geometries could be outdated (f.e. provider-side triggers), invalidated before sys_refresh_po_pro_data_cache
+                    self.sys_set_show_layer_index_dirty()
+                    invalidate_reference_geom(layer_id)
                     self.sys_refresh_po_pro_data_cache()
                     self.dlg_refresh_po_pro_section()
                     if len(self.session_data.po_pro_data_cache):
@@ -3104,11 +3150,16 @@ class LolEvt(qgis.gui.QgsMapToolEmitPoint):
                         self.my_dialog.tbw_central.setCurrentIndex(2)
                 elif conn_signal == 'editCommandEnded':
                     # reference-feature possibly modified (update/insert/delete), not yet committed
+                    self.sys_set_show_layer_index_dirty()
                     self.dlg_refresh_po_pro_section()
                     self.dlg_refresh_feature_selection_section()
                     self.dlg_refresh_qcbn_reference_feature()
                 elif conn_signal == 'editingStopped':
                     # possibly modified (update/insert/delete) reference-feature, committed or rollbacked
+                    # rollback restores the previous geometries without geometryChanged => cached route-indexes of this layer are outdated
+                    self.sys_set_show_layer_index_dirty()
+                    invalidate_route_index(layer_id)
+                    invalidate_reference_geom(layer_id)
                     self.dlg_refresh_po_pro_section()
                     self.dlg_refresh_feature_selection_section()
                     self.dlg_refresh_qcbn_reference_feature()
@@ -3120,10 +3171,24 @@ class LolEvt(qgis.gui.QgsMapToolEmitPoint):
                     fid = kwargs['fid']
                     current_geom = kwargs['geometry']
 
+                    invalidate_route_index(layer_id, fid)
+                    invalidate_reference_geom(layer_id, [fid])
+
                     self.sys_refresh_po_pro_reference_cache(fid, current_geom)
 
 
+                elif conn_signal == 'featuresDeleted':
+                    # reference-features deleted in edit-buffer, the cached geometries and route-indexes are removed
+                    # see editCommandEnded for dialog-canvas-refresh
+                    for fid in kwargs['fids']:
+                        invalidate_route_index(layer_id, fid)
+                    invalidate_reference_geom(layer_id, kwargs['fids'])
                 elif conn_signal == 'crsChanged':
+                    invalidate_route_index(layer_id)
+                    invalidate_reference_geom(layer_id)
+                    invalidate_transforms()
+                    # explicit, because the profile-slot could be called after this slot
+                    invalidate_reference_layer_profile(layer_id)
                     self.sys_check_settings()
                     self.dlg_apply_ref_lyr_crs()
 
@@ -3190,6 +3255,7 @@ class LolEvt(qgis.gui.QgsMapToolEmitPoint):
                     in forms on submit
                     no access to altered data, therefore use attributeValueChanged
                     """
+                    self.sys_set_show_layer_index_dirty()
                     # self.cvs_hide_markers()
 
                     if self.SVS.REFERENCE_AND_DATA_LAYER_COMPLETE in self.system_vs:
@@ -3217,6 +3283,7 @@ class LolEvt(qgis.gui.QgsMapToolEmitPoint):
                         featureAdded (once for every feature => insert in QGis with positive fid)
                         featuresDeleted (once for all features => delete in QGis the features with negative fid)
                     """
+                    self.sys_set_show_layer_index_dirty()
 
                     fid = kwargs['fid']
 
@@ -3235,6 +3302,7 @@ class LolEvt(qgis.gui.QgsMapToolEmitPoint):
                 elif conn_signal == 'editingStopped':
                     # Emitted when editing-session on this layer has ended.
                     # some checks because of altered self.derived_settings and enable/disable of some edit-buttons
+                    self.sys_set_show_layer_index_dirty()
 
                     # set system_vs (instead of sys_check_settings) to disable some edit-buttons
 
@@ -3250,6 +3318,7 @@ class LolEvt(qgis.gui.QgsMapToolEmitPoint):
                     # layer can not be in edit-mode, so reload without danger of loosing uncommitted features
                     # self.derived_settings.dataLyr.dataProvider().reloadData()
                     # self.derived_settings.dataLyr.reload()
+                    self.sys_set_show_layer_index_dirty()
 
                     self.dlg_refresh_feature_selection_section()
                     self.dlg_refresh_po_pro_section()
@@ -3281,6 +3350,7 @@ class LolEvt(qgis.gui.QgsMapToolEmitPoint):
                     # see committedFeaturesRemoved
                     # see editCcommandEnded for dialog-canvas-refresh
                     # fids = kwargs['fids']
+                    self.sys_set_show_layer_index_dirty()
 
                     self.dlg_refresh_feature_selection_section()
                     self.dlg_refresh_po_pro_section()
@@ -3297,6 +3367,7 @@ class LolEvt(qgis.gui.QgsMapToolEmitPoint):
                     self.dlg_refresh_po_pro_section()
                 elif conn_signal == 'afterCommitChanges':
                     # Emitted after changes are committed to the data provider.
+                    self.sys_set_show_layer_index_dirty()
                     self.dlg_refresh_feature_selection_section()
                     self.dlg_refresh_po_pro_section()
                 elif conn_signal == 'committedFeaturesRemoved':
@@ -3344,7 +3415,8 @@ class LolEvt(qgis.gui.QgsMapToolEmitPoint):
         # Rev. 2024-06-22
         if self.my_dialog and self.SVS.REFERENCE_LAYER_USABLE in self.system_vs:
 
-            unit, zoom_pan_tolerance, display_precision, measure_default_step = tools.MyTools.eval_crs_units(self.derived_settings.refLyr.crs().authid())
+            layer_profile = get_reference_layer_profile(self.derived_settings.refLyr)
+            unit, display_precision, measure_default_step = layer_profile.unit, layer_profile.display_precision, layer_profile.measure_default_step
 
             for unit_widget in self.my_dialog.layer_unit_widgets:
                 unit_widget.setText(f"[{unit}]")
@@ -3432,8 +3504,10 @@ class LolEvt(qgis.gui.QgsMapToolEmitPoint):
         affects some QLabel-widgets which show the current unit and num decimals of some measurement-widgets
         """
         # Rev. 2024-06-22
+        # the slot-order of canvas destinationCrsChanged is not guaranteed, the cached canvas-crs is possibly not yet invalidated
+        invalidate_canvas_crs()
         if self.my_dialog:
-            unit, zoom_pan_tolerance, display_precision, measure_default_step = tools.MyTools.eval_crs_units(self.iface.mapCanvas().mapSettings().destinationCrs().authid())
+            unit, zoom_pan_tolerance, display_precision, measure_default_step = tools.MyTools.eval_crs_units(get_canvas_crs().authid())
 
             for unit_widget in self.my_dialog.canvas_unit_widgets:
                 unit_widget.setText(f"[{unit}]")
@@ -3520,6 +3594,52 @@ class LolEvt(qgis.gui.QgsMapToolEmitPoint):
 
             self.my_dialog.update()
 
+    def tool_prefetch_data_events(self, data_fids: list, require_reference: bool = False) -> tuple:
+        """bulk-query of data-features: one attribute-only request (no geometries, only the ID-, reference-, stationing-from/to- and offset-field) for all data_fids
+        replacement for one tool_get_data_feature per data_fid f.e. for the validation of self.session_data.selected_fids
+        :param data_fids: fids of data-features, not existing ones are skipped
+        :param require_reference: True => skip data-features without existing reference-feature
+        :returns: tuple(EventTable, data_ids)
+            EventTable: one row per existing data-feature in provider-order, ref_fid resolved via hash-index (-1 if not found), non-numeric values NaN
+            data_ids: list of dataLyrIdField-values in row-order of the EventTable
+        """
+        # Rev. 2026-10-17
+        event_columns = collections.defaultdict(list)
+        data_ids = []
+        if self.SVS.DATA_LAYER_EXISTS in self.system_vs and data_fids:
+            # column-name => QgsField, only the fields already registered
+            fields = {
+                'data_id': self.derived_settings.dataLyrIdField,
+                'ref_id': self.derived_settings.dataLyrReferenceField,
+                'stationing_from': self.derived_settings.dataLyrStationingFromField,
+                'stationing_to': self.derived_settings.dataLyrStationingToField,
+                'offset': self.derived_settings.dataLyrOffsetField,
+            }
+            fields = {column_name: field for column_name, field in fields.items() if field is not None}
+
+            request = qgis.core.QgsFeatureRequest()
+            request.setFilterFids(list(data_fids))
+            request.setFlags(qgis.core.QgsFeatureRequest.NoGeometry)
+            request.setSubsetOfAttributes([field.name() for field in fields.values()], self.derived_settings.dataLyr.fields())
+
+            ref_index = None
+            if 'ref_id' in fields and self.SVS.REFERENCE_LAYER_COMPLETE in self.system_vs:
+                ref_index = get_feature_value_index(self.derived_settings.refLyr, self.derived_settings.refLyrIdField)
+
+            for data_feature in self.derived_settings.dataLyr.getFeatures(request):
+                ref_fid = ref_index.get_fid(data_feature[fields['ref_id'].name()]) if ref_index else None
+                if ref_fid is None and require_reference:
+                    continue
+                event_columns['data_fid'].append(data_feature.id())
+                event_columns['ref_fid'].append(ref_fid if ref_fid is not None else -1)
+                for column_name in ['stationing_from', 'stationing_to', 'offset']:
+                    if column_name in fields:
+                        value = data_feature[fields[column_name].name()]
+                        event_columns[column_name].append(value if isinstance(value, numbers.Number) else np.nan)
+                data_ids.append(data_feature[fields['data_id'].name()] if 'data_id' in fields else None)
+
+        return EventTable(event_columns), data_ids
+
     def tool_check_selected_ids(self):
         """checks and recreates self.session_data.selected_fids"""
         # Rev. 2024-07-28
@@ -3531,10 +3651,9 @@ class LolEvt(qgis.gui.QgsMapToolEmitPoint):
             # make unique
             selected_fids = list(dict.fromkeys(selected_fids))
             # check existance in data-layer
-            for data_fid in selected_fids:
-                data_feature, error_msg = self.tool_get_data_feature(data_fid=data_fid)
-                if data_feature:
-                    checked_fids.append(data_fid)
+            # Rev. 2026-10-17: one attribute-only query instead of one tool_get_data_feature per fid
+            event_table, data_ids = self.tool_prefetch_data_events(selected_fids)
+            checked_fids = event_table.data_fids()
 
             # sort ascending
             checked_fids.sort()
@@ -3550,47 +3669,44 @@ class LolEvt(qgis.gui.QgsMapToolEmitPoint):
         pol_from and pol_to existing and valid?
         Failures are removed from cache with log_message
         """
-        # Rev. 2024-06-22
-
-        # avoid "RuntimeError: dictionary changed size during iteration"
-        checked_po_pro_data_cache = {}
-
-        # 'dict_keys' object has no attribute 'sort'
-        po_pro_fids = list(self.session_data.po_pro_data_cache.keys())
+        # Rev. 2026-10-17
 
         # sort ascending
-        po_pro_fids.sort()
+        po_pro_data_cache = self.session_data.po_pro_data_cache.sort(['data_fid'])
+
+        # rows to keep
+        checked_mask = np.zeros(len(po_pro_data_cache), dtype=bool)
 
         if self.SVS.REFERENCE_AND_DATA_LAYER_COMPLETE in self.system_vs:
-            for data_fid in po_pro_fids:
-                po_pro_cached_feature = self.session_data.po_pro_data_cache[data_fid]
+            for row_idx, data_fid in enumerate(po_pro_data_cache):
+                po_pro_cached_row = po_pro_data_cache.row(data_fid)
                 # check existance in data-layer
                 data_feature, error_msg = self.tool_get_data_feature(data_fid=data_fid)
                 if data_feature:
                     # check reference-feature
-                    ref_id = data_feature[self.derived_settings.dataLyrReferenceField.name()]
                     ref_feature, error_msg = self.tool_get_reference_feature(data_fid=data_fid)
                     if ref_feature:
-                        if po_pro_cached_feature.ref_fid in self.session_data.po_pro_reference_cache:
+                        if po_pro_cached_row.ref_fid in self.session_data.po_pro_reference_cache:
                             # check cached reference feature
-                            if ref_feature.id() == po_pro_cached_feature.ref_fid:
-                                if po_pro_cached_feature.pol_from and po_pro_cached_feature.pol_from.is_valid:
-                                    if po_pro_cached_feature.pol_to and po_pro_cached_feature.pol_to.is_valid:
-                                        checked_po_pro_data_cache[data_fid] = self.session_data.po_pro_data_cache[data_fid]
+                            if ref_feature.id() == po_pro_cached_row.ref_fid:
+                                # NaN => pol_from/pol_to not valid on cached reference-geometry
+                                if math.isfinite(po_pro_cached_row.n_abs_from):
+                                    if math.isfinite(po_pro_cached_row.n_abs_to):
+                                        checked_mask[row_idx] = True
                                     else:
                                         self.dlg_append_log_message('WARNING', MY_DICT.tr('pol_to_recalculation_failed'))
                                 else:
                                     self.dlg_append_log_message('WARNING', MY_DICT.tr('pol_from_recalculation_failed'))
                             else:
-                                self.dlg_append_log_message('WARNING', MY_DICT.tr('po_pro_referenced_features_not_equal', po_pro_cached_feature.ref_fid))
+                                self.dlg_append_log_message('WARNING', MY_DICT.tr('po_pro_referenced_features_not_equal', po_pro_cached_row.ref_fid))
                         else:
-                            self.dlg_append_log_message('WARNING', MY_DICT.tr('po_pro_cached_reference_feature_missing_or_invalid', po_pro_cached_feature.ref_fid))
+                            self.dlg_append_log_message('WARNING', MY_DICT.tr('po_pro_cached_reference_feature_missing_or_invalid', po_pro_cached_row.ref_fid))
                     else:
                         self.dlg_append_log_message('WARNING', error_msg)
                 else:
                     self.dlg_append_log_message('WARNING', error_msg)
 
-        self.session_data.po_pro_data_cache = checked_po_pro_data_cache
+        self.session_data.po_pro_data_cache = po_pro_data_cache.filter(checked_mask)
 
     def tool_get_reference_geom(self, reference_geom: qgis.core.QgsGeometry = None, ref_feature: qgis.core.QgsFeature = None, ref_fid: int = None, ref_id: int | str = None, data_fid: int = None) -> tuple:
         """get geometry by multiple ways
@@ -3606,12 +3722,24 @@ class LolEvt(qgis.gui.QgsMapToolEmitPoint):
         if reference_geom and isinstance(reference_geom, qgis.core.QgsGeometry):
             pass
         else:
-            ref_feature, error_msg = self.tool_get_reference_feature(ref_feature, ref_fid, ref_id, data_fid)
-            if ref_feature:
-                if ref_feature.hasGeometry():
-                    reference_geom = ref_feature.geometry()
-                else:
-                    error_msg = MY_DICT.tr('exc_reference_feature_wo_geom',ref_feature.id())
+            reference_geom = None
+            if ref_feature is None and ref_id is not None and self.SVS.REFERENCE_LAYER_COMPLETE in self.system_vs:
+                # Rev. 2026-10-17: ref_id => ref_fid via hash-index, see FeatureIndex
+                cached_ref_fid = get_feature_value_index(self.derived_settings.refLyr, self.derived_settings.refLyrIdField).get_fid(ref_id)
+                if cached_ref_fid is not None:
+                    reference_geom = get_reference_geom(self.derived_settings.refLyr, cached_ref_fid)
+            elif ref_feature is None and ref_fid is not None and self.SVS.REFERENCE_LAYER_EXISTS in self.system_vs:
+                # Rev. 2026-10-17: LRU-cached, see GeometryCache
+                reference_geom = get_reference_geom(self.derived_settings.refLyr, ref_fid)
+
+            if reference_geom is None:
+                # not cached rsp. not found => feature-query with the appropriate error-messages
+                ref_feature, error_msg = self.tool_get_reference_feature(ref_feature, ref_fid, ref_id, data_fid)
+                if ref_feature:
+                    if ref_feature.hasGeometry():
+                        reference_geom = ref_feature.geometry()
+                    else:
+                        error_msg = MY_DICT.tr('exc_reference_feature_wo_geom',ref_feature.id())
 
         return reference_geom, error_msg
 
@@ -3658,7 +3786,8 @@ class LolEvt(qgis.gui.QgsMapToolEmitPoint):
                 reference_geom, error_msg = self.tool_get_reference_geom(ref_fid=self.session_data.measure_feature.ref_fid)
                 if reference_geom:
                     # step-width dependend on refLyr-crs and keyboard-modifiers
-                    unit, zoom_pan_tolerance, display_precision, measure_default_step = tools.MyTools.eval_crs_units(self.derived_settings.refLyr.crs().authid())
+                    layer_profile = get_reference_layer_profile(self.derived_settings.refLyr)
+                    measure_default_step = layer_profile.measure_default_step
                     delta = measure_default_step
                     if QtWidgets.QApplication.keyboardModifiers() == QtCore.Qt.ControlModifier:
                         delta *= 10
@@ -3709,7 +3838,8 @@ class LolEvt(qgis.gui.QgsMapToolEmitPoint):
                 reference_geom, error_msg = self.tool_get_reference_geom(ref_fid=self.session_data.measure_feature.ref_fid)
                 if reference_geom:
                     ref_len = reference_geom.length()
-                    unit, zoom_pan_tolerance, display_precision, measure_default_step = tools.MyTools.eval_crs_units(self.derived_settings.refLyr.crs().authid())
+                    layer_profile = get_reference_layer_profile(self.derived_settings.refLyr)
+                    measure_default_step = layer_profile.measure_default_step
                     # step-width dependend on refLyr-crs and keyboard-modifiers
                     delta = measure_default_step
                     if QtWidgets.QApplication.keyboardModifiers() == QtCore.Qt.ControlModifier:
@@ -4151,7 +4281,7 @@ class LolEvt(qgis.gui.QgsMapToolEmitPoint):
         if self.session_data.measure_feature is not None:
             reference_geom, error_msg = self.tool_get_reference_geom(ref_fid=self.session_data.measure_feature.ref_fid)
             if reference_geom:
-                segment_geom, segment_error = tools.MyTools.get_segment_geom_n(reference_geom, self.session_data.measure_feature.pol_from.snap_n_abs, self.session_data.measure_feature.pol_to.snap_n_abs, self.session_data.measure_feature.offset)
+                segment_geom, segment_error = tools.MyTools.get_segment_geom_n(reference_geom, self.session_data.measure_feature.pol_from.snap_n_abs, self.session_data.measure_feature.pol_to.snap_n_abs, self.session_data.measure_feature.offset, self.derived_settings.refLyr.id(), self.session_data.measure_feature.ref_fid)
                 if segment_geom:
                     extent = segment_geom.boundingBox()
                     x_coords.append(extent.xMinimum())
@@ -4206,7 +4336,10 @@ class LolEvt(qgis.gui.QgsMapToolEmitPoint):
                     error_msg = MY_DICT.tr('exc_data_feature_not_found_by_data_fid', data_fid)
         elif data_id is not None:
             if (self.SVS.DATA_LAYER_EXISTS | self.SVS.DATA_LAYER_ID_FIELD_DEFINED) in self.system_vs:
-                data_feature = tools.MyTools.get_feature_by_value(self.derived_settings.dataLyr, self.derived_settings.dataLyrIdField, data_id)
+                # Rev. 2026-10-17: hash-index dataLyrIdField-value => fid instead of filter-expression-query
+                data_fid = get_feature_value_index(self.derived_settings.dataLyr, self.derived_settings.dataLyrIdField).get_fid(data_id)
+                if data_fid is not None:
+                    data_feature = self.derived_settings.dataLyr.getFeature(data_fid)
                 if not (data_feature and data_feature.isValid()):
                     error_msg = MY_DICT.tr('exc_data_feature_not_found_by_data_id', data_id)
 
@@ -4235,28 +4368,73 @@ class LolEvt(qgis.gui.QgsMapToolEmitPoint):
 
             elif data_fid is not None:
                 if data_fid > 0:
-                    data_feature, error_msg = self.tool_get_data_feature(data_fid=data_fid)
-                    if data_feature and data_feature.isValid():
-                        data_id = data_feature[self.stored_settings.dataLyrIdFieldName]
-                        show_feature = tools.MyTools.get_feature_by_value(self.derived_settings.showLyr, self.derived_settings.showLyrBackReferenceField, data_id)
-                        if not (show_feature and show_feature.isValid()):
-                            error_msg = MY_DICT.tr('exc_show_feature_not_found_by_data_fid', data_fid)
+                    # Rev. 2026-10-17: data_fid => data_id => show_fid via hash-indexes
+                    show_fids = self.tool_get_show_fids_by_data_fids([data_fid])
+                    if show_fids:
+                        show_feature = self.derived_settings.showLyr.getFeature(show_fids[0])
+                    if not (show_feature and show_feature.isValid()):
+                        error_msg = MY_DICT.tr('exc_show_feature_not_found_by_data_fid', data_fid)
                 else:
                     error_msg = MY_DICT.tr('exc_no_show_feature_with_negative_data_fid', data_fid)
 
             elif data_id is not None:
-                data_feature, error_msg = self.tool_get_data_feature(data_id=data_id)
-                if data_feature and data_feature.isValid():
-                    data_id = data_feature[self.stored_settings.dataLyrIdFieldName]
-                    show_feature = tools.MyTools.get_feature_by_value(self.derived_settings.showLyr, self.derived_settings.showLyrBackReferenceField, data_id)
-                    if not (show_feature and show_feature.isValid()):
-                        error_msg = MY_DICT.tr('exc_show_feature_not_found_by_data_id', data_id)
+                # Rev. 2026-10-17: data_id => show_fid via hash-index
+                show_fid = get_feature_value_index(self.derived_settings.showLyr, self.derived_settings.showLyrBackReferenceField).get_fid(data_id)
+                if show_fid is not None:
+                    show_feature = self.derived_settings.showLyr.getFeature(show_fid)
+                if not (show_feature and show_feature.isValid()):
+                    error_msg = MY_DICT.tr('exc_show_feature_not_found_by_data_id', data_id)
 
         if show_feature and isinstance(show_feature, qgis.core.QgsFeature) and show_feature.isValid():
             return show_feature, None
         else:
             return None, error_msg
 
+    def tool_get_route_event_index(self) -> RouteEventIndex:
+        """inverted index ref_id => data-features of this route sorted by stationing_from/stationing_to, maintained via the data-layer-signals, see FeatureIndex
+        requires self.SVS.DATA_LAYER_COMPLETE
+        """
+        # Rev. 2026-10-17
+        return get_route_event_index(self.derived_settings.dataLyr, self.derived_settings.dataLyrReferenceField, self.derived_settings.dataLyrStationingFromField, self.derived_settings.dataLyrStationingToField)
+
+    def tool_get_show_fids_by_data_fids(self, data_fids: list) -> list:
+        """fids of the show-features for data-features, bulk-version of tool_get_show_feature(data_fid=...)
+        resolved without feature-queries via the hash-indexes data_fid => data_id (dataLyrIdField) and data_id => show_fid (showLyrBackReferenceField), see FeatureIndex
+        :param data_fids: uncommitted data-features (negative data_fid) are skipped, they have no show-feature
+        :returns: list of show_fids in order of data_fids, data-features without show-feature are skipped
+        """
+        # Rev. 2026-10-17
+        show_fids = []
+        if self.SVS.ALL_LAYERS_COMPLETE in self.system_vs:
+            data_index = get_feature_value_index(self.derived_settings.dataLyr, self.derived_settings.dataLyrIdField)
+            show_index = get_feature_value_index(self.derived_settings.showLyr, self.derived_settings.showLyrBackReferenceField)
+            for data_fid in data_fids:
+                if data_fid > 0:
+                    show_fid = show_index.get_fid(data_index.get_value(data_fid))
+                    if show_fid is not None:
+                        show_fids.append(show_fid)
+        return show_fids
+
+    def tool_get_data_fids_by_show_fids(self, show_fids: list = None) -> list:
+        """fids of the data-features for show-features, reverse of tool_get_show_fids_by_data_fids
+        :param show_fids: without: all features of the show-layer
+        :returns: list of data_fids in order of show_fids, show-features without data-feature are skipped
+        """
+        # Rev. 2026-10-17
+        data_fids = []
+        if self.SVS.ALL_LAYERS_COMPLETE in self.system_vs:
+            data_index = get_feature_value_index(self.derived_settings.dataLyr, self.derived_settings.dataLyrIdField)
+            show_index = get_feature_value_index(self.derived_settings.showLyr, self.derived_settings.showLyrBackReferenceField)
+            if show_fids is None:
+                data_ids = [data_id for show_fid, data_id in show_index.items()]
+            else:
+                data_ids = [show_index.get_value(show_fid) for show_fid in show_fids]
+            for data_id in data_ids:
+                data_fid = data_index.get_fid(data_id)
+                if data_fid is not None:
+                    data_fids.append(data_fid)
+        return data_fids
+
     def tool_get_reference_feature(self, ref_feature: qgis.core.QgsFeature = None, ref_fid: int = None, ref_id: int | str = None, data_fid: int = None) -> tuple:
         """get reference-feature by multiple ways
         :param ref_feature: check validity and return
@@ -4277,7 +4455,11 @@ class LolEvt(qgis.gui.QgsMapToolEmitPoint):
 
         if ref_id is not None:
             if self.SVS.REFERENCE_LAYER_COMPLETE in self.system_vs:
-                ref_feature = tools.MyTools.get_feature_by_value(self.derived_settings.refLyr, self.derived_settings.refLyrIdField, ref_id)
+                # Rev. 2026-10-17: hash-index refLyrIdField-value => fid instead of filter-expression-query
+                ref_feature = None
+                ref_fid = get_feature_value_index(self.derived_settings.refLyr, self.derived_settings.refLyrIdField).get_fid(ref_id)
+                if ref_fid is not None:
+                    ref_feature = self.derived_settings.refLyr.getFeature(ref_fid)
                 if not (ref_feature and ref_feature.isValid()):
                     error_msg = MY_DICT.tr('exc_reference_feature_not_found_by_ref_id', ref_id)
 
@@ -4331,18 +4513,19 @@ class LolEvt(qgis.gui.QgsMapToolEmitPoint):
 
                 if not (ref_id is None or ref_id == '' or repr(ref_id) == 'NULL'):
                     fvs |= FVS.REFERENCE_ID_VALID
-                    reference_geom, error_msg = self.tool_get_reference_geom(ref_id=ref_id)
-                    if reference_geom:
+                    ref_feature, error_msg = self.tool_get_reference_feature(ref_id=ref_id)
+                    if ref_feature and ref_feature.hasGeometry():
+                        reference_geom = ref_feature.geometry()
                         fvs |= FVS.REFERENCE_FEATURE_EXISTS
                         fvs |= FVS.REFERENCE_GEOMETRY_EXIST
                         ref_len = reference_geom.length()
 
                         if self.stored_settings.lrMode in ['Nabs', 'Nfract']:
-                            geom_n_valid, error_msg = tools.MyTools.check_geom_n_valid(reference_geom)
+                            geom_n_valid, error_msg = tools.MyTools.check_geom_n_valid(reference_geom, self.derived_settings.refLyr.id(), ref_feature.id())
                             if geom_n_valid:
                                 fvs |= FVS.REFERENCE_GEOMETRY_VALID
                         elif self.stored_settings.lrMode in ['Mabs']:
-                            geom_m_valid, error_msg = tools.MyTools.check_geom_m_valid(reference_geom)
+                            geom_m_valid, error_msg = tools.MyTools.check_geom_m_valid(reference_geom, self.derived_settings.refLyr.id(), ref_feature.id())
                             if geom_m_valid:
                                 fvs |= FVS.REFERENCE_GEOMETRY_VALID
 
@@ -4385,7 +4568,7 @@ class LolEvt(qgis.gui.QgsMapToolEmitPoint):
 
         if self.derived_settings.refLyr:
             lol_feature.ref_lyr_id = self.derived_settings.refLyr.id()
-            lol_feature.reference_authid = self.derived_settings.refLyr.crs().authid()
+            lol_feature.reference_authid = get_reference_layer_profile(self.derived_settings.refLyr).authid
 
             if self.SVS.REFERENCE_AND_DATA_LAYER_COMPLETE in self.system_vs:
                 fvs = self.tool_check_data_feature(data_fid=data_fid)
@@ -4413,23 +4596,31 @@ class LolEvt(qgis.gui.QgsMapToolEmitPoint):
                         if ref_feature:
                             lol_feature.ref_fid = ref_feature.id()
 
-                            if FVS.STATIONING_FROM_INSIDE_RANGE in fvs:
-                                pol_from = PoLFeature()
-                                pol_from.set_ref_fid(self.derived_settings.refLyr, ref_feature.id())
-                                pol_from.recalc_by_stationing(stationing_from, self.stored_settings.lrMode)
-                                if pol_from.is_valid:
-                                    lol_feature.set_pol_from(pol_from)
-                                else:
-                                    self.dlg_append_log_message('WARNING', MY_DICT.tr('pol_recalculation_failed', pol_from.last_error))
-
-                            if FVS.STATIONING_TO_INSIDE_RANGE in fvs:
-                                pol_to = PoLFeature()
-                                pol_to.set_ref_fid(self.derived_settings.refLyr, ref_feature.id())
-                                pol_to.recalc_by_stationing(stationing_to, self.stored_settings.lrMode)
-                                if pol_to.is_valid:
-                                    lol_feature.set_pol_to(pol_to)
+                            if FVS.STATIONING_FROM_INSIDE_RANGE in fvs or FVS.STATIONING_TO_INSIDE_RANGE in fvs:
+                                # both stationings in one batch on the same reference-geometry
+                                reference_geom = ref_feature.geometry()
+                                route_index = get_route_index(reference_geom, self.derived_settings.refLyr.id(), ref_feature.id())
+                                stationing_arrays, error_msg = tools.MyTools.recalc_stationings(reference_geom, [stationing_from, stationing_to], self.stored_settings.lrMode, route_index)
+                                if stationing_arrays:
+                                    if FVS.STATIONING_FROM_INSIDE_RANGE in fvs:
+                                        pol_from = PoLFeature()
+                                        pol_from.set_ref_fid(self.derived_settings.refLyr, ref_feature.id(), ref_feature)
+                                        pol_from.set_by_stationing_arrays(stationing_arrays, 0, self.stored_settings.lrMode, stationing_from)
+                                        if pol_from.is_valid:
+                                            lol_feature.set_pol_from(pol_from)
+                                        else:
+                                            self.dlg_append_log_message('WARNING', MY_DICT.tr('pol_recalculation_failed', pol_from.last_error))
+
+                                    if FVS.STATIONING_TO_INSIDE_RANGE in fvs:
+                                        pol_to = PoLFeature()
+                                        pol_to.set_ref_fid(self.derived_settings.refLyr, ref_feature.id(), ref_feature)
+                                        pol_to.set_by_stationing_arrays(stationing_arrays, 1, self.stored_settings.lrMode, stationing_to)
+                                        if pol_to.is_valid:
+                                            lol_feature.set_pol_to(pol_to)
+                                        else:
+                                            self.dlg_append_log_message('WARNING', MY_DICT.tr('pol_recalculation_failed', pol_to.last_error))
                                 else:
-                                    self.dlg_append_log_message('WARNING', MY_DICT.tr('pol_recalculation_failed', pol_to.last_error))
+                                    self.dlg_append_log_message('WARNING', MY_DICT.tr('pol_recalculation_failed', error_msg))
                         else:
                             self.dlg_append_log_message('WARNING', error_msg)
 
@@ -4581,7 +4772,7 @@ class LolEvt(qgis.gui.QgsMapToolEmitPoint):
 
             if dialog_result == QtWidgets.QMessageBox.Yes:
                 self.session_data.po_pro_reference_cache = {}
-                self.session_data.po_pro_data_cache = {}
+                self.session_data.po_pro_data_cache = EventTable()
                 self.dlg_refresh_po_pro_section()
                 
 
@@ -4603,7 +4794,7 @@ class LolEvt(qgis.gui.QgsMapToolEmitPoint):
                 if data_feature:
                     measure_feature = self.tool_create_lol_feature(data_feature.id())
 
-                    cached_feature = self.session_data.po_pro_data_cache[fid]
+                    cached_row = self.session_data.po_pro_data_cache.row(fid)
 
                     ref_id = data_feature[self.derived_settings.dataLyrReferenceField.name()]
 
@@ -4616,12 +4807,9 @@ class LolEvt(qgis.gui.QgsMapToolEmitPoint):
                         if ref_fid in self.session_data.po_pro_reference_cache:
                             cached_geom = self.session_data.po_pro_reference_cache[ref_fid]
 
-                            cached_pol_from = cached_feature.pol_from
-                            cached_pol_to = cached_feature.pol_to
-
                             if measure_feature.pol_from.is_valid and measure_feature.pol_to.is_valid:
                                 try:
-                                    current_segment_geom, segment_error = tools.MyTools.get_segment_geom_n(current_geom, measure_feature.pol_from.snap_n_abs, measure_feature.pol_to.snap_n_abs, offset)
+                                    current_segment_geom, segment_error = tools.MyTools.get_segment_geom_n(current_geom, measure_feature.pol_from.snap_n_abs, measure_feature.pol_to.snap_n_abs, offset, self.derived_settings.refLyr.id(), ref_fid)
                                     if current_segment_geom:
                                         extent = current_segment_geom.boundingBox()
                                         x_coords.append(extent.xMinimum())
@@ -4632,9 +4820,9 @@ class LolEvt(qgis.gui.QgsMapToolEmitPoint):
                                 except Exception as err:
                                     self.dlg_append_log_message('INFO', str(err))
 
-                            if cached_pol_from.is_valid and cached_pol_to.is_valid:
+                            if math.isfinite(cached_row.n_abs_from) and math.isfinite(cached_row.n_abs_to):
                                 try:
-                                    cached_segment_geom, segment_error = tools.MyTools.get_segment_geom_n(cached_geom, cached_pol_from.snap_n_abs, cached_pol_to.snap_n_abs, cached_feature.offset)
+                                    cached_segment_geom, segment_error = tools.MyTools.get_segment_geom_n(cached_geom, cached_row.n_abs_from, cached_row.n_abs_to, cached_row.offset)
                                     if cached_segment_geom:
                                         extent = cached_segment_geom.boundingBox()
                                         x_coords.append(extent.xMinimum())
@@ -4682,11 +4870,8 @@ class LolEvt(qgis.gui.QgsMapToolEmitPoint):
                         # Note:
                         # the subset is q query-expression on the provider-side, so it must use the provider-side-ID-field, not the QGis internal feature._id()
                         # allthough mostly identic, but not allways
-                        data_ids = []
-                        for fid in self.session_data.selected_fids:
-                            data_feature, error_msg = self.tool_get_data_feature(data_fid=fid)
-                            if data_feature:
-                                data_ids.append(data_feature[self.derived_settings.dataLyrIdField.name()])
+                        # Rev. 2026-10-17: one attribute-only query instead of one tool_get_data_feature per fid
+                        event_table, data_ids = self.tool_prefetch_data_events(self.session_data.selected_fids)
 
                         if data_ids:
                             integer_field_types = [QtCore.QMetaType.Int, QtCore.QMetaType.UInt, QtCore.QMetaType.LongLong, QtCore.QMetaType.ULongLong]
@@ -4726,10 +4911,8 @@ class LolEvt(qgis.gui.QgsMapToolEmitPoint):
                 # same feature in data-layer and show-layer can have different fids
                 show_fids = []
                 if self.SVS.SHOW_LAYER_COMPLETE in self.system_vs:
-                    for data_fid in self.session_data.selected_fids:
-                        show_feature, error_msg = self.tool_get_show_feature(data_fid=data_fid)
-                        if show_feature:
-                            show_fids.append(show_feature.id())
+                    # Rev. 2026-10-17: bulk via hash-indexes instead of one show-layer-query per feature
+                    show_fids = self.tool_get_show_fids_by_data_fids(self.session_data.selected_fids)
 
                 if selection_mode == 'replace_selection':
                     self.derived_settings.dataLyr.removeSelection()
@@ -4756,7 +4939,7 @@ class LolEvt(qgis.gui.QgsMapToolEmitPoint):
         calculates Point-Geometries and their extent,
         zooms/pans to this extent
         """
-        # Rev. 2024-06-25
+        # Rev. 2026-10-17
 
         if self.SVS.REFERENCE_AND_DATA_LAYER_COMPLETE in self.system_vs:
             if self.session_data.selected_fids:
@@ -4766,57 +4949,50 @@ class LolEvt(qgis.gui.QgsMapToolEmitPoint):
                 y_coords = []
                 # list of feature-ids for features with pol_from/pol_to/segment-calculation-problems
                 skipped_fids = []
-                for data_fid in self.session_data.selected_fids:
-                    data_feature, error_msg = self.tool_get_data_feature(data_fid=data_fid)
-                    if data_feature:
-                        ref_id = data_feature[self.derived_settings.dataLyrReferenceField.name()]
-                        offset = data_feature[self.derived_settings.dataLyrOffsetField.name()]
-                        stationing_from = data_feature[self.derived_settings.dataLyrStationingFromField.name()]
-                        stationing_to = data_feature[self.derived_settings.dataLyrStationingToField.name()]
-                        ref_feature, error_msg = self.tool_get_reference_feature(ref_id=ref_id)
-                        if ref_feature:
-                            if ref_feature.hasGeometry():
-                                pol_from = PoLFeature()
-                                pol_from.set_ref_fid(self.derived_settings.refLyr, ref_feature.id())
-                                pol_from.recalc_by_stationing(stationing_from, self.stored_settings.lrMode)
-
-                                if pol_from.is_valid:
-                                    projected_point = ref_feature.geometry().interpolate(pol_from.snap_n_abs)
-                                    if not projected_point.isEmpty():
-                                        x_coords.append(projected_point.asPoint().x())
-                                        y_coords.append(projected_point.asPoint().y())
-                                else:
-                                    skipped_fids.append(data_fid)
 
-                                pol_to = PoLFeature()
-                                pol_to.set_ref_fid(self.derived_settings.refLyr, ref_feature.id())
-                                pol_to.recalc_by_stationing(stationing_to, self.stored_settings.lrMode)
-
-                                if pol_to.is_valid:
-                                    projected_point = ref_feature.geometry().interpolate(pol_to.snap_n_abs)
-                                    if not projected_point.isEmpty():
-                                        x_coords.append(projected_point.asPoint().x())
-                                        y_coords.append(projected_point.asPoint().y())
+                # selected features with existing reference-feature, grouped by reference-feature for batch-calculation
+                # Rev. 2026-10-17: one attribute-only query for all selected features, reference-geometries from GeometryCache
+                event_table, data_ids = self.tool_prefetch_data_events(self.session_data.selected_fids, True)
+                skipped_fids += [data_fid for data_fid in self.session_data.selected_fids if data_fid not in event_table]
+
+                for ref_fid, row_indices in event_table.group_by_route():
+                    reference_geom, error_msg = self.tool_get_reference_geom(ref_fid=ref_fid)
+                    if not reference_geom:
+                        skipped_fids += event_table['data_fid'][row_indices].tolist()
+                        continue
+                    data_rows = list(zip(event_table['data_fid'][row_indices].tolist(), event_table['stationing_from'][row_indices].tolist(), event_table['stationing_to'][row_indices].tolist(), event_table['offset'][row_indices].tolist()))
+                    # all from- and to-stationings of this reference-feature in one batch: [from_0, to_0, from_1, to_1...]
+                    stationings = np.column_stack((event_table['stationing_from'][row_indices], event_table['stationing_to'][row_indices])).ravel()
+                    stationing_arrays, error_msg = tools.MyTools.recalc_stationings(reference_geom, stationings, self.stored_settings.lrMode, get_route_index(reference_geom, self.derived_settings.refLyr.id(), ref_fid), PoLOutputs.NONE)
+                    if stationing_arrays:
+                        # data-features with valid from- and to-stationing, their segments are calculated in one batch
+                        segment_rows = []
+                        for row_idx, (data_fid, stationing_from, stationing_to, offset) in enumerate(data_rows):
+                            from_idx = 2 * row_idx
+                            to_idx = from_idx + 1
+                            for pol_idx in [from_idx, to_idx]:
+                                if stationing_arrays.is_valid[pol_idx]:
+                                    x_coords.append(float(stationing_arrays.snap_x[pol_idx]))
+                                    y_coords.append(float(stationing_arrays.snap_y[pol_idx]))
                                 else:
                                     skipped_fids.append(data_fid)
 
-                                if pol_from.is_valid and pol_to.is_valid:
-                                    segment_geom, segment_error = tools.MyTools.get_segment_geom_n(ref_feature.geometry(), pol_from.snap_n_abs, pol_to.snap_n_abs, offset)
-                                    if segment_geom:
-                                        extent = segment_geom.boundingBox()
-                                        x_coords.append(extent.xMinimum())
-                                        x_coords.append(extent.xMaximum())
-                                        y_coords.append(extent.yMinimum())
-                                        y_coords.append(extent.yMaximum())
-                                    else:
-                                        skipped_fids.append(data_fid)
-                                        pass
+                            if stationing_arrays.is_valid[from_idx] and stationing_arrays.is_valid[to_idx]:
+                                segment_rows.append((data_fid, stationing_arrays.n_abs[from_idx], stationing_arrays.n_abs[to_idx], offset))
+
+                        segment_geoms, segment_error = tools.MyTools.get_segment_geoms_n(reference_geom, [segment_row[1] for segment_row in segment_rows], [segment_row[2] for segment_row in segment_rows], [segment_row[3] for segment_row in segment_rows], get_route_index(reference_geom, self.derived_settings.refLyr.id(), ref_fid))
+                        for segment_idx, segment_row in enumerate(segment_rows):
+                            segment_geom = segment_geoms[segment_idx] if segment_geoms else None
+                            if segment_geom and not segment_geom.isEmpty():
+                                extent = segment_geom.boundingBox()
+                                x_coords.append(extent.xMinimum())
+                                x_coords.append(extent.xMaximum())
+                                y_coords.append(extent.yMinimum())
+                                y_coords.append(extent.yMaximum())
                             else:
-                                skipped_fids.append(data_fid)
-                        else:
-                            skipped_fids.append(data_fid)
+                                skipped_fids.append(segment_row[0])
                     else:
-                        skipped_fids.append(data_fid)
+                        skipped_fids += [data_row[0] for data_row in data_rows]
 
                 self.cvs_zoom_to_coords(x_coords, y_coords, 'zoom', self.derived_settings.refLyr.crs())
 
@@ -4847,10 +5023,8 @@ class LolEvt(qgis.gui.QgsMapToolEmitPoint):
             if selection_mode == 'select_selected' or selection_mode == 'append_selected':
                 # fids in show-layer can be different from fids in data-layer
 
-                for show_feature in self.derived_settings.showLyr.getSelectedFeatures():
-                    data_feature, error_msg = self.tool_get_data_feature(data_id=show_feature[self.stored_settings.showLyrBackReferenceFieldName])
-                    if data_feature:
-                        additional_feature_ids.append(data_feature.id())
+                # Rev. 2026-10-17: bulk via hash-indexes instead of one data-layer-query per show-feature
+                additional_feature_ids = self.tool_get_data_fids_by_show_fids(self.derived_settings.showLyr.selectedFeatureIds())
 
                 if len(additional_feature_ids):
                     if selection_mode == 'select_selected':
@@ -4861,10 +5035,8 @@ class LolEvt(qgis.gui.QgsMapToolEmitPoint):
                     self.dlg_append_log_message('INFO', MY_DICT.tr('no_selection_in_show_layer'))
             else:
                 # selection_mode = 'select_all'
-                for show_feature in self.derived_settings.showLyr.getFeatures():
-                    data_feature, error_msg = self.tool_get_data_feature(data_id=show_feature[self.stored_settings.showLyrBackReferenceFieldName])
-                    if data_feature:
-                        additional_feature_ids.append(data_feature.id())
+                # Rev. 2026-10-17: all show-features from the hash-index, no additional show-layer-query
+                additional_feature_ids = self.tool_get_data_fids_by_show_fids()
 
                 if len(additional_feature_ids):
                     self.session_data.selected_fids = additional_feature_ids
@@ -5562,7 +5734,7 @@ class LolEvt(qgis.gui.QgsMapToolEmitPoint):
                             if lol_feature.pol_from and lol_feature.pol_from.is_valid:
                                 projected_point_n = reference_geom.interpolate(lol_feature.pol_from.snap_n_abs)
                                 if not projected_point_n.isEmpty():
-                                    projected_point_n.transform(qgis.core.QgsCoordinateTransform(self.derived_settings.refLyr.crs(), self.iface.mapCanvas().mapSettings().destinationCrs(), qgis.core.QgsProject.instance()))
+                                    projected_point_n.transform(get_transform(self.derived_settings.refLyr.crs(), get_canvas_crs()))
 
                                     if 'snf' in draw_markers:
                                         self.vm_snf.setCenter(projected_point_n.asPoint())
@@ -5585,7 +5757,7 @@ class LolEvt(qgis.gui.QgsMapToolEmitPoint):
                             if lol_feature.pol_to and lol_feature.pol_to.is_valid:
                                 projected_point_n = reference_geom.interpolate(lol_feature.pol_to.snap_n_abs)
                                 if not projected_point_n.isEmpty():
-                                    projected_point_n.transform(qgis.core.QgsCoordinateTransform(self.derived_settings.refLyr.crs(), self.iface.mapCanvas().mapSettings().destinationCrs(), qgis.core.QgsProject.instance()))
+                                    projected_point_n.transform(get_transform(self.derived_settings.refLyr.crs(), get_canvas_crs()))
 
                                     if 'snt' in draw_markers:
                                         self.vm_snt.setCenter(projected_point_n.asPoint())
@@ -5607,7 +5779,7 @@ class LolEvt(qgis.gui.QgsMapToolEmitPoint):
 
                             if lol_feature.pol_from and lol_feature.pol_to and lol_feature.pol_from.is_valid and lol_feature.pol_to.is_valid:
 
-                                segment_geom, segment_error = tools.MyTools.get_segment_geom_n(reference_geom, lol_feature.pol_from.snap_n_abs, lol_feature.pol_to.snap_n_abs, lol_feature.offset)
+                                segment_geom, segment_error = tools.MyTools.get_segment_geom_n(reference_geom, lol_feature.pol_from.snap_n_abs, lol_feature.pol_to.snap_n_abs, lol_feature.offset, self.derived_settings.refLyr.id(), lol_feature.ref_fid)
                                 if segment_geom:
                                     if 'sgn' in draw_markers:
                                         # always draw, even if there is no geometry, because of cvs_check_marker_visibility
@@ -5616,7 +5788,7 @@ class LolEvt(qgis.gui.QgsMapToolEmitPoint):
 
                                     if 'sgn' in extent_markers:
                                         extent = segment_geom.boundingBox()
-                                        tr = qgis.core.QgsCoordinateTransform(self.derived_settings.refLyr.crs(), self.iface.mapCanvas().mapSettings().destinationCrs(), qgis.core.QgsProject.instance())
+                                        tr = get_transform(self.derived_settings.refLyr.crs(), get_canvas_crs())
                                         extent = tr.transformBoundingBox(extent)
                                         x_coords.append(extent.xMinimum())
                                         x_coords.append(extent.xMaximum())
@@ -5635,7 +5807,7 @@ class LolEvt(qgis.gui.QgsMapToolEmitPoint):
 
                             if lol_feature.pol_from and lol_feature.pol_to and lol_feature.pol_from.is_valid and lol_feature.pol_to.is_valid:
 
-                                segment_geom_0, segment_error = tools.MyTools.get_segment_geom_n(reference_geom, lol_feature.pol_from.snap_n_abs, lol_feature.pol_to.snap_n_abs, 0)
+                                segment_geom_0, segment_error = tools.MyTools.get_segment_geom_n(reference_geom, lol_feature.pol_from.snap_n_abs, lol_feature.pol_to.snap_n_abs, 0, self.derived_settings.refLyr.id(), lol_feature.ref_fid)
 
                                 if segment_geom_0:
                                     if 'sg0' in draw_markers:
@@ -5645,7 +5817,7 @@ class LolEvt(qgis.gui.QgsMapToolEmitPoint):
 
                                     if segment_geom_0 and 'sg0' in extent_markers:
                                         extent = segment_geom_0.boundingBox()
-                                        tr = qgis.core.QgsCoordinateTransform(self.derived_settings.refLyr.crs(), self.iface.mapCanvas().mapSettings().destinationCrs(), qgis.core.QgsProject.instance())
+                                        tr = get_transform(self.derived_settings.refLyr.crs(), get_canvas_crs())
                                         extent = tr.transformBoundingBox(extent)
                                         x_coords.append(extent.xMinimum())
                                         x_coords.append(extent.xMaximum())
@@ -5668,7 +5840,7 @@ class LolEvt(qgis.gui.QgsMapToolEmitPoint):
                         # zoom/pan tor reference-line !?
                         if 'rfl' in extent_markers:
                             extent = reference_geom.boundingBox()
-                            tr = qgis.core.QgsCoordinateTransform(self.derived_settings.refLyr.crs(), self.iface.mapCanvas().mapSettings().destinationCrs(), qgis.core.QgsProject.instance())
+                            tr = get_transform(self.derived_settings.refLyr.crs(), get_canvas_crs())
                             extent = tr.transformBoundingBox(extent)
 
                             x_coords.append(extent.xMinimum())
@@ -5711,12 +5883,12 @@ class LolEvt(qgis.gui.QgsMapToolEmitPoint):
                     x_coords = []
                     y_coords = []
 
-                    po_pro_cached_feature = self.session_data.po_pro_data_cache[self.session_data.po_pro_feature.data_fid]
+                    po_pro_cached_row = self.session_data.po_pro_data_cache.row(self.session_data.po_pro_feature.data_fid)
 
-                    reference_geom, error_msg = self.tool_get_reference_geom(ref_fid=po_pro_cached_feature.ref_fid)
+                    reference_geom, error_msg = self.tool_get_reference_geom(ref_fid=po_pro_cached_row.ref_fid)
 
                     if reference_geom:
-                        data_feature, error_msg = self.tool_get_data_feature(data_fid=po_pro_cached_feature.data_fid)
+                        data_feature, error_msg = self.tool_get_data_feature(data_fid=po_pro_cached_row.data_fid)
 
                         if data_feature:
 
@@ -5724,7 +5896,7 @@ class LolEvt(qgis.gui.QgsMapToolEmitPoint):
 
                                 projected_point_n = reference_geom.interpolate(po_pro_feature.pol_from.snap_n_abs)
                                 if not projected_point_n.isEmpty():
-                                    projected_point_n.transform(qgis.core.QgsCoordinateTransform(self.derived_settings.refLyr.crs(), self.iface.mapCanvas().mapSettings().destinationCrs(), qgis.core.QgsProject.instance()))
+                                    projected_point_n.transform(get_transform(self.derived_settings.refLyr.crs(), get_canvas_crs()))
 
                                     if 'snf' in draw_markers:
                                         self.vm_snf.setCenter(projected_point_n.asPoint())
@@ -5742,7 +5914,7 @@ class LolEvt(qgis.gui.QgsMapToolEmitPoint):
 
                                 projected_point_n = reference_geom.interpolate(po_pro_feature.pol_to.snap_n_abs)
                                 if not projected_point_n.isEmpty():
-                                    projected_point_n.transform(qgis.core.QgsCoordinateTransform(self.derived_settings.refLyr.crs(), self.iface.mapCanvas().mapSettings().destinationCrs(), qgis.core.QgsProject.instance()))
+                                    projected_point_n.transform(get_transform(self.derived_settings.refLyr.crs(), get_canvas_crs()))
 
                                     if 'snt' in draw_markers:
                                         self.vm_snt.setCenter(projected_point_n.asPoint())
@@ -5758,7 +5930,7 @@ class LolEvt(qgis.gui.QgsMapToolEmitPoint):
 
                             if 'sgn' in draw_markers or 'sgn' in extent_markers:
 
-                                segment_geom, segment_error = tools.MyTools.get_segment_geom_n(reference_geom, po_pro_feature.pol_from.snap_n_abs, po_pro_feature.pol_to.snap_n_abs, po_pro_feature.offset)
+                                segment_geom, segment_error = tools.MyTools.get_segment_geom_n(reference_geom, po_pro_feature.pol_from.snap_n_abs, po_pro_feature.pol_to.snap_n_abs, po_pro_feature.offset, self.derived_settings.refLyr.id(), po_pro_cached_row.ref_fid)
                                 if segment_geom:
                                     if 'sgn' in draw_markers:
                                         self.rb_sgn.setToGeometry(segment_geom, self.derived_settings.refLyr)
@@ -5766,7 +5938,7 @@ class LolEvt(qgis.gui.QgsMapToolEmitPoint):
 
                                     if 'sgn' in extent_markers:
                                         extent = segment_geom.boundingBox()
-                                        tr = qgis.core.QgsCoordinateTransform(self.derived_settings.refLyr.crs(), self.iface.mapCanvas().mapSettings().destinationCrs(), qgis.core.QgsProject.instance())
+                                        tr = get_transform(self.derived_settings.refLyr.crs(), get_canvas_crs())
                                         extent = tr.transformBoundingBox(extent)
                                         x_coords.append(extent.xMinimum())
                                         x_coords.append(extent.xMaximum())
@@ -5780,7 +5952,7 @@ class LolEvt(qgis.gui.QgsMapToolEmitPoint):
 
                             if 'sg0' in draw_markers or 'sg0' in extent_markers:
 
-                                segment_geom_0, segment_error = tools.MyTools.get_segment_geom_n(reference_geom, po_pro_feature.pol_from.snap_n_abs, po_pro_feature.pol_to.snap_n_abs, 0)
+                                segment_geom_0, segment_error = tools.MyTools.get_segment_geom_n(reference_geom, po_pro_feature.pol_from.snap_n_abs, po_pro_feature.pol_to.snap_n_abs, 0, self.derived_settings.refLyr.id(), po_pro_cached_row.ref_fid)
                                 if segment_geom_0:
                                     if 'sg0' in draw_markers:
                                         self.rb_sg0.setToGeometry(segment_geom_0, self.derived_settings.refLyr)
@@ -5788,7 +5960,7 @@ class LolEvt(qgis.gui.QgsMapToolEmitPoint):
 
                                     if 'sg0' in extent_markers:
                                         extent = segment_geom_0.boundingBox()
-                                        tr = qgis.core.QgsCoordinateTransform(self.derived_settings.refLyr.crs(), self.iface.mapCanvas().mapSettings().destinationCrs(), qgis.core.QgsProject.instance())
+                                        tr = get_transform(self.derived_settings.refLyr.crs(), get_canvas_crs())
                                         extent = tr.transformBoundingBox(extent)
                                         x_coords.append(extent.xMinimum())
                                         x_coords.append(extent.xMaximum())
@@ -5800,12 +5972,12 @@ class LolEvt(qgis.gui.QgsMapToolEmitPoint):
                                 else:
                                     self.rb_sg0.hide()
 
-                            cached_geom = self.session_data.po_pro_reference_cache[po_pro_cached_feature.ref_fid]
+                            cached_geom = self.session_data.po_pro_reference_cache[po_pro_cached_row.ref_fid]
 
                             # special case post-processing: cached stationings on cached geometries
                             if 'csgn' in draw_markers or 'csgn' in extent_markers:
                                 try:
-                                    segment_geom, segment_error = tools.MyTools.get_segment_geom_n(cached_geom, po_pro_cached_feature.pol_from.snap_n_abs, po_pro_cached_feature.pol_to.snap_n_abs, po_pro_cached_feature.offset)
+                                    segment_geom, segment_error = tools.MyTools.get_segment_geom_n(cached_geom, po_pro_cached_row.n_abs_from, po_pro_cached_row.n_abs_to, po_pro_cached_row.offset)
                                     if segment_geom:
                                         if 'csgn' in draw_markers:
                                             self.rb_csgn.setToGeometry(segment_geom, self.derived_settings.refLyr)
@@ -5813,7 +5985,7 @@ class LolEvt(qgis.gui.QgsMapToolEmitPoint):
 
                                         if 'csgn' in extent_markers:
                                             extent = segment_geom.boundingBox()
-                                            tr = qgis.core.QgsCoordinateTransform(self.derived_settings.refLyr.crs(), self.iface.mapCanvas().mapSettings().destinationCrs(), qgis.core.QgsProject.instance())
+                                            tr = get_transform(self.derived_settings.refLyr.crs(), get_canvas_crs())
                                             extent = tr.transformBoundingBox(extent)
                                             x_coords.append(extent.xMinimum())
                                             x_coords.append(extent.xMaximum())
@@ -5828,9 +6000,9 @@ class LolEvt(qgis.gui.QgsMapToolEmitPoint):
                                     self.dlg_append_log_message('INFO', str(err))
 
                             if 'cnf' in draw_markers or 'cnf' in extent_markers:
-                                projected_point_n = cached_geom.interpolate(po_pro_cached_feature.pol_from.snap_n_abs)
+                                projected_point_n = cached_geom.interpolate(po_pro_cached_row.n_abs_from)
                                 if not projected_point_n.isEmpty():
-                                    projected_point_n.transform(qgis.core.QgsCoordinateTransform(self.derived_settings.refLyr.crs(), self.iface.mapCanvas().mapSettings().destinationCrs(), qgis.core.QgsProject.instance()))
+                                    projected_point_n.transform(get_transform(self.derived_settings.refLyr.crs(), get_canvas_crs()))
 
                                     if 'cnf' in draw_markers:
                                         self.vm_pt_cnf.setCenter(projected_point_n.asPoint())
@@ -5842,9 +6014,9 @@ class LolEvt(qgis.gui.QgsMapToolEmitPoint):
 
                             if 'cnt' in draw_markers or 'cnt' in extent_markers:
 
-                                projected_point_n = cached_geom.interpolate(po_pro_cached_feature.pol_to.snap_n_abs)
+                                projected_point_n = cached_geom.interpolate(po_pro_cached_row.n_abs_to)
                                 if not projected_point_n.isEmpty():
-                                    projected_point_n.transform(qgis.core.QgsCoordinateTransform(self.derived_settings.refLyr.crs(), self.iface.mapCanvas().mapSettings().destinationCrs(), qgis.core.QgsProject.instance()))
+                                    projected_point_n.transform(get_transform(self.derived_settings.refLyr.crs(), get_canvas_crs()))
 
                                     if 'cnt' in draw_markers:
                                         self.vm_pt_cnt.setCenter(projected_point_n.asPoint())
@@ -5862,7 +6034,7 @@ class LolEvt(qgis.gui.QgsMapToolEmitPoint):
                             # zoom/pan tor reference-line !?
                             if 'rfl' in extent_markers:
                                 extent = reference_geom.boundingBox()
-                                tr = qgis.core.QgsCoordinateTransform(self.derived_settings.refLyr.crs(), self.iface.mapCanvas().mapSettings().destinationCrs(), qgis.core.QgsProject.instance())
+                                tr = get_transform(self.derived_settings.refLyr.crs(), get_canvas_crs())
                                 extent = tr.transformBoundingBox(extent)
 
                                 x_coords.append(extent.xMinimum())
@@ -5876,7 +6048,7 @@ class LolEvt(qgis.gui.QgsMapToolEmitPoint):
 
                             if 'crfl' in extent_markers:
                                 extent = cached_geom.boundingBox()
-                                tr = qgis.core.QgsCoordinateTransform(self.derived_settings.refLyr.crs(), self.iface.mapCanvas().mapSettings().destinationCrs(), qgis.core.QgsProject.instance())
+                                tr = get_transform(self.derived_settings.refLyr.crs(), get_canvas_crs())
                                 extent = tr.transformBoundingBox(extent)
 
                                 x_coords.append(extent.xMinimum())
@@ -5932,7 +6104,7 @@ class LolEvt(qgis.gui.QgsMapToolEmitPoint):
 
             if 'rfl' in extent_markers:
                 extent = reference_geom.boundingBox()
-                tr = qgis.core.QgsCoordinateTransform(self.derived_settings.refLyr.crs(), self.iface.mapCanvas().mapSettings().destinationCrs(), qgis.core.QgsProject.instance())
+                tr = get_transform(self.derived_settings.refLyr.crs(), get_canvas_crs())
                 extent = tr.transformBoundingBox(extent)
                 x_coords.append(extent.xMinimum())
                 x_coords.append(extent.xMaximum())
@@ -5943,7 +6115,7 @@ class LolEvt(qgis.gui.QgsMapToolEmitPoint):
                 # no pre-check, but try & error
                 projected_point = reference_geom.interpolate(stationing_n)
                 if not projected_point.isEmpty():
-                    projected_point.transform(qgis.core.QgsCoordinateTransform(self.derived_settings.refLyr.crs(), self.iface.mapCanvas().mapSettings().destinationCrs(), qgis.core.QgsProject.instance()))
+                    projected_point.transform(get_transform(self.derived_settings.refLyr.crs(), get_canvas_crs()))
 
                     if 'snf' in draw_markers:
                         self.vm_snf.setCenter(projected_point.asPoint())
@@ -5990,8 +6162,8 @@ class LolEvt(qgis.gui.QgsMapToolEmitPoint):
             if zoom_to_feature:
                 extent = reference_geom.boundingBox()
                 source_crs = self.derived_settings.refLyr.crs()
-                target_crs = self.iface.mapCanvas().mapSettings().destinationCrs()
-                tr = qgis.core.QgsCoordinateTransform(source_crs, target_crs, qgis.core.QgsProject.instance())
+                target_crs = get_canvas_crs()
+                tr = get_transform(source_crs, target_crs)
                 extent = tr.transformBoundingBox(extent)
                 if extent.area() > 0:
                     self.iface.mapCanvas().setExtent(extent)
@@ -6100,20 +6272,22 @@ class LolEvt(qgis.gui.QgsMapToolEmitPoint):
         :param extent_mode: zoom/pan
         :param projection: optional projection of the coordinates (f.e. refLyr), if omitted, canvas-crs is assumed
         """
-        # Rev. 2024-07-03
+        # Rev. 2026-10-17
         if x_coords and y_coords:
+            canvas_crs = get_canvas_crs()
+            if projection:
+                # all coordinates transformed in one batch, the extent is calculated afterwards in canvas-crs
+                x_coords, y_coords = transform_coords(x_coords, y_coords, projection, canvas_crs)
+
             x_min = min(x_coords)
             y_min = min(y_coords)
             x_max = max(x_coords)
             y_max = max(y_coords)
 
-            unit, zoom_pan_tolerance, display_precision, measure_default_step = tools.MyTools.eval_crs_units(self.iface.mapCanvas().mapSettings().destinationCrs().authid())
+            unit, zoom_pan_tolerance, display_precision, measure_default_step = tools.MyTools.eval_crs_units(canvas_crs.authid())
 
             if x_min <= x_max or y_min <= y_max:
-                extent = qgis.core.QgsRectangle(x_min, y_min, x_max, y_max)
-                if projection:
-                    tr = qgis.core.QgsCoordinateTransform(projection, self.iface.mapCanvas().mapSettings().destinationCrs(), qgis.core.QgsProject.instance())
-                    extent = tr.transformBoundingBox(extent)
+                extent = qgis.core.QgsRectangle(float(x_min), float(y_min), float(x_max), float(y_max))
 
                 if extent_mode == 'zoom':
                     if extent.width() >= zoom_pan_tolerance and extent.height() >= zoom_pan_tolerance:
@@ -6291,28 +6465,16 @@ class LolEvt(qgis.gui.QgsMapToolEmitPoint):
         self.derived_settings.refLyr = None
 
         # Note: Plugin accepts Multi-Layer-Types, but no Multi-Geometry-Features in these Layers
-        linestring_wkb_types = [
-            qgis.core.QgsWkbTypes.LineString25D,
-            qgis.core.QgsWkbTypes.MultiLineString25D,
-            qgis.core.QgsWkbTypes.LineString,
-            qgis.core.QgsWkbTypes.MultiLineString,
-            qgis.core.QgsWkbTypes.LineStringZ,
-            qgis.core.QgsWkbTypes.MultiLineStringZ,
-            qgis.core.QgsWkbTypes.LineStringM,
-            qgis.core.QgsWkbTypes.MultiLineStringM,
-            qgis.core.QgsWkbTypes.LineStringZM,
-            qgis.core.QgsWkbTypes.MultiLineStringZM,
-        ]
-
         # Note: mapLayer can be called with every string or None without exception
         reference_layer = qgis.core.QgsProject.instance().mapLayer(reference_layer_id)
 
         # convenience for the basic requisite:
         # if not set so far or not suiitable: take the topmost linestring-layer
-        # 'virtual' check to exclude Plugins schow-layer
-        if not reference_layer or not (reference_layer.isValid() and reference_layer.type() == qgis.core.QgsMapLayerType.VectorLayer and reference_layer.dataProvider().name() != 'virtual' and reference_layer.dataProvider().wkbType() in linestring_wkb_types):
+        # 'virtual' check to exclude Plugins schow-layer, same for materialized Show-Layers
+        # Rev. 2026-10-17: type-check first, raster-, mesh-layers... get no ReferenceLayerProfile with its layer-signal-connections
+        if not reference_layer or not (reference_layer.isValid() and reference_layer.type() == qgis.core.QgsMapLayerType.VectorLayer and get_reference_layer_profile(reference_layer).is_line and reference_layer.dataProvider().name() != 'virtual' and not is_materialized_show_layer(reference_layer)):
             for cl in qgis.core.QgsProject.instance().mapLayers().values():
-                if cl.isValid() and cl.type() == qgis.core.QgsMapLayerType.VectorLayer and cl.dataProvider().name() != 'virtual' and cl.dataProvider().wkbType() in linestring_wkb_types:
+                if cl.isValid() and cl.type() == qgis.core.QgsMapLayerType.VectorLayer and get_reference_layer_profile(cl).is_line and cl.dataProvider().name() != 'virtual' and not is_materialized_show_layer(cl):
                     reference_layer = cl
                     break
 
@@ -6322,36 +6484,28 @@ class LolEvt(qgis.gui.QgsMapToolEmitPoint):
             if reference_layer.crs().isValid():
                 self.system_vs |= self.SVS.REFERENCE_LAYER_HAS_VALID_CRS
 
-                linestring_m_types = [
-                    qgis.core.QgsWkbTypes.LineStringM,
-                    qgis.core.QgsWkbTypes.MultiLineStringM,
-                    qgis.core.QgsWkbTypes.LineStringZM,
-                    qgis.core.QgsWkbTypes.MultiLineStringZM,
-                ]
-
-                linestring_z_types = [
-                    qgis.core.QgsWkbTypes.LineStringZ,
-                    qgis.core.QgsWkbTypes.MultiLineStringZ,
-                    qgis.core.QgsWkbTypes.LineStringZM,
-                    qgis.core.QgsWkbTypes.MultiLineStringZM,
-                ]
+                layer_profile = get_reference_layer_profile(reference_layer)
 
-                if reference_layer.type() == qgis.core.QgsMapLayerType.VectorLayer and reference_layer.dataProvider().wkbType() in linestring_wkb_types:
+                if layer_profile.is_line:
 
                     self.system_vs |= self.SVS.REFERENCE_LAYER_IS_LINESTRING
 
-                    if reference_layer.dataProvider().wkbType() in linestring_m_types:
+                    if layer_profile.has_m:
                         self.system_vs |= self.SVS.REFERENCE_LAYER_M_ENABLED
                     elif self.stored_settings.lrMode == 'Mabs':
                         self.stored_settings.lrMode = 'Nabs'
                         self.dlg_append_log_message('WARNING', MY_DICT.tr('auto_switched_lr_mode'))
 
-                    if reference_layer.dataProvider().wkbType() in linestring_z_types:
+                    if layer_profile.has_z:
                         self.system_vs |= self.SVS.REFERENCE_LAYER_Z_ENABLED
 
                     self.stored_settings.refLyrId = reference_layer.id()
                     self.derived_settings.refLyr = reference_layer
 
+                    # Rev. 2026-10-17
+                    # the cached geometries and RouteIndex-instances of this layer are invalidated by its own signals, which stay connected after a switch to another reference-layer
+                    watch_reference_layer(reference_layer)
+
                     # new display-string => refresh of dialog-elements
                     self.sys_connect_layer_slot(reference_layer, 'displayExpressionChanged', self.sys_layer_slot)
 
@@ -6370,6 +6524,9 @@ class LolEvt(qgis.gui.QgsMapToolEmitPoint):
                     # geometry change in reference-layer => perform post-processing
                     self.sys_connect_layer_slot(reference_layer, 'geometryChanged', self.sys_layer_slot)
 
+                    # reference-features deleted => remove cached geometries, see GeometryCache
+                    self.sys_connect_layer_slot(reference_layer, 'featuresDeleted', self.sys_layer_slot)
+
                     # edit-command on reference-layer ended (feature modified/inserted/deleted) => refresh qcbn_reference_feature
                     self.sys_connect_layer_slot(reference_layer, 'editCommandEnded', self.sys_layer_slot)
 
@@ -6550,7 +6707,7 @@ class LolEvt(qgis.gui.QgsMapToolEmitPoint):
 
                             # query dataLyr with self.session_data.selected_fids
 
-                            request = qgis.core.QgsFeatureRequest().setFilterFids(list(self.session_data.po_pro_data_cache.keys()))
+                            request = qgis.core.QgsFeatureRequest().setFilterFids(self.session_data.po_pro_data_cache.data_fids())
 
                             # correct order to iterate without subqueries on data-layer
                             ref_id_clause = qgis.core.QgsFeatureRequest.OrderByClause(self.derived_settings.dataLyrReferenceField.name(), True)
@@ -6641,18 +6798,10 @@ class LolEvt(qgis.gui.QgsMapToolEmitPoint):
                                 to_item.setText(str(stationing_to))
                                 to_item.setTextAlignment(QtCore.Qt.AlignRight | QtCore.Qt.AlignCenter)
 
-                                cached_feature = self.session_data.po_pro_data_cache[data_fid]
-
-                                cached_stationing_from = cached_stationing_to = 0
-                                if self.stored_settings.lrMode == 'Nabs':
-                                    cached_stationing_from = cached_feature.pol_from.snap_n_abs
-                                    cached_stationing_to = cached_feature.pol_to.snap_n_abs
-                                elif self.stored_settings.lrMode == 'Nfract':
-                                    cached_stationing_from = cached_feature.pol_from.snap_n_fract
-                                    cached_stationing_to = cached_feature.pol_to.snap_n_fract
-                                elif self.stored_settings.lrMode == 'Mabs':
-                                    cached_stationing_from = cached_feature.pol_from.snap_m_abs
-                                    cached_stationing_to = cached_feature.pol_to.snap_m_abs
+                                # cached stationings are stored in lrMode, see sys_refresh_po_pro_data_cache
+                                cached_row = self.session_data.po_pro_data_cache.row(data_fid)
+                                cached_stationing_from = cached_row.stationing_from
+                                cached_stationing_to = cached_row.stationing_to
 
                                 cached_from_item = MyQtWidgets.QStandardItemCustomSort(self.custom_sort_role)
                                 cached_from_item.setData(cached_stationing_from, self.custom_sort_role)
@@ -6747,6 +6896,13 @@ class LolEvt(qgis.gui.QgsMapToolEmitPoint):
         self.session_data.po_pro_data_cache.pop(data_fid, None)
         self.dlg_refresh_po_pro_section()
 
+    def sys_set_show_layer_index_dirty(self):
+        """the show-layer is a virtual layer without own edit-signals, its contents change with edits and filters in data- and reference-layer
+        => its hash-index data_id => show_fid (see tool_get_show_fids_by_data_fids) is marked for rebuild on next usage"""
+        # Rev. 2026-10-17
+        if self.derived_settings.showLyr is not None:
+            set_feature_value_index_dirty(self.derived_settings.showLyr.id())
+
     def sys_refresh_po_pro_reference_cache(self, ref_fid, current_geom):
         """triggered by conn_signal == 'geometryChanged' from reference-layer (before commit)
         validity-check of the changed and the provider-geometry regarding self.stored_settings.lrMode
@@ -6763,7 +6919,7 @@ class LolEvt(qgis.gui.QgsMapToolEmitPoint):
         for ref_feature in self.derived_settings.refLyr.dataProvider().getFeatures(feature_request):
             provider_geom = ref_feature.geometry()
             if self.stored_settings.lrMode == 'Mabs':
-                geom_m_valid, error_msg = tools.MyTools.check_geom_m_valid(current_geom)
+                geom_m_valid, error_msg = tools.MyTools.check_geom_m_valid(current_geom, self.derived_settings.refLyr.id(), ref_fid)
                 if geom_m_valid:
                     checked_current_geom = current_geom
                 else:
@@ -6775,7 +6931,7 @@ class LolEvt(qgis.gui.QgsMapToolEmitPoint):
                 else:
                     self.dlg_append_log_message('WARNING', MY_DICT.tr('exc_po_pro_provider_geom_not_m_valid', ref_fid,error_msg))
             else:
-                geom_n_valid, error_msg = tools.MyTools.check_geom_n_valid(current_geom)
+                geom_n_valid, error_msg = tools.MyTools.check_geom_n_valid(current_geom, self.derived_settings.refLyr.id(), ref_fid)
                 if geom_n_valid:
                     checked_current_geom = current_geom
                 else:
@@ -6808,11 +6964,8 @@ class LolEvt(qgis.gui.QgsMapToolEmitPoint):
             ref_feature, error_msg = self.tool_get_reference_feature(ref_fid = ref_fid)
             if ref_feature:
                 ref_id = ref_feature[self.derived_settings.refLyrIdField.name()]
-                get_data_features_request = qgis.core.QgsFeatureRequest()
-                get_data_features_request.setFilterExpression(f'"{self.derived_settings.dataLyrReferenceField.name()}" = \'{ref_id}\'')
-                data_features = self.derived_settings.dataLyr.getFeatures(get_data_features_request)
-                for data_feature in data_features:
-                    self.session_data.po_pro_data_cache.pop(data_feature.id(),None)
+                # Rev. 2026-10-17: inverted index ref_id => data-features instead of filter-expression-query
+                self.session_data.po_pro_data_cache.remove(self.tool_get_route_event_index().get_data_fids(ref_id))
 
                 self.dlg_refresh_po_pro_section()
 
@@ -6825,11 +6978,11 @@ class LolEvt(qgis.gui.QgsMapToolEmitPoint):
         :param keep_cache:  True => keep self.session_data.po_pro_data_cache with previously cached stationings
                             False => reset self.session_data.po_pro_data_cache and recalculate segments with current stationings
         """
-        # Rev. 2024-07-03
+        # Rev. 2026-10-17
         self.cvs_hide_markers(['cnf', 'cnt', 'csgn', 'crfl', 'cuca', 'cacu'])
 
         if not keep_cache:
-            self.session_data.po_pro_data_cache = {}
+            self.session_data.po_pro_data_cache = EventTable()
 
         if self.SVS.REFERENCE_AND_DATA_LAYER_COMPLETE in self.system_vs:
             if self.session_data.po_pro_reference_cache:
@@ -6838,6 +6991,14 @@ class LolEvt(qgis.gui.QgsMapToolEmitPoint):
                 # adfc => affected data feature count
                 adfc = 0
 
+                # columns of the affected features, stored in one batch to self.session_data.po_pro_data_cache
+                po_pro_columns = collections.defaultdict(list)
+
+                # property of PoLFeature with the stationing in lrMode
+                stationing_prop = {'Nabs': 'snap_n_abs', 'Nfract': 'snap_n_fract', 'Mabs': 'snap_m_abs'}.get(self.stored_settings.lrMode, 'snap_n_abs')
+                # only the stationing in the current lr_mode is stored, the other derived measurements are not calculated
+                stationing_outputs = LR_MODE_OUTPUTS.get(self.stored_settings.lrMode, PoLOutputs.NONE)
+
                 for ref_fid in self.session_data.po_pro_reference_cache:
                     # check, if the cached reference-feature still exists in reference-layer
 
@@ -6849,61 +7010,68 @@ class LolEvt(qgis.gui.QgsMapToolEmitPoint):
 
                             ref_id = ref_feature[self.derived_settings.refLyrIdField.name()]
 
-                            get_data_features_request = qgis.core.QgsFeatureRequest()
-                            get_data_features_request.setFilterExpression(f'"{self.derived_settings.dataLyrReferenceField.name()}" = \'{ref_id}\'')
-                            # QgsFeatureIterator
-                            data_features = self.derived_settings.dataLyr.getFeatures(get_data_features_request)
+                            # Rev. 2026-10-17: assigned data-features from the inverted index ref_id => events instead of filter-expression-query
+                            # list of tuple(data_fid, stationing_from, stationing_to), the stationings of all assigned data-features are calculated in one batch on the cached geometry
+                            route_events = self.tool_get_route_event_index().get_events(ref_id)
 
-                            for data_feature in data_features:
-                                stationing_from = data_feature[self.stored_settings.dataLyrStationingFromFieldName]
-                                stationing_to = data_feature[self.stored_settings.dataLyrStationingToFieldName]
+                            # [from_0, to_0, from_1, to_1...]
+                            cached_stationings = [stationing for data_fid, stationing_from, stationing_to in route_events for stationing in [stationing_from, stationing_to]]
+                            cached_stationing_arrays, error_msg = tools.MyTools.recalc_stationings(cached_geom, cached_stationings, self.stored_settings.lrMode, None, stationing_outputs)
+                            if not cached_stationing_arrays:
+                                self.dlg_append_log_message('INFO', MY_DICT.tr('pol_recalculation_failed', error_msg))
 
-                                measure_feature = self.tool_create_lol_feature(data_feature.id())
-
-                                cached_feature = measure_feature.__copy__()
-                                cached_feature.pol_from = cached_feature.pol_to = None
+                            # tuple(data_fid, measure_feature, cached_pol_from, cached_pol_to) with valid current and cached stationings, segments calculated in one batch for each geometry
+                            segment_rows = []
+                            for row_idx, (data_fid, stationing_from, stationing_to) in enumerate(route_events):
+                                measure_feature = self.tool_create_lol_feature(data_fid)
 
                                 cached_pol_from = PoLFeature()
-                                cached_pol_from.set_cached_geom(cached_geom, self.derived_settings.refLyr.crs().authid())
-                                cached_pol_from.recalc_by_stationing(stationing_from, self.stored_settings.lrMode)
-
-                                if cached_pol_from.is_valid:
-                                    cached_feature.pol_from = cached_pol_from
+                                cached_pol_from.set_cached_geom(cached_geom, get_reference_layer_profile(self.derived_settings.refLyr).authid)
 
                                 cached_pol_to = PoLFeature()
-                                cached_pol_to.set_cached_geom(cached_geom, self.derived_settings.refLyr.crs().authid())
-                                cached_pol_to.recalc_by_stationing(stationing_to, self.stored_settings.lrMode)
+                                cached_pol_to.set_cached_geom(cached_geom, get_reference_layer_profile(self.derived_settings.refLyr).authid)
 
-                                if cached_pol_to.is_valid:
-                                    cached_feature.pol_to = cached_pol_to
+                                if cached_stationing_arrays:
+                                    cached_pol_from.set_by_stationing_arrays(cached_stationing_arrays, 2 * row_idx, self.stored_settings.lrMode, stationing_from, outputs=stationing_outputs)
+                                    cached_pol_to.set_by_stationing_arrays(cached_stationing_arrays, 2 * row_idx + 1, self.stored_settings.lrMode, stationing_to, outputs=stationing_outputs)
 
                                 if measure_feature.pol_from.is_valid and measure_feature.pol_to.is_valid and cached_pol_from.is_valid and cached_pol_to.is_valid:
-                                    current_segment_geom, segment_error = tools.MyTools.get_segment_geom_n(current_geom, measure_feature.pol_from.snap_n_abs, measure_feature.pol_to.snap_n_abs)
-
-                                    if current_segment_geom:
-                                        cached_segment_geom, segment_error = tools.MyTools.get_segment_geom_n(cached_geom, cached_pol_from.snap_n_abs, cached_pol_to.snap_n_abs)
-
-                                        if cached_segment_geom:
-                                            if not current_segment_geom.isEmpty() and not cached_segment_geom.isEmpty():
-                                                if not current_segment_geom.equals(cached_segment_geom):
-                                                    adfc += 1
-                                                    if adfc < self._po_pro_max_feature_count:
-                                                        self.session_data.po_pro_data_cache[data_feature.id()] = cached_feature
-                                                    else:
-                                                        self.dlg_append_log_message('INFO', MY_DICT.tr('max_num_po_pro_features_exceeded', self._po_pro_max_feature_count))
-                                            else:
-                                                # at least one of the segments was empty, should not happen, if pol_from/pol_to was valid
-                                                self.dlg_append_log_message('INFO', MY_DICT.tr('empty_po_pro_feature_skipped', data_feature.id()))
+                                    segment_rows.append((data_fid, measure_feature, cached_pol_from, cached_pol_to))
                                 else:
-                                    self.dlg_append_log_message('INFO', MY_DICT.tr('invalid_po_pro_feature_skipped', data_feature.id()))
+                                    self.dlg_append_log_message('INFO', MY_DICT.tr('invalid_po_pro_feature_skipped', data_fid))
+
+                            current_segment_geoms, segment_error = tools.MyTools.get_segment_geoms_n(current_geom, [segment_row[1].pol_from.snap_n_abs for segment_row in segment_rows], [segment_row[1].pol_to.snap_n_abs for segment_row in segment_rows], None, get_route_index(current_geom, self.derived_settings.refLyr.id(), ref_fid))
+                            cached_segment_geoms, segment_error = tools.MyTools.get_segment_geoms_n(cached_geom, [segment_row[2].snap_n_abs for segment_row in segment_rows], [segment_row[3].snap_n_abs for segment_row in segment_rows])
+
+                            if current_segment_geoms and cached_segment_geoms:
+                                for segment_idx, (data_fid, measure_feature, cached_pol_from, cached_pol_to) in enumerate(segment_rows):
+                                    current_segment_geom = current_segment_geoms[segment_idx]
+                                    cached_segment_geom = cached_segment_geoms[segment_idx]
+                                    if current_segment_geom and cached_segment_geom:
+                                        if not current_segment_geom.isEmpty() and not cached_segment_geom.isEmpty():
+                                            if not current_segment_geom.equals(cached_segment_geom):
+                                                adfc += 1
+                                                if adfc < self._po_pro_max_feature_count:
+                                                    po_pro_columns['data_fid'].append(data_fid)
+                                                    po_pro_columns['ref_fid'].append(ref_fid)
+                                                    po_pro_columns['stationing_from'].append(getattr(cached_pol_from, stationing_prop))
+                                                    po_pro_columns['stationing_to'].append(getattr(cached_pol_to, stationing_prop))
+                                                    po_pro_columns['offset'].append(measure_feature.offset if isinstance(measure_feature.offset, numbers.Number) else np.nan)
+                                                    po_pro_columns['n_abs_from'].append(cached_pol_from.snap_n_abs)
+                                                    po_pro_columns['n_abs_to'].append(cached_pol_to.snap_n_abs)
+                                                else:
+                                                    self.dlg_append_log_message('INFO', MY_DICT.tr('max_num_po_pro_features_exceeded', self._po_pro_max_feature_count))
+                                        else:
+                                            # at least one of the segments was empty, should not happen, if pol_from/pol_to was valid
+                                            self.dlg_append_log_message('INFO', MY_DICT.tr('empty_po_pro_feature_skipped', data_fid))
 
                         else:
                             self.dlg_append_log_message('WARNING', MY_DICT.tr('exc_reference_feature_wo_geom',ref_feature.id()))
                     else:
                         self.dlg_append_log_message('WARNING', error_msg)
 
-
-
+                if po_pro_columns:
+                    self.session_data.po_pro_data_cache.extend(**po_pro_columns)
 
                 if not adfc:
                     self.dlg_append_log_message('INFO', MY_DICT.tr('no_po_pro_features_affected'))
@@ -6985,7 +7153,6 @@ class LolEvt(qgis.gui.QgsMapToolEmitPoint):
 
         self.session_data.po_pro_feature = None
         if data_fid in self.session_data.po_pro_data_cache:
-            po_pro_cached_feature = self.session_data.po_pro_data_cache[data_fid]
             po_pro_feature = self.tool_create_lol_feature(data_fid)
             if po_pro_feature:
                 if po_pro_feature.ref_fid in self.session_data.po_pro_reference_cache:
@@ -7286,6 +7453,13 @@ class LolEvt(qgis.gui.QgsMapToolEmitPoint):
                 if all(s in show_layer.dataProvider().uri().uri() for s in virtual_check_contents):
                     self.system_vs |= self.SVS.SHOW_LAYER_EXISTS
 
+            # Rev. 2026-10-17
+            # ... or materialized Show-Layer created with the current settings
+            if is_materialized_show_layer(show_layer, self.tool_get_show_layer_source_settings()):
+                self.system_vs |= self.SVS.SHOW_LAYER_EXISTS
+                # starts the maintenance, the layer is (re-)filled on first usage
+                get_materialized_show_layer(show_layer)
+
             if self.SVS.SHOW_LAYER_EXISTS in self.system_vs:
                 self.stored_settings.showLyrId = show_layer.id()
                 self.derived_settings.showLyr = show_layer
@@ -7348,7 +7522,7 @@ class LolEvt(qgis.gui.QgsMapToolEmitPoint):
                             items[3].setData(first_vertex_m, 0)
                             items[4] = QtGui.QStandardItem()
                             items[4].setData(last_vertex_m, 0)
-                        geom_m_valid, error_msg = tools.MyTools.check_geom_m_valid(ref_feature.geometry())
+                        geom_m_valid, error_msg = tools.MyTools.check_geom_m_valid(ref_feature.geometry(), self.derived_settings.refLyr.id(), ref_feature.id())
                         if not geom_m_valid:
                             for ic in items:
                                 items[ic].setForeground(QtGui.QColor('red'))
@@ -7600,18 +7774,18 @@ class LolEvt(qgis.gui.QgsMapToolEmitPoint):
                 field_sql_lst.append(f"""
                 ST_OffsetCurve(
                     ST_Line_Substring(
-                        st_linemerge(ref_lyr.geometry), 
-                        data_lyr.'{self.derived_settings.dataLyrStationingFromField.name()}'/st_length(st_linemerge(ref_lyr.geometry)),
-                        data_lyr.'{self.derived_settings.dataLyrStationingToField.name()}'/st_length(st_linemerge(ref_lyr.geometry))
+                        ref_lyr.merged_geom, 
+                        data_lyr.'{self.derived_settings.dataLyrStationingFromField.name()}'/ref_lyr.merged_length,
+                        data_lyr.'{self.derived_settings.dataLyrStationingToField.name()}'/ref_lyr.merged_length
                     ),
                     data_lyr.'{self.derived_settings.dataLyrOffsetField.name()}'
                 ) as {line_geom_alias} /*:linestring:{self.derived_settings.refLyr.crs().postgisSrid()}*/""")
             elif self.stored_settings.lrMode == 'Nfract':
-                # same as above, but stationings as fractions of reference-line-length, so no need for "/st_length(st_linemerge(ref_lyr.geometry))"
+                # same as above, but stationings as fractions of reference-line-length, so no need for "/ref_lyr.merged_length"
                 field_sql_lst.append(f"""
                 ST_OffsetCurve(
                     ST_Line_Substring(
-                        ST_LineMerge(ref_lyr.geometry), 
+                        ref_lyr.merged_geom, 
                         data_lyr.'{self.derived_settings.dataLyrStationingFromField.name()}',
                         data_lyr.'{self.derived_settings.dataLyrStationingToField.name()}'
                     ),
@@ -7627,21 +7801,22 @@ class LolEvt(qgis.gui.QgsMapToolEmitPoint):
                 # 3. ST_Line_Substring(geom, N-from-measure, N-to-measure) => get segment for the interpolated points
                 # 4. ST_OffsetCurve(geom, offset) => offset the segment from line
                 #
+                # route_geom: reference-geometry taken once per route from the virtual table, see tools.MyTools.get_route_sub_select_sql
                 field_sql_lst.append(f"""
                 ST_OffsetCurve(
                     ST_Line_Substring(
-                        ref_lyr.geometry, 
+                        ref_lyr.route_geom, 
                         ST_Line_Locate_Point(
-                            ref_lyr.geometry,
+                            ref_lyr.route_geom,
                             ST_TrajectoryInterpolatePoint(
-                                ref_lyr.geometry,
+                                ref_lyr.route_geom,
                                 data_lyr.'{self.derived_settings.dataLyrStationingFromField.name()}'
                             )
                         ), 
                         ST_Line_Locate_Point(
-                            ref_lyr.geometry,
+                            ref_lyr.route_geom,
                             ST_TrajectoryInterpolatePoint(
-                                ref_lyr.geometry,
+                                ref_lyr.route_geom,
                                 data_lyr.'{self.derived_settings.dataLyrStationingToField.name()}'
                             )
                         )
@@ -7652,16 +7827,29 @@ class LolEvt(qgis.gui.QgsMapToolEmitPoint):
                 raise NotImplementedError(f"lr_mode '{self.stored_settings.lrMode}' not implemented")
 
             show_lyr_sql += ',\n'.join(field_sql_lst)
-            show_lyr_sql += f"\nFROM  '{self.derived_settings.dataLyr.id()}' as data_lyr"
-            show_lyr_sql += f"\n  INNER JOIN '{self.derived_settings.refLyr.id()}' as ref_lyr"
             integer_field_types = [QtCore.QMetaType.Int, QtCore.QMetaType.UInt, QtCore.QMetaType.LongLong, QtCore.QMetaType.ULongLong]
+            # Rev. 2026-10-17
             if self.derived_settings.dataLyrReferenceField.type() in integer_field_types:
-                show_lyr_sql += f" ON data_lyr.'{self.stored_settings.dataLyrReferenceFieldName}' = ref_lyr.'{self.derived_settings.refLyrIdField.name()}'"
+                show_lyr_sql += f"\nFROM  '{self.derived_settings.dataLyr.id()}' as data_lyr"
             else:
-                # needed with non-integer join-fields, bug?
-                # makes the query/layer *very* slow, presumably because of missing indexes?
-                # -> better avoid non-integer PKs
-                show_lyr_sql += f" ON (data_lyr.'{self.stored_settings.dataLyrReferenceFieldName}' = ref_lyr.'{self.derived_settings.refLyrIdField.name()}') = True"
+                # non-integer join-fields, f.e. route-codes:
+                # the former workaround "ON (data_lyr.reference_field = ref_lyr.id) = True" was *very* slow, because no index could be used
+                # the materialized sub-select keeps the join-constraint away from the virtual table and allows an automatic index
+                data_sub_select_sql = tools.MyTools.get_data_sub_select_sql(
+                    self.derived_settings.dataLyr.id(),
+                    [
+                        self.derived_settings.dataLyrIdField.name(),
+                        self.derived_settings.dataLyrReferenceField.name(),
+                        self.derived_settings.dataLyrStationingFromField.name(),
+                        self.derived_settings.dataLyrStationingToField.name(),
+                        self.derived_settings.dataLyrOffsetField.name()
+                    ]
+                )
+                show_lyr_sql += f"\nFROM  {data_sub_select_sql} as data_lyr"
+            # join with a per-route sub-select instead of the Reference-Layer itself:
+            # the route-geometry-expressions (ST_LineMerge, ST_Length...) are evaluated once per route instead of up to three times per event
+            show_lyr_sql += f"\n  INNER JOIN {tools.MyTools.get_route_sub_select_sql(self.derived_settings.refLyr.id(), self.derived_settings.refLyrIdField.name(), self.stored_settings.lrMode)} as ref_lyr"
+            show_lyr_sql += f" ON data_lyr.'{self.stored_settings.dataLyrReferenceFieldName}' = ref_lyr.route_id"
 
             # note:
             # layer is valid without urllib.parse.quote, but cl.dataProvider().uri().uri() returns only a partial query
@@ -7689,66 +7877,120 @@ class LolEvt(qgis.gui.QgsMapToolEmitPoint):
 
             show_lyr = qgis.core.QgsVectorLayer(uri, show_layer_name, "virtual")
             if show_lyr and show_lyr.renderer():
+                self.sys_register_show_layer(show_lyr)
+            else:
+                self.dlg_append_log_message('WARNING', MY_DICT.tr('error_creating_virtual_layer'))
 
-                # Join Data-Layer
-                qvl_join_data_lyr = qgis.core.QgsVectorLayerJoinInfo()
-                qvl_join_data_lyr.setJoinLayer(self.derived_settings.dataLyr)
-                qvl_join_data_lyr.setJoinFieldName(self.derived_settings.dataLyrIdField.name())
-                # 1:1 join, using the identical field-name
-                self.stored_settings.showLyrBackReferenceFieldName = self.derived_settings.dataLyrIdField.name()
-                qvl_join_data_lyr.setTargetFieldName(self.stored_settings.showLyrBackReferenceFieldName)
-                qvl_join_data_lyr.setUsingMemoryCache(True)
-                show_lyr.addJoin(qvl_join_data_lyr)
-
-                # Join Reference-Layer
-                qvl_join_ref_lyr = qgis.core.QgsVectorLayerJoinInfo()
-                qvl_join_ref_lyr.setJoinLayer(self.derived_settings.refLyr)
-                qvl_join_ref_lyr.setJoinFieldName(self.derived_settings.refLyrIdField.name())
-                qvl_join_ref_lyr.setTargetFieldName(self.derived_settings.dataLyrReferenceField.name())
-                qvl_join_ref_lyr.setUsingMemoryCache(True)
-                show_lyr.addJoin(qvl_join_ref_lyr)
-
-                # convenience: remove joined duplicates, these fields are almost queried in virtual-layer-uri
-                # Note: the aliased field-names from data-layer will stay visible, only the joined ones "table-name_field-name" will be hidden
-                atc = show_lyr.attributeTableConfig()
-                hide_field_names = [
-                    self.derived_settings.dataLyrReferenceField.name(),
-                    self.derived_settings.dataLyrStationingToField.name(),
-                    self.derived_settings.dataLyrOffsetField.name(),
-                ]
+        else:
+            self.dlg_append_log_message('INFO', MY_DICT.tr('reference_or_data_layer_missing'))
 
+    def s_create_show_layer(self):
+        """slot for pbtn_create_show_layer: virtual Show-Layer, with Shift-modifier materialized Show-Layer, with Ctrl-modifier materialized Show-Layer limited to the canvas-extent"""
+        # Rev. 2026-10-17
+        if QtCore.Qt.ControlModifier & QtWidgets.QApplication.keyboardModifiers():
+            self.sys_create_materialized_show_layer(True)
+        elif QtCore.Qt.ShiftModifier & QtWidgets.QApplication.keyboardModifiers():
+            self.sys_create_materialized_show_layer()
+        else:
+            self.sys_create_show_layer()
 
-                columns = atc.columns()
-                for column in columns:
-                    if column.name in hide_field_names:
-                        column.hidden = True
+    def sys_create_materialized_show_layer(self, extent_limited: bool = False):
+        """create and register materialized Show-Layer:
+        memory-layer with spatial index and precalculated geometries, maintained on edits in Data- and Reference-Layer
+        alternative to the virtual layer of sys_create_show_layer for large Data-Layers, see MaterializedShowLayer
+        :param extent_limited: True => geometries only calculated for the routes inside the canvas-extent, for large Reference-Layers
+        """
+        # Rev. 2026-10-17
+        if self.SVS.REFERENCE_AND_DATA_LAYER_COMPLETE in self.system_vs:
+            layer_names = [layer.name() for layer in qgis.core.QgsProject.instance().mapLayers().values()]
+            template = f"LoL_Show_Layer_{self.stored_settings.lrMode}_materialized_{'extent_' if extent_limited else ''}{{curr_i}}"
+            show_layer_name = tools.MyTools.get_unique_string(layer_names, template, 1)
 
-                atc.setColumns(columns)
+            # empty layer, filled on sys_connect_show_layer
+            show_lyr = create_materialized_show_layer(show_layer_name, self.tool_get_show_layer_source_settings(), extent_limited)
+            if show_lyr and show_lyr.renderer():
+                self.sys_register_show_layer(show_lyr)
+            else:
+                self.dlg_append_log_message('WARNING', MY_DICT.tr('error_creating_virtual_layer'))
+        else:
+            self.dlg_append_log_message('INFO', MY_DICT.tr('reference_or_data_layer_missing'))
 
-                show_lyr.setAttributeTableConfig(atc)
+    def sys_register_show_layer(self, show_lyr: qgis.core.QgsVectorLayer):
+        """joins, attribute-table-config and style of a new Show-Layer, registers the layer in project and settings
+        :param show_lyr: virtual layer from sys_create_show_layer rsp. materialized layer from sys_create_materialized_show_layer
+        """
+        # Rev. 2026-10-17
+        # Join Data-Layer
+        qvl_join_data_lyr = qgis.core.QgsVectorLayerJoinInfo()
+        qvl_join_data_lyr.setJoinLayer(self.derived_settings.dataLyr)
+        qvl_join_data_lyr.setJoinFieldName(self.derived_settings.dataLyrIdField.name())
+        # 1:1 join, using the identical field-name
+        self.stored_settings.showLyrBackReferenceFieldName = self.derived_settings.dataLyrIdField.name()
+        qvl_join_data_lyr.setTargetFieldName(self.stored_settings.showLyrBackReferenceFieldName)
+        qvl_join_data_lyr.setUsingMemoryCache(True)
+        show_lyr.addJoin(qvl_join_data_lyr)
+
+        # Join Reference-Layer
+        qvl_join_ref_lyr = qgis.core.QgsVectorLayerJoinInfo()
+        qvl_join_ref_lyr.setJoinLayer(self.derived_settings.refLyr)
+        qvl_join_ref_lyr.setJoinFieldName(self.derived_settings.refLyrIdField.name())
+        qvl_join_ref_lyr.setTargetFieldName(self.derived_settings.dataLyrReferenceField.name())
+        qvl_join_ref_lyr.setUsingMemoryCache(True)
+        show_lyr.addJoin(qvl_join_ref_lyr)
+
+        # convenience: remove joined duplicates, these fields are almost queried in virtual-layer-uri rsp. copied to the materialized layer
+        # Note: the aliased field-names from data-layer will stay visible, only the joined ones "table-name_field-name" will be hidden
+        atc = show_lyr.attributeTableConfig()
+        hide_field_names = [
+            self.derived_settings.dataLyrReferenceField.name(),
+            self.derived_settings.dataLyrStationingToField.name(),
+            self.derived_settings.dataLyrOffsetField.name(),
+        ]
 
-                show_lyr.renderer().symbol().setWidthUnit(qgis.core.QgsUnitTypes.RenderUnit.RenderPixels)
-                show_lyr.renderer().symbol().setWidth(6)
 
-                show_lyr.renderer().symbol().setColor(QtGui.QColor(self.stored_settings.show_layer_default_line_color))
-                show_lyr.renderer().symbol().setOpacity(0.8)
+        columns = atc.columns()
+        for column in columns:
+            if column.name in hide_field_names:
+                column.hidden = True
 
-                # additional, should already be done by uri
-                show_lyr.setCrs(self.derived_settings.refLyr.crs())
+        atc.setColumns(columns)
 
-                qgis.core.QgsProject.instance().addMapLayer(show_lyr)
+        show_lyr.setAttributeTableConfig(atc)
 
-                self.stored_settings.showLyrId = show_lyr.id()
+        show_lyr.renderer().symbol().setWidthUnit(qgis.core.QgsUnitTypes.RenderUnit.RenderPixels)
+        show_lyr.renderer().symbol().setWidth(6)
 
-                self.sys_check_settings()
-                self.dlg_refresh_layer_settings_section()
-                self.dlg_refresh_feature_selection_section()
-                self.dlg_append_log_message('SUCCESS', MY_DICT.tr('show_layer_created', show_layer_name))
-            else:
-                self.dlg_append_log_message('WARNING', MY_DICT.tr('error_creating_virtual_layer'))
+        show_lyr.renderer().symbol().setColor(QtGui.QColor(self.stored_settings.show_layer_default_line_color))
+        show_lyr.renderer().symbol().setOpacity(0.8)
 
-        else:
-            self.dlg_append_log_message('INFO', MY_DICT.tr('reference_or_data_layer_missing'))
+        # additional, should already be done by uri rsp. createMemoryLayer
+        show_lyr.setCrs(self.derived_settings.refLyr.crs())
+
+        qgis.core.QgsProject.instance().addMapLayer(show_lyr)
+
+        self.stored_settings.showLyrId = show_lyr.id()
+
+        self.sys_check_settings()
+        self.dlg_refresh_layer_settings_section()
+        self.dlg_refresh_feature_selection_section()
+        self.dlg_append_log_message('SUCCESS', MY_DICT.tr('show_layer_created', show_lyr.name()))
+
+    def tool_get_show_layer_source_settings(self) -> dict:
+        """current layer- and field-settings as source-settings of a materialized Show-Layer, see create_materialized_show_layer
+        requires registered Reference- and Data-Layer
+        """
+        # Rev. 2026-10-17
+        return {
+            'lr_mode': self.stored_settings.lrMode,
+            'reference_layer_id': self.derived_settings.refLyr.id(),
+            'reference_id_field': self.derived_settings.refLyrIdField.name(),
+            'data_layer_id': self.derived_settings.dataLyr.id(),
+            'data_id_field': self.derived_settings.dataLyrIdField.name(),
+            'data_reference_field': self.derived_settings.dataLyrReferenceField.name(),
+            'stationing_from_field': self.derived_settings.dataLyrStationingFromField.name(),
+            'stationing_to_field': self.derived_settings.dataLyrStationingToField.name(),
+            'offset_field': self.derived_settings.dataLyrOffsetField.name() if self.derived_settings.dataLyrOffsetField else None,
+        }
 
     def s_update_stationing(self):
         """
@@ -7772,7 +8014,7 @@ class LolEvt(qgis.gui.QgsMapToolEmitPoint):
                             if ref_feature.hasGeometry():
 
                                 if self.stored_settings.lrMode == 'Mabs':
-                                    geom_m_valid, error_msg = tools.MyTools.check_geom_m_valid(ref_feature.geometry())
+                                    geom_m_valid, error_msg = tools.MyTools.check_geom_m_valid(ref_feature.geometry(), self.derived_settings.refLyr.id(), ref_feature.id())
                                     if not geom_m_valid:
                                         self.dlg_append_log_message('WARNING', MY_DICT.tr('note_reference_geom_not_m_valid', self.session_data.measure_feature.ref_fid,error_msg))
                                 else:
@@ -7847,7 +8089,7 @@ class LolEvt(qgis.gui.QgsMapToolEmitPoint):
                     if ref_feature.hasGeometry():
 
                         if self.stored_settings.lrMode == 'Mabs':
-                            geom_m_valid, error_msg = tools.MyTools.check_geom_m_valid(ref_feature.geometry())
+                            geom_m_valid, error_msg = tools.MyTools.check_geom_m_valid(ref_feature.geometry(), self.derived_settings.refLyr.id(), ref_feature.id())
                             if not geom_m_valid:
                                 self.dlg_append_log_message('WARNING', MY_DICT.tr('note_reference_geom_not_m_valid', self.session_data.measure_feature.ref_fid,error_msg))
                         else:
@@ -8377,18 +8619,6 @@ class LolEvt(qgis.gui.QgsMapToolEmitPoint):
     def dlg_refresh_layer_settings_section(self):
         """refreshes the settings-part in dialog"""
         # Rev. 2024-07-08
-        linestring_wkb_types = [
-            qgis.core.QgsWkbTypes.LineString25D,
-            qgis.core.QgsWkbTypes.MultiLineString25D,
-            qgis.core.QgsWkbTypes.LineString,
-            qgis.core.QgsWkbTypes.MultiLineString,
-            qgis.core.QgsWkbTypes.LineStringZ,
-            qgis.core.QgsWkbTypes.MultiLineStringZ,
-            qgis.core.QgsWkbTypes.LineStringM,
-            qgis.core.QgsWkbTypes.MultiLineStringM,
-            qgis.core.QgsWkbTypes.LineStringZM,
-            qgis.core.QgsWkbTypes.MultiLineStringZM,
-        ]
 
         if self.my_dialog:
 
@@ -8425,7 +8655,7 @@ class LolEvt(qgis.gui.QgsMapToolEmitPoint):
                 if cl.isValid():
                     name_item = QtGui.QStandardItem(cl.name())
                     name_item.setData(cl, self.setting_key_role)
-                    name_item.setEnabled(isinstance(cl, qgis.core.QgsVectorLayer) and cl.dataProvider().name() != 'virtual' and cl.dataProvider().wkbType() in linestring_wkb_types)
+                    name_item.setEnabled(cl.type() == qgis.core.QgsMapLayerType.VectorLayer and get_reference_layer_profile(cl).is_line and cl.dataProvider().name() != 'virtual' and not is_materialized_show_layer(cl))
                     if isinstance(cl, qgis.core.QgsVectorLayer):
                         geometry_item = QtGui.QStandardItem(qgis.core.QgsWkbTypes.displayString(cl.dataProvider().wkbType()))
                     else:
@@ -8684,6 +8914,14 @@ class LolEvt(qgis.gui.QgsMapToolEmitPoint):
                                                                 else:
                                                                     name_item.setToolTip(MY_DICT.tr('virtual_layer_no_fit_ttp'))
 
+                                                        elif is_materialized_show_layer(cl):
+                                                            # Rev. 2026-10-17
+                                                            # materialized Show-Layer, only enabled if created with the current settings
+                                                            if is_materialized_show_layer(cl, self.tool_get_show_layer_source_settings()):
+                                                                name_item.setEnabled(True)
+                                                                name_item.setToolTip(MY_DICT.tr('materialized_show_layer_fit_ttp'))
+                                                            else:
+                                                                name_item.setToolTip(MY_DICT.tr('materialized_show_layer_no_fit_ttp'))
                                                         else:
                                                             # or any layer type vector, Line, non-virtual, because the user
                                                             # might export the slow virtual-layer to file-based layer
@@ -8900,19 +9138,21 @@ class LolEvt(qgis.gui.QgsMapToolEmitPoint):
                 widget.clear()
 
             if pol_from and pol_from.is_valid:
+                # only the expanded groups, the derived measurements are calculated lazily on first access
+                visible_outputs = self.dlg_get_visible_outputs()
                 self.my_dialog.dnspbx_snap_x_from.setValue(pol_from.snap_x)
                 self.my_dialog.dnspbx_snap_y_from.setValue(pol_from.snap_y)
                 self.my_dialog.dspbx_n_abs_from.setValue(pol_from.snap_n_abs)
-                if isinstance(pol_from.snap_n_fract, numbers.Number):
+                if PoLOutputs.N_FRACT in visible_outputs and isinstance(pol_from.snap_n_fract, numbers.Number):
                     # TypeError: unsupported operand type(s) for *: 'NoneType' and 'int'
                     self.my_dialog.dspbx_n_fract_from.setValue(pol_from.snap_n_fract * 100)
                 if self.SVS.REFERENCE_LAYER_M_ENABLED in self.system_vs:
-                    if isinstance(pol_from.snap_m_abs, numbers.Number):
+                    if PoLOutputs.M_ABS in visible_outputs and isinstance(pol_from.snap_m_abs, numbers.Number):
                         self.my_dialog.dspbx_m_abs_from.setValue(pol_from.snap_m_abs)
-                    if isinstance(pol_from.snap_m_fract, numbers.Number):
+                    if PoLOutputs.M_FRACT in visible_outputs and isinstance(pol_from.snap_m_fract, numbers.Number):
                         self.my_dialog.dspbx_m_fract_from.setValue(pol_from.snap_m_fract * 100)
                 if self.SVS.REFERENCE_LAYER_Z_ENABLED in self.system_vs:
-                    if isinstance(pol_from.snap_z_abs, numbers.Number):
+                    if PoLOutputs.Z_ABS in visible_outputs and isinstance(pol_from.snap_z_abs, numbers.Number):
                         self.my_dialog.dnspbx_z_from.setValue(pol_from.snap_z_abs)
 
                 self.dlg_select_qcbn_reference_feature(pol_from.ref_fid)
@@ -8941,19 +9181,21 @@ class LolEvt(qgis.gui.QgsMapToolEmitPoint):
                 widget.clear()
 
             if pol_to and pol_to.is_valid:
+                # only the expanded groups, the derived measurements are calculated lazily on first access
+                visible_outputs = self.dlg_get_visible_outputs()
                 self.my_dialog.dnspbx_snap_x_to.setValue(pol_to.snap_x)
                 self.my_dialog.dnspbx_snap_y_to.setValue(pol_to.snap_y)
                 self.my_dialog.dspbx_n_abs_to.setValue(pol_to.snap_n_abs)
-                if isinstance(pol_to.snap_n_fract, numbers.Number):
+                if PoLOutputs.N_FRACT in visible_outputs and isinstance(pol_to.snap_n_fract, numbers.Number):
                     # TypeError: unsupported operand type(s) for *: 'NoneType' and 'int'
                     self.my_dialog.dspbx_n_fract_to.setValue(pol_to.snap_n_fract * 100)
                 if self.SVS.REFERENCE_LAYER_M_ENABLED in self.system_vs:
-                    if isinstance(pol_to.snap_m_abs, numbers.Number):
+                    if PoLOutputs.M_ABS in visible_outputs and isinstance(pol_to.snap_m_abs, numbers.Number):
                         self.my_dialog.dspbx_m_abs_to.setValue(pol_to.snap_m_abs)
-                    if isinstance(pol_to.snap_m_fract, numbers.Number):
+                    if PoLOutputs.M_FRACT in visible_outputs and isinstance(pol_to.snap_m_fract, numbers.Number):
                         self.my_dialog.dspbx_m_fract_to.setValue(pol_to.snap_m_fract * 100)
                 if self.SVS.REFERENCE_LAYER_Z_ENABLED in self.system_vs:
-                    if isinstance(pol_to.snap_z_abs, numbers.Number):
+                    if PoLOutputs.Z_ABS in visible_outputs and isinstance(pol_to.snap_z_abs, numbers.Number):
                         self.my_dialog.dnspbx_z_to.setValue(pol_to.snap_z_abs)
 
                 self.dlg_select_qcbn_reference_feature(pol_to.ref_fid)
@@ -8965,7 +9207,7 @@ class LolEvt(qgis.gui.QgsMapToolEmitPoint):
         """refreshes dialog-measure-delta-widgets"""
         # Rev. 2024-07-08
         if lol_feature:
-            lol_feature.calculate_delta_measurements()
+            lol_feature.calculate_delta_measurements(self.dlg_get_visible_outputs())
 
             block_widgets = [
                 self.my_dialog.dspbx_delta_n_abs,
@@ -9050,7 +9292,7 @@ class LolEvt(qgis.gui.QgsMapToolEmitPoint):
                 if 'rfl' in extent_markers:
                     # rarely used: pan or zoom to relevant reference-geometry
                     extent = reference_geom.boundingBox()
-                    tr = qgis.core.QgsCoordinateTransform(self.derived_settings.refLyr.crs(), self.iface.mapCanvas().mapSettings().destinationCrs(), qgis.core.QgsProject.instance())
+                    tr = get_transform(self.derived_settings.refLyr.crs(), get_canvas_crs())
                     extent = tr.transformBoundingBox(extent)
                     x_coords.append(extent.xMinimum())
                     x_coords.append(extent.xMaximum())
@@ -9060,7 +9302,7 @@ class LolEvt(qgis.gui.QgsMapToolEmitPoint):
                 if 'snf' in extent_markers or 'enf' in extent_markers:
                     projected_point_n = reference_geom.interpolate(pol_from.snap_n_abs)
                     if not projected_point_n.isEmpty():
-                        projected_point_n.transform(qgis.core.QgsCoordinateTransform(self.derived_settings.refLyr.crs(), self.iface.mapCanvas().mapSettings().destinationCrs(), qgis.core.QgsProject.instance()))
+                        projected_point_n.transform(get_transform(self.derived_settings.refLyr.crs(), get_canvas_crs()))
                         x_coords.append(projected_point_n.asPoint().x())
                         y_coords.append(projected_point_n.asPoint().y())
 
@@ -9115,7 +9357,7 @@ class LolEvt(qgis.gui.QgsMapToolEmitPoint):
                 if 'rfl' in extent_markers:
                     # rarely used: pan or zoom to relevant reference-geometry
                     extent = reference_geom.boundingBox()
-                    tr = qgis.core.QgsCoordinateTransform(self.derived_settings.refLyr.crs(), self.iface.mapCanvas().mapSettings().destinationCrs(), qgis.core.QgsProject.instance())
+                    tr = get_transform(self.derived_settings.refLyr.crs(), get_canvas_crs())
                     extent = tr.transformBoundingBox(extent)
                     x_coords.append(extent.xMinimum())
                     x_coords.append(extent.xMaximum())
@@ -9125,7 +9367,7 @@ class LolEvt(qgis.gui.QgsMapToolEmitPoint):
                 if 'snt' in extent_markers or 'ent' in extent_markers:
                     projected_point_n = reference_geom.interpolate(pol_to.snap_n_abs)
                     if not projected_point_n.isEmpty():
-                        projected_point_n.transform(qgis.core.QgsCoordinateTransform(self.derived_settings.refLyr.crs(), self.iface.mapCanvas().mapSettings().destinationCrs(), qgis.core.QgsProject.instance()))
+                        projected_point_n.transform(get_transform(self.derived_settings.refLyr.crs(), get_canvas_crs()))
                         x_coords.append(projected_point_n.asPoint().x())
                         y_coords.append(projected_point_n.asPoint().y())
 
@@ -9292,7 +9534,7 @@ class LolEvt(qgis.gui.QgsMapToolEmitPoint):
             if (self.SVS.REFERENCE_LAYER_M_ENABLED in self.system_vs) and self.session_data.current_ref_fid is not None:
                 reference_geom, error_msg = self.tool_get_reference_geom(ref_fid=self.session_data.current_ref_fid)
                 if reference_geom:
-                    geom_m_valid, error_msg = tools.MyTools.check_geom_m_valid(reference_geom)
+                    geom_m_valid, error_msg = tools.MyTools.check_geom_m_valid(reference_geom, self.derived_settings.refLyr.id(), self.session_data.current_ref_fid)
                     if not geom_m_valid:
                         self.my_dialog.qlbl_m_abs_valid_hint.setText(MY_DICT.tr('reference_geom_not_m_valid',self.session_data.current_ref_fid,error_msg))
                         self.my_dialog.qlbl_m_fract_valid_hint.setText(MY_DICT.tr('reference_geom_not_m_valid', self.session_data.current_ref_fid,error_msg))
@@ -9669,9 +9911,10 @@ class LolEvt(qgis.gui.QgsMapToolEmitPoint):
             show_fid = None
             if self.SVS.SHOW_LAYER_COMPLETE in self.system_vs:
                 data_id = data_feature[self.stored_settings.dataLyrIdFieldName]
-                show_feature = tools.MyTools.get_feature_by_value(self.derived_settings.showLyr, self.derived_settings.showLyrBackReferenceField, data_id)
-                if show_feature and show_feature.isValid():
-                    show_fid = show_feature.id()
+                # Rev. 2026-10-17: hash-index instead of show-layer-query
+                show_fids = self.tool_get_show_fids_by_data_fids([data_fid])
+                if show_fids:
+                    show_fid = show_fids[0]
                 else:
                     self.dlg_append_log_message('INFO', MY_DICT.tr('no_show_feature_for_data_feature', data_id))
 
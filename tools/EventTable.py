@@ -0,0 +1,237 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+********************************************************************
+
+* Part of the QGis-Plugin LinearReferencing:
+* columnar store for linear-referenced events (struct-of-arrays)
+
+********************************************************************
+
+* Date                 : 2026-10-17
+* Copyright            : (C) 2026 by Ludwig Kniprath
+* Email                : ludwig at kni minus online dot de
+
+********************************************************************
+
+this program is free software; you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation; either version 2 of the License, or
+(at your option) any later version.
+
+.. note::
+    * usage in python console:
+    * from LinearReferencing.tools.EventTable import EventTable
+    * event_table = EventTable()
+    * event_table.extend(data_fid=[1, 2, 3], ref_fid=[7, 7, 8], stationing_from=[0, 10, 5], stationing_to=[10, 20, 15])
+    * for ref_fid, row_indices in event_table.group_by_route(): ...
+
+********************************************************************
+"""
+from __future__ import annotations
+import collections
+import typing
+import numpy as np
+
+# one row of an EventTable as Python-values, see EventTable.row
+EventRow = collections.namedtuple('EventRow', ['data_fid', 'ref_fid', 'stationing_from', 'stationing_to', 'offset', 'fvs', 'n_abs_from', 'n_abs_to'])
+
+
+class EventTable:
+    """linear-referenced events (LoL: from-to, PoL: only the from-columns used) stored column-wise in NumPy-arrays
+    replacement for dictionaries with one LoLFeature/PoLFeature per event, f.e. the post-processing-cache of the map-tools
+    one row per data_fid (unique), the row-order is the insertion-order until sort() is applied
+    all bulk-operations (filter, sort, group_by_route) are vectorized, single-row-operations are O(log n) via a lazily built fid-index
+    """
+
+    # column-name => dtype, all columns have the same length
+    # data_fid/ref_fid: feature-ids in data-/reference-layer, -1 if unknown
+    # stationing_from/stationing_to: stationings in the lr_mode of the session (Nabs/Nfract/Mabs), NaN if not numeric rsp. not used
+    # offset: NaN if not numeric
+    # fvs: FVS-flags as integer-bitmask (FVS.value), 0 if not checked
+    # n_abs_from/n_abs_to: derived absolute N-stationings on the reference-geometry, NaN if not calculated
+    column_dtypes = {
+        'data_fid': np.int64,
+        'ref_fid': np.int64,
+        'stationing_from': np.float64,
+        'stationing_to': np.float64,
+        'offset': np.float64,
+        'fvs': np.int64,
+        'n_abs_from': np.float64,
+        'n_abs_to': np.float64,
+    }
+
+    # fill-values for columns not specified in extend
+    column_defaults = {
+        'data_fid': -1,
+        'ref_fid': -1,
+        'stationing_from': np.nan,
+        'stationing_to': np.nan,
+        'offset': np.nan,
+        'fvs': 0,
+        'n_abs_from': np.nan,
+        'n_abs_to': np.nan,
+    }
+
+    def __init__(self, columns: dict = None):
+        """constructor, empty table or table from column-arrays
+        :param columns: optional dict column-name => array, missing columns are filled with column_defaults
+        """
+        self._columns = {column_name: np.empty(0, dtype=dtype) for column_name, dtype in self.column_dtypes.items()}
+
+        # row-indices sorted by data_fid and the sorted data_fids for binary search, built on demand, reset on every modification
+        self._fid_order = None
+        self._sorted_fids = None
+
+        if columns:
+            self.extend(**columns)
+
+    def __len__(self) -> int:
+        return self._columns['data_fid'].size
+
+    def __contains__(self, data_fid) -> bool:
+        return self.row_index(data_fid) is not None
+
+    def __iter__(self) -> typing.Iterator:
+        """iterates the data_fids as Python-integers, same as iteration over the keys of the former dictionaries"""
+        return iter(self.data_fids())
+
+    def __getitem__(self, column_name: str) -> np.ndarray:
+        """read-only access to a complete column
+        :param column_name: one of column_dtypes
+        """
+        column = self._columns[column_name].view()
+        column.flags.writeable = False
+        return column
+
+    @property
+    def nbytes(self) -> int:
+        """memory-usage of the column-arrays"""
+        return sum(column.nbytes for column in self._columns.values())
+
+    def data_fids(self) -> list:
+        """list of data_fids in row-order as Python-integers, f.e. for QgsFeatureRequest.setFilterFids"""
+        return self._columns['data_fid'].tolist()
+
+    def _get_fid_order(self) -> tuple:
+        if self._fid_order is None:
+            self._fid_order = np.argsort(self._columns['data_fid'], kind='stable')
+            self._sorted_fids = self._columns['data_fid'][self._fid_order]
+        return self._fid_order, self._sorted_fids
+
+    def row_index(self, data_fid) -> typing.Union[int, None]:
+        """row-index of data_fid, binary search in the fid-index
+        :param data_fid:
+        :returns: int or None, if not in table
+        """
+        if isinstance(data_fid, (int, np.integer)) and len(self):
+            fid_order, sorted_fids = self._get_fid_order()
+            idx = int(np.searchsorted(sorted_fids, data_fid))
+            if idx < sorted_fids.size and sorted_fids[idx] == data_fid:
+                return int(fid_order[idx])
+        return None
+
+    def row(self, data_fid) -> typing.Union[EventRow, None]:
+        """values of one row as Python-values
+        :param data_fid:
+        :returns: EventRow or None, if not in table
+        """
+        row_idx = self.row_index(data_fid)
+        if row_idx is not None:
+            return EventRow(*(self._columns[column_name][row_idx].item() for column_name in EventRow._fields))
+        return None
+
+    def extend(self, **columns):
+        """appends rows, existing rows with the same data_fid are replaced (same behaviour as dict-assignment)
+        prefer one call with all rows against many single-row-calls, every call copies the columns
+        :param columns: column-name => array/list/scalar, data_fid required, scalars are broadcasted, missing columns filled with column_defaults
+        """
+        new_data_fids = np.atleast_1d(np.asarray(columns['data_fid'], dtype=np.int64))
+        num_rows = new_data_fids.size
+        if num_rows:
+            # unique data_fids inside the new rows, the last one wins
+            reversed_unique = np.unique(new_data_fids[::-1], return_index=True)[1]
+            keep_new = np.zeros(num_rows, dtype=bool)
+            keep_new[num_rows - 1 - reversed_unique] = True
+
+            keep_old = ~np.isin(self._columns['data_fid'], new_data_fids)
+
+            for column_name, dtype in self.column_dtypes.items():
+                values = columns.get(column_name, self.column_defaults[column_name])
+                values = np.broadcast_to(np.asarray(values, dtype=dtype), (num_rows,))
+                self._columns[column_name] = np.concatenate((self._columns[column_name][keep_old], values[keep_new]))
+
+            self._fid_order = self._sorted_fids = None
+
+    def append(self, data_fid: int, **values):
+        """appends rather replaces a single row, see extend
+        :param data_fid:
+        :param values: column-name => scalar
+        """
+        self.extend(data_fid=data_fid, **values)
+
+    def pop(self, data_fid, default=None) -> typing.Union[EventRow, None]:
+        """removes the row with data_fid
+        :param data_fid:
+        :param default: returned if data_fid is not in table
+        :returns: EventRow of the removed row or default
+        """
+        current_row = self.row(data_fid)
+        if current_row is None:
+            return default
+        self.remove([data_fid])
+        return current_row
+
+    def remove(self, data_fids: typing.Iterable):
+        """removes all rows with these data_fids, not existing data_fids are ignored
+        :param data_fids: list/array of data_fids
+        """
+        keep = ~np.isin(self._columns['data_fid'], np.asarray(list(data_fids), dtype=np.int64))
+        if not keep.all():
+            for column_name in self.column_dtypes:
+                self._columns[column_name] = self._columns[column_name][keep]
+            self._fid_order = self._sorted_fids = None
+
+    def take(self, row_indices: typing.Union[np.ndarray, list]) -> EventTable:
+        """new table with the rows at row_indices in this order, f.e. from group_by_route
+        :param row_indices: int-array or bool-mask
+        """
+        result = EventTable()
+        result._columns = {column_name: column[row_indices] for column_name, column in self._columns.items()}
+        return result
+
+    def filter(self, mask: np.ndarray) -> EventTable:
+        """new table with the rows where mask is True
+        :param mask: bool-array with one value per row, f.e. event_table['ref_fid'] == 7
+        """
+        return self.take(np.asarray(mask, dtype=bool))
+
+    def with_flags(self, required_flags: int) -> np.ndarray:
+        """bool-mask for rows with all required_flags set in column fvs
+        :param required_flags: integer-bitmask, f.e. (FVS.REFERENCE_GEOMETRY_VALID | FVS.STATIONING_FROM_NUMERIC).value
+        """
+        return (self._columns['fvs'] & required_flags) == required_flags
+
+    def sort(self, column_names: typing.Sequence = ('ref_fid', 'stationing_from', 'stationing_to')) -> EventTable:
+        """new table sorted ascending by the column_names, the first name is the primary sort-key
+        :param column_names:
+        """
+        # np.lexsort uses the last key as primary key
+        return self.take(np.lexsort([self._columns[column_name] for column_name in reversed(column_names)]))
+
+    def group_by_route(self) -> typing.Iterator:
+        """rows grouped by ref_fid, ascending ref_fid, inside each group in row-order
+        :returns: generator of tuple(ref_fid as int, int-array with row-indices), use take(row_indices) rsp. column-slices for the group
+        """
+        if len(self):
+            ref_fids = self._columns['ref_fid']
+            route_order = np.argsort(ref_fids, kind='stable')
+            sorted_ref_fids = ref_fids[route_order]
+            group_starts = np.flatnonzero(np.r_[True, sorted_ref_fids[1:] != sorted_ref_fids[:-1]])
+            group_ends = np.r_[group_starts[1:], sorted_ref_fids.size]
+            for group_start, group_end in zip(group_starts, group_ends):
+                yield int(sorted_ref_fids[group_start]), route_order[group_start:group_end]
+
+    def __str__(self):
+        """stringify implemented for debug-purpose"""
+        return f"EventTable: {len(self)} rows, {self.nbytes} bytes\n" + "\n".join(str(self.row(data_fid)) for data_fid in self.data_fids()[:10])
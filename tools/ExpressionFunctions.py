@@ -0,0 +1,444 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+********************************************************************
+
+* Part of the QGis-Plugin LinearReferencing:
+* expression-functions lr_point_n, lr_point_m, lr_segment_n, lr_segment_m and lr_locate
+* for on-the-fly event-geometries in geometry-generators, field-calculator and labeling
+
+********************************************************************
+
+* Date                 : 2026-10-17
+* Copyright            : (C) 2026 by Ludwig Kniprath
+* Email                : ludwig at kni minus online dot de
+
+********************************************************************
+
+this program is free software; you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation; either version 2 of the License, or
+(at your option) any later version.
+
+.. note::
+    * registered on plugin-start, usage in any QGis-expression, f.e. geometry-generator of a Data-Layer with geometry:
+    * lr_segment_n('my_reference_layer', 'id', "ref_id", "stationing_from", "stationing_to", "offset")
+    * usage in python console:
+    * from LinearReferencing.tools.ExpressionFunctions import get_reference_source
+    * reference_source = get_reference_source('my_reference_layer')
+
+********************************************************************
+"""
+from __future__ import annotations
+import functools
+import threading
+import typing
+import qgis
+from PyQt5 import QtCore
+
+from LinearReferencing.tools.MyTools import MY_DICT, PoLOutputs, recalc_stationings, get_segment_geoms_n, get_segment_geoms_m
+from LinearReferencing.tools.RouteIndex import get_route_index, invalidate_route_index
+
+# group inside the expression-builder
+EXPRESSION_FUNCTION_GROUP = 'Linear Referencing'
+
+# cached ReferenceSource, key: layer_id of the reference-layer, see get_reference_source
+_reference_sources = {}
+
+# layer_id of the reference-layer, key: the layer-argument of the expression-functions (layer_id or layer-name)
+_reference_layer_ids = {}
+
+# layer-arguments requested from render-threads and not yet resolved in the main-thread, see _request_reference_source
+_pending_layer_keys = set()
+
+# guards _reference_sources, _reference_layer_ids and _pending_layer_keys, which are read from render-threads and altered in the main-thread
+_reference_sources_lock = threading.RLock()
+
+# _MainThreadHelper, created on register_expression_functions
+_main_thread_helper = None
+
+# the registered QgsExpressionFunction, see register_expression_functions
+_registered_functions = []
+
+
+class ReferenceSource:
+    """thread-safe access to the features of a reference-layer for the expression-functions
+    QgsVectorLayerFeatureSource: snapshot of the layer including edit-buffer and subset-string, created in the main-thread, queryable in any thread
+    (the layer itself must not be queried from the render-threads)
+    the reference-features are queried once per ID-value and kept until the next change of the layer, see close_reference_sources
+    """
+
+    # layer-signals, which close the ReferenceSource without invalidation of the RouteIndex-cache
+    close_signals = ['featureAdded', 'attributeValueChanged', 'afterCommitChanges', 'willBeDeleted']
+
+    # layer-signals, which additionally invalidate all cached RouteIndex-instances of the layer
+    invalidate_signals = ['afterRollBack', 'subsetStringChanged', 'dataSourceChanged', 'crsChanged']
+
+    def __init__(self, layer: qgis.core.QgsVectorLayer):
+        """constructor, must be called in the main-thread
+        :param layer: line-layer
+        """
+        self.layer = layer
+        self.layer_id = layer.id()
+        self.fields = layer.fields()
+        self.feature_source = qgis.core.QgsVectorLayerFeatureSource(layer)
+
+        # key: tuple(field_name, value), value: tuple(fid, QgsGeometry) or None for not found features
+        self._reference_features = {}
+        self._lock = threading.Lock()
+
+        # tuple(signal-name, slot) for disconnect
+        self._conns = []
+        close_slot = functools.partial(close_reference_sources, self.layer_id)
+        for conn_signal, slot in [('geometryChanged', self.invalidate_feature), ('featureDeleted', self.invalidate_feature)] + [(conn_signal, close_slot) for conn_signal in self.close_signals] + [(conn_signal, self.invalidate_layer) for conn_signal in self.invalidate_signals]:
+            getattr(layer, conn_signal).connect(slot)
+            self._conns.append((conn_signal, slot))
+
+    def invalidate_feature(self, fid: int, *args):
+        """slot for geometryChanged and featureDeleted"""
+        invalidate_route_index(self.layer_id, fid)
+        close_reference_sources(self.layer_id)
+
+    def invalidate_layer(self, *args):
+        """slot for invalidate_signals"""
+        invalidate_route_index(self.layer_id)
+        close_reference_sources(self.layer_id)
+
+    def get_reference_feature(self, field_name: str, value: typing.Any) -> tuple | None:
+        """first reference-feature with field_name = value, callable from any thread
+        :param field_name:
+        :param value:
+        :returns: tuple(fid, QgsGeometry), None if not found or without geometry
+        """
+        cache_key = (field_name, value)
+        with self._lock:
+            if cache_key in self._reference_features:
+                return self._reference_features[cache_key]
+
+        reference_feature = None
+        field_idx = self.fields.indexOf(field_name)
+        if field_idx >= 0:
+            request = qgis.core.QgsFeatureRequest()
+            request.setFilterExpression(qgis.core.QgsExpression.createFieldEqualityExpression(field_name, value))
+            request.setSubsetOfAttributes([field_idx])
+            request.setLimit(1)
+            feature = next(self.feature_source.getFeatures(request), None)
+            if feature is not None and feature.isValid() and feature.hasGeometry():
+                reference_feature = (feature.id(), feature.geometry())
+
+        with self._lock:
+            self._reference_features[cache_key] = reference_feature
+        return reference_feature
+
+    def get_route(self, field_name: str, value: typing.Any) -> tuple | None:
+        """reference-geometry and cached RouteIndex, callable from any thread
+        :returns: tuple(QgsGeometry, RouteIndex), None if not found
+        """
+        reference_feature = self.get_reference_feature(field_name, value)
+        if reference_feature is not None:
+            fid, reference_geom = reference_feature
+            return reference_geom, get_route_index(reference_geom, self.layer_id, fid)
+
+    def close(self):
+        """disconnects the layer-signals"""
+        for conn_signal, slot in self._conns:
+            try:
+                getattr(self.layer, conn_signal).disconnect(slot)
+            except (TypeError, RuntimeError):
+                # already disconnected rsp. layer already deleted
+                pass
+        self._conns = []
+
+    def __str__(self):
+        return f"ReferenceSource '{self.layer_id}', {len(self._reference_features)} queried features"
+
+
+class _MainThreadHelper(QtCore.QObject):
+    """lives in the main-thread, receives the requests for ReferenceSource from the render-threads via queued signal"""
+
+    reference_source_requested = QtCore.pyqtSignal(str, str)
+
+    def __init__(self):
+        super().__init__()
+        self.reference_source_requested.connect(self.create_reference_source)
+
+    @QtCore.pyqtSlot(str, str)
+    def create_reference_source(self, layer_key: str, repaint_layer_id: str):
+        """creates the requested ReferenceSource and repaints the layer, whose rendering requested it
+        :param layer_key: layer_id or layer-name
+        :param repaint_layer_id: layer_id of the rendered layer, '' if unknown
+        """
+        reference_source = get_reference_source(layer_key)
+        if reference_source is not None:
+            with _reference_sources_lock:
+                _pending_layer_keys.discard(layer_key)
+            repaint_layer = qgis.core.QgsProject.instance().mapLayer(repaint_layer_id)
+            if repaint_layer is not None:
+                repaint_layer.triggerRepaint()
+        # not found: stays pending without further requests until a layer is added, see register_expression_functions
+
+
+def _is_main_thread() -> bool:
+    return QtCore.QThread.currentThread() == QtCore.QCoreApplication.instance().thread()
+
+
+def _get_layer_key(reference_layer: typing.Any) -> str:
+    """layer-argument of the expression-functions as string
+    :param reference_layer: layer_id, layer-name or QgsMapLayer (f.e. @layer)
+    """
+    if isinstance(reference_layer, qgis.core.QgsMapLayer):
+        return reference_layer.id()
+    return str(reference_layer)
+
+
+def get_reference_source(reference_layer: typing.Any) -> ReferenceSource | None:
+    """cached ReferenceSource for a line-layer in the current project, new ones are created only in the main-thread
+    :param reference_layer: layer_id, layer-name or QgsMapLayer
+    :returns: None if the layer is not found or not suitable
+    """
+    layer_key = _get_layer_key(reference_layer)
+    with _reference_sources_lock:
+        reference_source = _reference_sources.get(_reference_layer_ids.get(layer_key))
+    if reference_source is None and _is_main_thread():
+        project = qgis.core.QgsProject.instance()
+        layer = project.mapLayer(layer_key)
+        if layer is None:
+            layers = project.mapLayersByName(layer_key)
+            layer = layers[0] if layers else None
+        if isinstance(layer, qgis.core.QgsVectorLayer) and layer.isValid() and layer.geometryType() == qgis.core.QgsWkbTypes.LineGeometry:
+            with _reference_sources_lock:
+                reference_source = _reference_sources.get(layer.id())
+                if reference_source is None:
+                    reference_source = ReferenceSource(layer)
+                    _reference_sources[layer.id()] = reference_source
+                _reference_layer_ids[layer_key] = layer.id()
+    return reference_source
+
+
+def _request_reference_source(reference_layer: typing.Any, context: qgis.core.QgsExpressionContext):
+    """render-thread: the ReferenceSource is created asynchronous in the main-thread, which afterwards repaints the rendered layer
+    no blocking call into the main-thread, which possibly waits for this render-thread
+    """
+    layer_key = _get_layer_key(reference_layer)
+    with _reference_sources_lock:
+        if layer_key in _pending_layer_keys or _main_thread_helper is None:
+            return
+        _pending_layer_keys.add(layer_key)
+    repaint_layer_id = context.variable('layer_id') if context is not None else None
+    _main_thread_helper.reference_source_requested.emit(layer_key, repaint_layer_id or '')
+
+
+def _get_route(reference_layer: typing.Any, reference_id_field: str, reference_id: typing.Any, context: qgis.core.QgsExpressionContext) -> tuple | None:
+    """reference-geometry and RouteIndex for the expression-functions
+    :returns: tuple(QgsGeometry, RouteIndex), None if the reference-feature is not found rsp. not yet available in the render-thread
+    :raises ValueError: reference-layer not found (main-thread only)
+    """
+    reference_source = get_reference_source(reference_layer)
+    if reference_source is None:
+        if _is_main_thread():
+            raise ValueError(MY_DICT.tr('exc_ref_lyr_not_found', _get_layer_key(reference_layer)))
+        _request_reference_source(reference_layer, context)
+        return None
+    return reference_source.get_route(reference_id_field, reference_id)
+
+
+def _get_point(reference_layer: typing.Any, reference_id_field: str, reference_id: typing.Any, stationing: float, lr_mode: str, context: qgis.core.QgsExpressionContext) -> qgis.core.QgsGeometry | None:
+    """shared implementation of lr_point_n and lr_point_m"""
+    route = _get_route(reference_layer, reference_id_field, reference_id, context)
+    if route is not None:
+        reference_geom, route_index = route
+        stationing_arrays, error_msg = recalc_stationings(reference_geom, [stationing], lr_mode, route_index, PoLOutputs.Z_ABS | PoLOutputs.M_ABS)
+        if stationing_arrays is None:
+            raise ValueError(error_msg)
+        if stationing_arrays.is_valid[0]:
+            return route_index.point_geom(stationing_arrays.snap_x[0], stationing_arrays.snap_y[0], stationing_arrays.snap_z[0], stationing_arrays.snap_m[0])
+
+
+def _is_null(value: typing.Any) -> bool:
+    """None rsp. NULL-QVariant"""
+    return value is None or (isinstance(value, QtCore.QVariant) and value.isNull())
+
+
+def _get_segment(reference_layer: typing.Any, reference_id_field: str, reference_id: typing.Any, stationing_from: float, stationing_to: float, offset: float, lr_mode: str, context: qgis.core.QgsExpressionContext) -> qgis.core.QgsGeometry | None:
+    """shared implementation of lr_segment_n and lr_segment_m
+    registered with handlesnull: NULL offset is treated as 0 (same as the materialized Show-Layers), NULL in the other arguments returns NULL
+    """
+    if any(_is_null(value) for value in [reference_layer, reference_id_field, reference_id, stationing_from, stationing_to]):
+        return None
+    if _is_null(offset):
+        offset = 0
+    route = _get_route(reference_layer, reference_id_field, reference_id, context)
+    if route is not None:
+        reference_geom, route_index = route
+        if lr_mode == 'Nabs':
+            segment_geoms, error_msg = get_segment_geoms_n(reference_geom, [stationing_from], [stationing_to], [offset], route_index)
+        else:
+            segment_geoms, error_msg = get_segment_geoms_m(reference_geom, [stationing_from], [stationing_to], [offset], route_index)
+        if segment_geoms is None:
+            raise ValueError(error_msg)
+        return segment_geoms[0]
+
+
+def lr_point_n(reference_layer, reference_id_field, reference_id, stationing, feature, parent, context):
+    """
+    Point on a reference-line at an N-stationing (running distance from the start of the line), in the CRS of the reference-layer.
+    <h4>Syntax</h4>
+    lr_point_n(reference_layer, reference_id_field, reference_id, stationing)
+    <h4>Arguments</h4>
+    <ul>
+      <li>reference_layer: line-layer, name or ID</li>
+      <li>reference_id_field: name of the ID-field of the reference-layer</li>
+      <li>reference_id: ID of the reference-feature, f.e. "ref_id"</li>
+      <li>stationing: 0 ... length of the reference-line, NULL outside this range</li>
+    </ul>
+    <h4>Example</h4>
+    <ul>
+      <li>lr_point_n('roads', 'id', "ref_id", "stationing") -> Point</li>
+    </ul>
+    """
+    return _get_point(reference_layer, reference_id_field, reference_id, stationing, 'Nabs', context)
+
+
+def lr_point_m(reference_layer, reference_id_field, reference_id, stationing, feature, parent, context):
+    """
+    Point on a reference-line at an M-stationing (interpolated between the vertex-M-values), in the CRS of the reference-layer.
+    The reference-line must be single-parted with strictly ascending vertex-M-values.
+    <h4>Syntax</h4>
+    lr_point_m(reference_layer, reference_id_field, reference_id, stationing)
+    <h4>Arguments</h4>
+    <ul>
+      <li>reference_layer: line-layer, name or ID</li>
+      <li>reference_id_field: name of the ID-field of the reference-layer</li>
+      <li>reference_id: ID of the reference-feature, f.e. "ref_id"</li>
+      <li>stationing: first ... last vertex-M-value, NULL outside this range</li>
+    </ul>
+    <h4>Example</h4>
+    <ul>
+      <li>lr_point_m('roads', 'id', "ref_id", "measure") -> Point</li>
+    </ul>
+    """
+    return _get_point(reference_layer, reference_id_field, reference_id, stationing, 'Mabs', context)
+
+
+def lr_segment_n(reference_layer, reference_id_field, reference_id, stationing_from, stationing_to, offset, feature, parent, context):
+    """
+    Segment of a reference-line between two N-stationings with lateral offset, in the CRS of the reference-layer.
+    <h4>Syntax</h4>
+    lr_segment_n(reference_layer, reference_id_field, reference_id, stationing_from, stationing_to, offset)
+    <h4>Arguments</h4>
+    <ul>
+      <li>reference_layer: line-layer, name or ID</li>
+      <li>reference_id_field: name of the ID-field of the reference-layer</li>
+      <li>reference_id: ID of the reference-feature, f.e. "ref_id"</li>
+      <li>stationing_from, stationing_to: running distances from the start of the line, clamped to 0 ... length, NULL returns NULL</li>
+      <li>offset: positive left, negative right of the reference-line, 0 or NULL without offset</li>
+    </ul>
+    <h4>Example</h4>
+    <ul>
+      <li>lr_segment_n('roads', 'id', "ref_id", "stationing_from", "stationing_to", 0) -> LineString</li>
+    </ul>
+    """
+    return _get_segment(reference_layer, reference_id_field, reference_id, stationing_from, stationing_to, offset, 'Nabs', context)
+
+
+def lr_segment_m(reference_layer, reference_id_field, reference_id, stationing_from, stationing_to, offset, feature, parent, context):
+    """
+    Segment of a reference-line between two M-stationings with lateral offset, in the CRS of the reference-layer.
+    The reference-line must be single-parted with strictly ascending vertex-M-values.
+    <h4>Syntax</h4>
+    lr_segment_m(reference_layer, reference_id_field, reference_id, stationing_from, stationing_to, offset)
+    <h4>Arguments</h4>
+    <ul>
+      <li>reference_layer: line-layer, name or ID</li>
+      <li>reference_id_field: name of the ID-field of the reference-layer</li>
+      <li>reference_id: ID of the reference-feature, f.e. "ref_id"</li>
+      <li>stationing_from, stationing_to: measures, clamped to first ... last vertex-M-value, NULL returns NULL</li>
+      <li>offset: positive left, negative right of the reference-line, 0 or NULL without offset</li>
+    </ul>
+    <h4>Example</h4>
+    <ul>
+      <li>lr_segment_m('roads', 'id', "ref_id", "measure_from", "measure_to", 0) -> LineString</li>
+    </ul>
+    """
+    return _get_segment(reference_layer, reference_id_field, reference_id, stationing_from, stationing_to, offset, 'Mabs', context)
+
+
+def lr_locate(reference_layer, reference_id_field, reference_id, point_geometry, feature, parent, context):
+    """
+    N-stationing (running distance from the start of the line) of the nearest point on a reference-line.
+    <h4>Syntax</h4>
+    lr_locate(reference_layer, reference_id_field, reference_id, point_geometry)
+    <h4>Arguments</h4>
+    <ul>
+      <li>reference_layer: line-layer, name or ID</li>
+      <li>reference_id_field: name of the ID-field of the reference-layer</li>
+      <li>reference_id: ID of the reference-feature, f.e. "ref_id"</li>
+      <li>point_geometry: point in the CRS of the reference-layer</li>
+    </ul>
+    <h4>Example</h4>
+    <ul>
+      <li>lr_locate('roads', 'id', "ref_id", $geometry) -> 1234.5</li>
+    </ul>
+    """
+    if qgis.core.QgsWkbTypes.flatType(point_geometry.wkbType()) != qgis.core.QgsWkbTypes.Point:
+        raise ValueError(MY_DICT.tr('exc_geometry_type_not_point', qgis.core.QgsWkbTypes.displayString(point_geometry.wkbType())))
+    route = _get_route(reference_layer, reference_id_field, reference_id, context)
+    if route is not None:
+        reference_geom, route_index = route
+        point_xy = point_geometry.asPoint()
+        return route_index.locate_point(point_xy.x(), point_xy.y())
+
+
+def register_expression_functions():
+    """registers the expression-functions in group EXPRESSION_FUNCTION_GROUP, called on plugin-start in the main-thread"""
+    global _main_thread_helper
+    if _main_thread_helper is None:
+        _main_thread_helper = _MainThreadHelper()
+        # layers requested from render-threads, which were not found, are requested again after the next layersAdded
+        qgis.core.QgsProject.instance().layersAdded.connect(_pending_layer_keys_reset)
+
+    for function in [lr_point_n, lr_point_m, lr_segment_n, lr_segment_m, lr_locate]:
+        if not qgis.core.QgsExpression.isFunctionName(function.__name__):
+            # referenced_columns: the arguments reference their own columns
+            # handlesnull for the segment-functions: NULL offset => 0, same as the materialized Show-Layers, the other functions return NULL for NULL-arguments
+            expression_function = qgis.core.qgsfunction(group=EXPRESSION_FUNCTION_GROUP, referenced_columns=[], handlesnull=function in [lr_segment_n, lr_segment_m], register=False)(function)
+            if qgis.core.QgsExpression.registerFunction(expression_function):
+                _registered_functions.append(expression_function)
+
+
+def _pending_layer_keys_reset(*args):
+    """slot for QgsProject.layersAdded"""
+    with _reference_sources_lock:
+        _pending_layer_keys.clear()
+
+
+def close_reference_sources(layer_id: str = None):
+    """removes the cached ReferenceSource and disconnects their layer-signals, called on changes of the reference-layer
+    the render-threads possibly still use the removed ReferenceSource for the current rendering
+    :param layer_id: layer_id of the reference-layer, None => all, f.e. on plugin-unload
+    """
+    with _reference_sources_lock:
+        for close_id in [close_id for close_id in _reference_sources if layer_id is None or close_id == layer_id]:
+            _reference_sources.pop(close_id).close()
+        for layer_key in [layer_key for layer_key, close_id in _reference_layer_ids.items() if layer_id is None or close_id == layer_id]:
+            del _reference_layer_ids[layer_key]
+
+
+def unregister_expression_functions():
+    """unregisters the expression-functions and releases the ReferenceSource, called on plugin-unload"""
+    global _main_thread_helper
+    for expression_function in _registered_functions:
+        qgis.core.QgsExpression.unregisterFunction(expression_function.name())
+    _registered_functions.clear()
+
+    close_reference_sources()
+
+    if _main_thread_helper is not None:
+        try:
+            qgis.core.QgsProject.instance().layersAdded.disconnect(_pending_layer_keys_reset)
+        except TypeError:
+            # already disconnected
+            pass
+        _main_thread_helper.deleteLater()
+        _main_thread_helper = None
+        _pending_layer_keys_reset()
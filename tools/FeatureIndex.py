@@ -0,0 +1,414 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+********************************************************************
+
+* Part of the QGis-Plugin LinearReferencing:
+* in-memory attribute-indexes for vector-layers:
+* hash-index attribute-value => fid for ID-fields
+* inverted index reference-id => events sorted by stationing
+
+********************************************************************
+
+* Date                 : 2026-10-17
+* Copyright            : (C) 2026 by Ludwig Kniprath
+* Email                : ludwig at kni minus online dot de
+
+********************************************************************
+
+this program is free software; you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation; either version 2 of the License, or
+(at your option) any later version.
+
+.. note::
+    * usage in python console:
+    * from LinearReferencing.tools.FeatureIndex import get_feature_value_index
+    * value_index = get_feature_value_index(iface.activeLayer(), 'id')
+    * fid = value_index.get_fid(123)
+    * from LinearReferencing.tools.FeatureIndex import get_route_event_index
+    * route_index = get_route_event_index(iface.activeLayer(), 'ref_id', 'stationing_from', 'stationing_to')
+    * data_fids = route_index.get_data_fids(7)
+
+********************************************************************
+"""
+from __future__ import annotations
+import abc
+import bisect
+import functools
+import math
+import numbers
+import typing
+import qgis
+from PyQt5 import QtCore
+
+# cached LayerAttributeIndex (FeatureValueIndex, RouteEventIndex), key: tuple(layer_id, class-name, tuple(field_names)), see _get_layer_index
+_layer_indexes = {}
+
+# connections of the layer-signal willBeDeleted, key: layer_id, value: tuple(layer, slot)
+_layer_index_conns = {}
+
+
+def _index_key(value: typing.Any) -> typing.Any:
+    """hashable key for an attribute-value, None for NULL (QVariant without value)"""
+    if isinstance(value, QtCore.QVariant):
+        return None if value.isNull() else value.value()
+    return value
+
+
+class LayerAttributeIndex(abc.ABC):
+    """base-class for in-memory indexes over some attributes of a vector-layer
+    built lazily with one attribute-only pass (no geometries) over the layer, respecting its subset-string and edit-buffer
+    maintained incrementally via the layer-signals featureAdded, featureDeleted and attributeValueChanged,
+    other changes (filter, rollback, altered fields, data-source) only mark the index as dirty for rebuild on next usage
+    derived classes implement _index_add and _index_remove
+    """
+
+    # layer-signals, which only mark the index as dirty
+    dirty_signals = ['subsetStringChanged', 'afterRollBack', 'attributeAdded', 'attributeDeleted', 'dataSourceChanged']
+
+    def __init__(self, layer: qgis.core.QgsVectorLayer, field_names: list):
+        """constructor, connects the layer-signals, the index itself is built on first lookup
+        :param layer:
+        :param field_names: names of the indexed fields
+        """
+        self.layer = layer
+        self.layer_id = layer.id()
+        self.field_names = list(field_names)
+
+        # True => rebuild on next lookup
+        self.is_dirty = True
+
+        # fid => tuple of attribute-values (order of field_names), for the incremental maintenance on attributeValueChanged and featureDeleted
+        self._values_by_fid = {}
+
+        # indexes of field_names in layer.fields(), refreshed on rebuild
+        self._field_idxs = []
+
+        # tuple(signal-name, slot) for disconnect
+        self._conns = []
+        for conn_signal, slot in [('featureAdded', self.feature_added), ('featureDeleted', self.feature_deleted), ('attributeValueChanged', self.attribute_value_changed)] + [(conn_signal, self.invalidate) for conn_signal in self.dirty_signals]:
+            getattr(layer, conn_signal).connect(slot)
+            self._conns.append((conn_signal, slot))
+
+    def __len__(self) -> int:
+        self._check_built()
+        return len(self._values_by_fid)
+
+    @abc.abstractmethod
+    def _index_add(self, fid: int, values: tuple):
+        """add the feature to the derived index-structure
+        :param fid:
+        :param values: attribute-values in order of field_names, NULL converted to None
+        """
+
+    @abc.abstractmethod
+    def _index_remove(self, fid: int, values: tuple):
+        """remove the feature from the derived index-structure
+        :param fid:
+        :param values: the attribute-values used in _index_add
+        """
+
+    @abc.abstractmethod
+    def _index_clear(self):
+        """reset the derived index-structure before rebuild"""
+
+    def _check_built(self):
+        """rebuilds the index if dirty: one pass over all features, only the indexed attributes"""
+        if self.is_dirty:
+            self._index_clear()
+            self._values_by_fid = {}
+            self._field_idxs = [self.layer.fields().indexOf(field_name) for field_name in self.field_names]
+            if min(self._field_idxs) >= 0:
+                request = qgis.core.QgsFeatureRequest()
+                request.setFlags(qgis.core.QgsFeatureRequest.NoGeometry)
+                request.setSubsetOfAttributes(self._field_idxs)
+                for feature in self.layer.getFeatures(request):
+                    self._add(feature.id(), [feature[field_idx] for field_idx in self._field_idxs])
+            self.is_dirty = False
+
+    def _add(self, fid: int, values: typing.Iterable):
+        values = tuple(_index_key(value) for value in values)
+        self._values_by_fid[fid] = values
+        self._index_add(fid, values)
+
+    def _remove(self, fid: int):
+        if fid in self._values_by_fid:
+            self._index_remove(fid, self._values_by_fid.pop(fid))
+
+    def get_values(self, fid: int) -> tuple | None:
+        """reverse lookup
+        :param fid:
+        :returns: tuple of attribute-values in order of field_names, None if fid not in index
+        """
+        self._check_built()
+        return self._values_by_fid.get(fid)
+
+    def feature_added(self, fid: int):
+        """slot for featureAdded, also emitted with the new positive fid on commit"""
+        if not self.is_dirty and min(self._field_idxs) >= 0:
+            request = qgis.core.QgsFeatureRequest(fid)
+            request.setFlags(qgis.core.QgsFeatureRequest.NoGeometry)
+            request.setSubsetOfAttributes(self._field_idxs)
+            feature = next(self.layer.getFeatures(request), None)
+            if feature is not None and feature.isValid():
+                self._remove(fid)
+                self._add(fid, [feature[field_idx] for field_idx in self._field_idxs])
+
+    def feature_deleted(self, fid: int):
+        """slot for featureDeleted, also emitted for the temporary negative fid on commit"""
+        if not self.is_dirty:
+            self._remove(fid)
+
+    def attribute_value_changed(self, fid: int, idx: int, value: typing.Any):
+        """slot for attributeValueChanged"""
+        if not self.is_dirty and idx in self._field_idxs:
+            if fid in self._values_by_fid:
+                values = list(self._values_by_fid[fid])
+                values[self._field_idxs.index(idx)] = value
+                self._remove(fid)
+                self._add(fid, values)
+            else:
+                # feature not yet indexed, f.e. not matching a former filter
+                self.feature_added(fid)
+
+    def invalidate(self, *args):
+        """marks the index for rebuild on next lookup
+        :param args: signal-arguments of the dirty_signals, f.e. idx of attributeAdded, not used
+        """
+        self.is_dirty = True
+
+    def close(self):
+        """disconnects the layer-signals"""
+        for conn_signal, slot in self._conns:
+            try:
+                getattr(self.layer, conn_signal).disconnect(slot)
+            except (TypeError, RuntimeError):
+                # already disconnected rsp. layer already deleted
+                pass
+        self._conns = []
+        self._index_clear()
+        self._values_by_fid = {}
+        self.is_dirty = True
+
+    def __str__(self):
+        """stringify implemented for debug-purpose"""
+        return f"{self.__class__.__name__}: layer '{self.layer_id}', fields {self.field_names}, {'dirty' if self.is_dirty else str(len(self._values_by_fid)) + ' features'}"
+
+
+class FeatureValueIndex(LayerAttributeIndex):
+    """dict-backed index attribute-value => fid(s) for one field of a vector-layer
+    replacement for get_feature_by_value, which scans the provider with a filter-expression on every call
+    intended for ID-fields with unique values, for duplicates the smallest fid is returned
+    """
+
+    def __init__(self, layer: qgis.core.QgsVectorLayer, field_name: str):
+        """constructor
+        :param layer:
+        :param field_name: name of the indexed field
+        """
+        # attribute-value => set of fids, usually exactly one
+        self._fids_by_value = {}
+        self.field_name = field_name
+        LayerAttributeIndex.__init__(self, layer, [field_name])
+
+    def _index_add(self, fid: int, values: tuple):
+        if values[0] is not None:
+            self._fids_by_value.setdefault(values[0], set()).add(fid)
+
+    def _index_remove(self, fid: int, values: tuple):
+        fids = self._fids_by_value.get(values[0])
+        if fids is not None:
+            fids.discard(fid)
+            if not fids:
+                del self._fids_by_value[values[0]]
+
+    def _index_clear(self):
+        self._fids_by_value = {}
+
+    def get_fids(self, value: typing.Any) -> set:
+        """all fids with this attribute-value
+        :param value: attribute-value, integer-values are also found by their string-representation and vice versa
+        :returns: set of fids, empty if not found
+        """
+        self._check_built()
+        value = _index_key(value)
+        fids = self._fids_by_value.get(value)
+        if fids is None:
+            # tolerate int/str-mismatch, which the former filter-expression "field" = 'value' accepted
+            if isinstance(value, str) and value.lstrip('-').isdigit():
+                fids = self._fids_by_value.get(int(value))
+            elif isinstance(value, int):
+                fids = self._fids_by_value.get(str(value))
+        return set(fids) if fids else set()
+
+    def get_fid(self, value: typing.Any) -> int | None:
+        """fid of the feature with this attribute-value, O(1)
+        :param value:
+        :returns: fid, None if not found, the smallest fid if the value is not unique
+        """
+        fids = self.get_fids(value)
+        if fids:
+            return min(fids)
+        return None
+
+    def get_value(self, fid: int) -> typing.Any:
+        """reverse lookup
+        :param fid:
+        :returns: attribute-value, None if fid not in index or NULL
+        """
+        values = self.get_values(fid)
+        if values is not None:
+            return values[0]
+        return None
+
+    def items(self) -> list:
+        """all indexed features
+        :returns: list of tuple(fid, attribute-value)
+        """
+        self._check_built()
+        return [(fid, values[0]) for fid, values in self._values_by_fid.items()]
+
+
+class RouteEventIndex(LayerAttributeIndex):
+    """inverted index reference-id => events of this route, sorted by stationing
+    replacement for the filter-expression-queries "reference_field" = 'ref_id' on the data-layer
+    PoL: one stationing-field, LoL: stationing-from- and stationing-to-field
+    the events are sorted by their stationing-interval [min(from, to), max(from, to)] (PoL: [stationing, stationing]), events with non-numeric stationings at the end of the route
+    """
+
+    def __init__(self, layer: qgis.core.QgsVectorLayer, reference_field_name: str, stationing_from_field_name: str, stationing_to_field_name: str = None):
+        """constructor
+        :param layer: data-layer
+        :param reference_field_name: field with the reference-id (refLyrIdField-value of the assigned reference-feature)
+        :param stationing_from_field_name: PoL: stationing-field, LoL: stationing-from-field
+        :param stationing_to_field_name: LoL: stationing-to-field, None for PoL
+        """
+        # reference-id => list of tuple(interval-start, interval-end, fid), ascending
+        self._events_by_route = {}
+        field_names = [reference_field_name, stationing_from_field_name]
+        if stationing_to_field_name:
+            field_names.append(stationing_to_field_name)
+        LayerAttributeIndex.__init__(self, layer, field_names)
+
+    @staticmethod
+    def _sort_key(values: tuple) -> tuple:
+        """sort-key of one event: the stationing-interval, (math.inf, math.inf) for non-numeric stationings"""
+        stationings = values[1:]
+        if all(isinstance(stationing, numbers.Number) and not math.isnan(stationing) for stationing in stationings):
+            return min(stationings), max(stationings)
+        return math.inf, math.inf
+
+    def _index_add(self, fid: int, values: tuple):
+        if values[0] is not None:
+            bisect.insort(self._events_by_route.setdefault(values[0], []), self._sort_key(values) + (fid,))
+
+    def _index_remove(self, fid: int, values: tuple):
+        route_events = self._events_by_route.get(values[0])
+        if route_events is not None:
+            event_key = self._sort_key(values) + (fid,)
+            event_idx = bisect.bisect_left(route_events, event_key)
+            if event_idx < len(route_events) and route_events[event_idx] == event_key:
+                del route_events[event_idx]
+            if not route_events:
+                del self._events_by_route[values[0]]
+
+    def _index_clear(self):
+        self._events_by_route = {}
+
+    def _get_route_events(self, ref_id: typing.Any) -> list:
+        self._check_built()
+        ref_id = _index_key(ref_id)
+        route_events = self._events_by_route.get(ref_id)
+        if route_events is None:
+            # tolerate int/str-mismatch, same as FeatureValueIndex.get_fids
+            if isinstance(ref_id, str) and ref_id.lstrip('-').isdigit():
+                route_events = self._events_by_route.get(int(ref_id))
+            elif isinstance(ref_id, int):
+                route_events = self._events_by_route.get(str(ref_id))
+        return route_events or []
+
+    def get_data_fids(self, ref_id: typing.Any) -> list:
+        """fids of all events assigned to this route, O(1) lookup
+        :param ref_id: value of the reference-field
+        :returns: list of fids sorted by stationing(s), empty if none
+        """
+        return [route_event[-1] for route_event in self._get_route_events(ref_id)]
+
+    def get_events(self, ref_id: typing.Any) -> list:
+        """all events assigned to this route with their stationings
+        :param ref_id: value of the reference-field
+        :returns: list of tuple(fid, stationing_from, stationing_to) sorted by stationing(s), stationing_to None for PoL, stationings None for NULL
+        """
+        route_events = []
+        for route_event in self._get_route_events(ref_id):
+            values = self._values_by_fid[route_event[-1]]
+            route_events.append((route_event[-1], values[1], values[2] if len(values) > 2 else None))
+        return route_events
+
+
+def _get_layer_index(index_class: type, layer: qgis.core.QgsVectorLayer, *field_names) -> LayerAttributeIndex:
+    """cached index of index_class for layer and field_names
+    on first usage the signal willBeDeleted of the layer is connected to invalidate_feature_value_index
+    :param index_class: FeatureValueIndex/RouteEventIndex
+    :param layer:
+    :param field_names: constructor-arguments of index_class
+    """
+    cache_key = (layer.id(), index_class.__name__, field_names)
+    layer_index = _layer_indexes.get(cache_key)
+    if layer_index is None:
+        if layer.id() not in _layer_index_conns:
+            invalidate_slot = functools.partial(invalidate_feature_value_index, layer.id())
+            layer.willBeDeleted.connect(invalidate_slot)
+            _layer_index_conns[layer.id()] = (layer, invalidate_slot)
+        layer_index = index_class(layer, *field_names)
+        _layer_indexes[cache_key] = layer_index
+    return layer_index
+
+
+def _get_field_name(field: qgis.core.QgsField | str | None) -> str | None:
+    return field if field is None or isinstance(field, str) else field.name()
+
+
+def get_feature_value_index(layer: qgis.core.QgsVectorLayer, field: qgis.core.QgsField | str) -> FeatureValueIndex:
+    """cached FeatureValueIndex for layer and field
+    :param layer:
+    :param field: QgsField or the name of a QgsField
+    """
+    return _get_layer_index(FeatureValueIndex, layer, _get_field_name(field))
+
+
+def get_route_event_index(layer: qgis.core.QgsVectorLayer, reference_field: qgis.core.QgsField | str, stationing_from_field: qgis.core.QgsField | str, stationing_to_field: qgis.core.QgsField | str = None) -> RouteEventIndex:
+    """cached RouteEventIndex for the data-layer
+    :param layer: data-layer
+    :param reference_field: QgsField or the name of a QgsField
+    :param stationing_from_field: PoL: stationing-field, LoL: stationing-from-field
+    :param stationing_to_field: LoL: stationing-to-field, None for PoL
+    """
+    return _get_layer_index(RouteEventIndex, layer, _get_field_name(reference_field), _get_field_name(stationing_from_field), _get_field_name(stationing_to_field))
+
+
+def set_feature_value_index_dirty(layer_id: str):
+    """marks the cached indexes of this layer for rebuild on next usage
+    f.e. for virtual layers without own edit-signals, whose contents change with their source-layers
+    :param layer_id:
+    """
+    for cache_key, layer_index in _layer_indexes.items():
+        if cache_key[0] == layer_id:
+            layer_index.invalidate()
+
+
+def invalidate_feature_value_index(layer_id: str = None):
+    """removes the cached indexes (FeatureValueIndex and RouteEventIndex) and disconnects their layer-signals
+    :param layer_id: None => all layers, f.e. on plugin-unload
+    """
+    for cache_key in [cache_key for cache_key in _layer_indexes if layer_id is None or cache_key[0] == layer_id]:
+        _layer_indexes.pop(cache_key).close()
+
+    for invalidate_id in [invalidate_id for invalidate_id in _layer_index_conns if layer_id is None or invalidate_id == layer_id]:
+        layer, invalidate_slot = _layer_index_conns.pop(invalidate_id)
+        try:
+            layer.willBeDeleted.disconnect(invalidate_slot)
+        except (TypeError, RuntimeError):
+            # already disconnected rsp. layer already deleted
+            pass
@@ -0,0 +1,169 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+********************************************************************
+
+* Part of the QGis-Plugin LinearReferencing:
+* LRU-cache for the geometries of reference-features
+
+********************************************************************
+
+* Date                 : 2026-10-17
+* Copyright            : (C) 2026 by Ludwig Kniprath
+* Email                : ludwig at kni minus online dot de
+
+********************************************************************
+
+this program is free software; you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation; either version 2 of the License, or
+(at your option) any later version.
+
+.. note::
+    * usage in python console:
+    * from LinearReferencing.tools.GeometryCache import get_reference_geom, get_reference_geom_cache_stats
+    * reference_geom = get_reference_geom(iface.activeLayer(), 1)
+    * print(get_reference_geom_cache_stats())
+    * the cached geometries and RouteIndex-instances of each reference-layer are invalidated by the layer's own signals, see watch_reference_layer
+
+********************************************************************
+"""
+from __future__ import annotations
+import collections
+import functools
+import typing
+import qgis
+from LinearReferencing.tools.RouteIndex import invalidate_route_index
+
+# cache for the geometries of reference-features, key: tuple(layer_id, fid), value: QgsGeometry
+# least recently used first, see get_reference_geom
+# invalidated by the signals of the watched reference-layers, independent from the current reference-layer of the map-tools, see watch_reference_layer
+_reference_geom_cache = collections.OrderedDict()
+
+# layer-signals, which invalidate the cached geometries and RouteIndex-instances of the complete layer
+# afterRollBack restores the previous geometries without geometryChanged
+invalidate_signals = ['afterRollBack', 'afterCommitChanges', 'subsetStringChanged', 'dataSourceChanged', 'crsChanged']
+
+# connected signals of the watched reference-layers, key: layer_id, value: tuple(layer, list of tuple(signal-name, slot))
+_layer_conns = {}
+
+# max number of cached geometries, the least recently used ones are removed
+max_reference_geom_cache_size = 1000
+
+# usage-statistics since plugin-start rsp. last reset_reference_geom_cache_stats, see get_reference_geom_cache_stats
+_cache_stats = collections.Counter()
+
+
+def get_reference_geom(reference_layer: qgis.core.QgsVectorLayer, fid: int) -> typing.Union[qgis.core.QgsGeometry, None]:
+    """cached geometry of a reference-feature, replacement for reference_layer.getFeature(fid).geometry(), which is a provider-round-trip for GeoPackage/PostGIS...
+    uncommitted features (negative fid) are queried, but not cached
+    :param reference_layer:
+    :param fid:
+    :returns: copy of the cached geometry (implicitly shared, no deep copy), None if the feature does not exist or has no geometry
+    """
+    cache_key = (reference_layer.id(), fid)
+    reference_geom = _reference_geom_cache.get(cache_key)
+    if reference_geom is not None:
+        _cache_stats['hits'] += 1
+        _reference_geom_cache.move_to_end(cache_key)
+        return qgis.core.QgsGeometry(reference_geom)
+
+    _cache_stats['misses'] += 1
+    feature_request = qgis.core.QgsFeatureRequest(fid)
+    feature_request.setNoAttributes()
+    # only the geometry, no attributes
+    reference_feature = next(reference_layer.getFeatures(feature_request), None)
+    if reference_feature is not None and reference_feature.isValid() and reference_feature.hasGeometry():
+        reference_geom = reference_feature.geometry()
+        if fid >= 0:
+            watch_reference_layer(reference_layer)
+            _reference_geom_cache[cache_key] = reference_geom
+            while len(_reference_geom_cache) > max_reference_geom_cache_size:
+                _reference_geom_cache.popitem(last=False)
+                _cache_stats['evictions'] += 1
+        return qgis.core.QgsGeometry(reference_geom)
+
+    return None
+
+
+def invalidate_reference_geom(layer_id: str = None, fids: typing.Iterable = None):
+    """removes cached geometries, called on edits and filter-changes in the reference-layer
+    :param layer_id: without: clear complete cache
+    :param fids: without: remove all cached features of this layer
+    """
+    if layer_id is None:
+        _reference_geom_cache.clear()
+    elif fids is None:
+        for cache_key in [cache_key for cache_key in _reference_geom_cache if cache_key[0] == layer_id]:
+            del _reference_geom_cache[cache_key]
+    else:
+        for fid in fids:
+            _reference_geom_cache.pop((layer_id, fid), None)
+
+
+def _invalidate_feature(layer_id: str, fid: int, *args):
+    """slot for geometryChanged and featureDeleted of the watched reference-layers"""
+    invalidate_route_index(layer_id, fid)
+    invalidate_reference_geom(layer_id, [fid])
+
+
+def _invalidate_layer(layer_id: str, *args):
+    """slot for invalidate_signals of the watched reference-layers"""
+    invalidate_route_index(layer_id)
+    invalidate_reference_geom(layer_id)
+
+
+def _layer_deleted(layer_id: str):
+    """slot for willBeDeleted of the watched reference-layers"""
+    _invalidate_layer(layer_id)
+    unwatch_reference_layer(layer_id)
+
+
+def watch_reference_layer(reference_layer: qgis.core.QgsVectorLayer):
+    """connects the signals of the reference-layer, which invalidate its cached geometries and RouteIndex-instances
+    once per layer, kept after a switch of the reference-layer in the map-tools, so previously cached entries of this layer can not get stale
+    must be called in the main-thread
+    :param reference_layer:
+    """
+    layer_id = reference_layer.id()
+    if layer_id not in _layer_conns:
+        feature_slot = functools.partial(_invalidate_feature, layer_id)
+        layer_slot = functools.partial(_invalidate_layer, layer_id)
+        conns = [('geometryChanged', feature_slot), ('featureDeleted', feature_slot), ('willBeDeleted', functools.partial(_layer_deleted, layer_id))] + [(conn_signal, layer_slot) for conn_signal in invalidate_signals]
+        for conn_signal, slot in conns:
+            getattr(reference_layer, conn_signal).connect(slot)
+        _layer_conns[layer_id] = (reference_layer, conns)
+
+
+def unwatch_reference_layer(layer_id: str = None):
+    """disconnects the signals connected by watch_reference_layer
+    :param layer_id: None => all layers, f.e. on plugin-unload
+    """
+    for unwatch_id in [unwatch_id for unwatch_id in _layer_conns if layer_id is None or unwatch_id == layer_id]:
+        reference_layer, conns = _layer_conns.pop(unwatch_id)
+        for conn_signal, slot in conns:
+            try:
+                getattr(reference_layer, conn_signal).disconnect(slot)
+            except (TypeError, RuntimeError):
+                # already disconnected rsp. layer already deleted
+                pass
+
+
+def get_reference_geom_cache_stats() -> dict:
+    """usage-statistics of the cache
+    :returns: dict with hits, misses, evictions, size (current number of cached geometries), max_size and hit_ratio (0...1, None if not yet used)
+    """
+    num_queries = _cache_stats['hits'] + _cache_stats['misses']
+    return {
+        'hits': _cache_stats['hits'],
+        'misses': _cache_stats['misses'],
+        'evictions': _cache_stats['evictions'],
+        'size': len(_reference_geom_cache),
+        'max_size': max_reference_geom_cache_size,
+        'hit_ratio': _cache_stats['hits'] / num_queries if num_queries else None,
+    }
+
+
+def reset_reference_geom_cache_stats():
+    """resets hits/misses/evictions, f.e. before a benchmark"""
+    _cache_stats.clear()
@@ -0,0 +1,574 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+********************************************************************
+
+* Part of the QGis-Plugin LinearReferencing:
+* materialized Show-Layer: memory-layer with precalculated event-geometries,
+* alternative to the virtual Show-Layer, which recalculates all geometries via spatialite on each render
+
+********************************************************************
+
+* Date                 : 2026-10-17
+* Copyright            : (C) 2026 by Ludwig Kniprath
+* Email                : ludwig at kni minus online dot de
+
+********************************************************************
+
+this program is free software; you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation; either version 2 of the License, or
+(at your option) any later version.
+
+.. note::
+    * usage in python console:
+    * from LinearReferencing.tools.MaterializedShowLayer import create_materialized_show_layer, get_materialized_show_layer
+    * show_layer = create_materialized_show_layer('my_show_layer', source_settings)
+    * QgsProject.instance().addMapLayer(show_layer)
+    * get_materialized_show_layer(show_layer).flush()
+
+********************************************************************
+"""
+from __future__ import annotations
+import functools
+import json
+import typing
+import qgis
+import numpy as np
+from PyQt5 import QtCore
+
+from LinearReferencing.tools.MyTools import PoLOutputs, recalc_stationings, get_segment_geoms_n, get_segment_geoms_m, to_float_array
+from LinearReferencing.tools.RouteIndex import get_route_index, invalidate_route_index, get_geometry_version
+from LinearReferencing.tools.TransformCache import get_transform, get_canvas_crs
+from LinearReferencing.tools.GeometryCache import get_reference_geom, invalidate_reference_geom
+from LinearReferencing.tools.FeatureIndex import get_feature_value_index, get_route_event_index, set_feature_value_index_dirty
+
+# custom layer-property, which marks a memory-layer as materialized Show-Layer
+# value: JSON-string with the source-settings (see source_setting_keys), stored in the QGis-project together with the layer
+MATERIALIZED_SHOW_LAYER_PROPERTY = 'LinearReferencing/materialized_show_layer'
+
+# keys of the source-settings, PoL: stationing_from_field is the stationing-field, stationing_to_field and offset_field None
+source_setting_keys = ['lr_mode', 'reference_layer_id', 'reference_id_field', 'data_layer_id', 'data_id_field', 'data_reference_field', 'stationing_from_field', 'stationing_to_field', 'offset_field']
+
+# options stored together with the source-settings, not relevant for the fit-check in is_materialized_show_layer
+# extent_limited: event-geometries only calculated for the routes inside the current canvas-extent, see MaterializedShowLayer.canvas_extent_changed
+option_keys = ['extent_limited']
+
+# cached MaterializedShowLayer, key: layer_id of the show-layer, see get_materialized_show_layer
+_materialized_show_layers = {}
+
+# connections of the layer-signal willBeDeleted, key: layer_id of the show-layer, value: tuple(layer, slot)
+_materialized_show_layer_conns = {}
+
+
+def get_source_settings(layer: qgis.core.QgsMapLayer) -> dict | None:
+    """source-settings of a materialized Show-Layer
+    :param layer: any map-layer
+    :returns: dict with source_setting_keys, None if layer is no materialized Show-Layer
+    """
+    if isinstance(layer, qgis.core.QgsVectorLayer):
+        source_settings = layer.customProperty(MATERIALIZED_SHOW_LAYER_PROPERTY)
+        if source_settings:
+            try:
+                return json.loads(source_settings)
+            except ValueError:
+                pass
+    return None
+
+
+def is_materialized_show_layer(layer: qgis.core.QgsMapLayer, source_settings: dict = None) -> bool:
+    """checks, if layer is a materialized Show-Layer, replacement for the uri-check of virtual Show-Layers
+    :param layer: any map-layer
+    :param source_settings: optional, the layer must have been created with exactly these source-settings
+    """
+    layer_source_settings = get_source_settings(layer)
+    if layer_source_settings is None:
+        return False
+    if source_settings is None:
+        return True
+    return all(layer_source_settings.get(setting_key) == source_settings.get(setting_key) for setting_key in source_setting_keys)
+
+
+def create_materialized_show_layer(layer_name: str, source_settings: dict, extent_limited: bool = False) -> qgis.core.QgsVectorLayer | None:
+    """creates an empty materialized Show-Layer, filled on first usage via get_materialized_show_layer
+    memory-layer with spatial index, geometry-type LineString (LoL) rsp. Point (PoL), CRS of the reference-layer
+    the fields are copies of the data-layer-fields in source_settings, so joins and back-reference work as with the virtual Show-Layer
+    :param layer_name:
+    :param source_settings: dict with source_setting_keys, the referred layers must be registered in the current project
+    :param extent_limited: True => geometries only for the events on routes inside the canvas-extent, the other show-features without geometry
+    :returns: not yet registered layer, None if the reference- or data-layer is missing
+    """
+    reference_layer = qgis.core.QgsProject.instance().mapLayer(source_settings['reference_layer_id'])
+    data_layer = qgis.core.QgsProject.instance().mapLayer(source_settings['data_layer_id'])
+    if reference_layer and data_layer:
+        fields = qgis.core.QgsFields()
+        for field_name in _get_field_names(source_settings):
+            fields.append(qgis.core.QgsField(data_layer.fields().field(field_name)))
+
+        wkb_type = qgis.core.QgsWkbTypes.Point if source_settings['stationing_to_field'] is None else qgis.core.QgsWkbTypes.LineString
+        show_layer = qgis.core.QgsMemoryProviderUtils.createMemoryLayer(layer_name, fields, wkb_type, reference_layer.crs())
+        if show_layer and show_layer.isValid():
+            show_layer.dataProvider().createSpatialIndex()
+            # maintained by MaterializedShowLayer, user-edits would be overwritten
+            show_layer.setReadOnly(True)
+            layer_settings = {setting_key: source_settings.get(setting_key) for setting_key in source_setting_keys}
+            layer_settings['extent_limited'] = extent_limited
+            show_layer.setCustomProperty(MATERIALIZED_SHOW_LAYER_PROPERTY, json.dumps(layer_settings))
+            return show_layer
+    return None
+
+
+def _get_field_names(source_settings: dict) -> list:
+    """names of the data-layer-fields copied to the show-layer, PoL without stationing_to_field and offset_field"""
+    field_names = []
+    for setting_key in ['data_id_field', 'data_reference_field', 'stationing_from_field', 'stationing_to_field', 'offset_field']:
+        if source_settings.get(setting_key):
+            field_names.append(source_settings[setting_key])
+    return field_names
+
+
+class MaterializedShowLayer:
+    """maintains the features of a materialized Show-Layer, one feature per data-feature with assigned reference-feature
+    the event-geometries are calculated with the batch-functions of MyTools (one RouteIndex per route), not with spatialite
+    the show-layer is written directly via its data-provider (no edit-buffer), the layer itself is read-only for the user
+    maintained incrementally via signals of the data-layer (featureAdded, featureDeleted, attributeValueChanged => per event)
+    and the reference-layer (geometryChanged, featureAdded, featureDeleted, attributeValueChanged => per route)
+    filter-changes, rollbacks and data-source-changes trigger a complete refill
+    all changes are collected and applied together by flush() on the next run of the Qt-event-loop, f.e. once for a field-calculation over many features
+    extent_limited: all events are shown with their attributes, but the geometries are only calculated for the routes inside the canvas-extent
+    (reference-features queried via spatial index), the events of further routes are calculated on canvas extentsChanged,
+    the calculated routes are remembered with their geometry-version, so zooming/panning back needs no recalculation
+    """
+
+    # signals of data- and reference-layer, which trigger a complete refill
+    refill_signals = ['subsetStringChanged', 'afterRollBack', 'dataSourceChanged']
+
+    def __init__(self, show_layer: qgis.core.QgsVectorLayer):
+        """constructor, connects the signals of data- and reference-layer and schedules the initial fill
+        :param show_layer: materialized Show-Layer, see create_materialized_show_layer
+        """
+        self.show_layer = show_layer
+        self.show_layer_id = show_layer.id()
+        self.source_settings = get_source_settings(show_layer)
+        self.field_names = _get_field_names(self.source_settings)
+
+        # PoL: Point-geometries, one stationing-field
+        self.is_pol = self.source_settings['stationing_to_field'] is None
+
+        self.extent_limited = bool(self.source_settings.get('extent_limited'))
+
+        # data_fid => show_fid
+        self._show_fids = {}
+        # data_fid => ref_fid of the assigned reference-feature
+        self._ref_fids = {}
+        # ref_fid => set of data_fids, the shown events of this route
+        self._data_fids_by_ref_fid = {}
+
+        # data_fids to recalculate on next flush, data_fids no more existing or without reference-feature will be removed
+        self._pending_data_fids = set()
+        # True => complete refill on next flush
+        self._pending_refill = True
+
+        # extent_limited: ref_fid => geometry-version (see get_geometry_version) of the routes, whose event-geometries are calculated
+        self._calculated_route_versions = {}
+        # extent_limited: True => check the routes inside the canvas-extent on next flush
+        self._pending_extent = False
+
+        self._flush_timer = QtCore.QTimer()
+        self._flush_timer.setSingleShot(True)
+        self._flush_timer.setInterval(0)
+        self._flush_timer.timeout.connect(self.flush)
+
+        # tuple(layer, signal-name, slot) for disconnect
+        self._conns = []
+        if self.data_layer:
+            data_layer_slots = [('featureAdded', self.data_feature_changed), ('featureDeleted', self.data_feature_changed), ('attributeValueChanged', self.data_attribute_value_changed)]
+            for conn_signal, slot in data_layer_slots + [(conn_signal, self.refill) for conn_signal in self.refill_signals]:
+                getattr(self.data_layer, conn_signal).connect(slot)
+                self._conns.append((self.data_layer, conn_signal, slot))
+        if self.reference_layer:
+            reference_layer_slots = [('geometryChanged', self.reference_geometry_changed), ('featureAdded', self.reference_feature_added), ('featureDeleted', self.reference_feature_deleted), ('attributeValueChanged', self.reference_attribute_value_changed), ('crsChanged', self.reference_refill)]
+            for conn_signal, slot in reference_layer_slots + [(conn_signal, self.reference_refill) for conn_signal in self.refill_signals]:
+                getattr(self.reference_layer, conn_signal).connect(slot)
+                self._conns.append((self.reference_layer, conn_signal, slot))
+        if self.extent_limited:
+            canvas = qgis.utils.iface.mapCanvas()
+            canvas.extentsChanged.connect(self.canvas_extent_changed)
+            self._conns.append((canvas, 'extentsChanged', self.canvas_extent_changed))
+
+        self._flush_timer.start()
+
+    @property
+    def data_layer(self) -> qgis.core.QgsVectorLayer | None:
+        return qgis.core.QgsProject.instance().mapLayer(self.source_settings['data_layer_id'])
+
+    @property
+    def reference_layer(self) -> qgis.core.QgsVectorLayer | None:
+        return qgis.core.QgsProject.instance().mapLayer(self.source_settings['reference_layer_id'])
+
+    def __len__(self) -> int:
+        return len(self._show_fids)
+
+    def update_events(self, data_fids: typing.Iterable):
+        """schedules the recalculation of some events
+        :param data_fids: fids of added, altered or deleted data-features
+        """
+        self._pending_data_fids.update(data_fids)
+        self._flush_timer.start()
+
+    def update_routes(self, ref_fids: typing.Iterable):
+        """schedules the recalculation of all events on some routes: the currently shown ones and the currently assigned ones
+        the reference-ids are queried from the reference-layer, because the attribute-indexes are possibly not yet updated by the same signal
+        :param ref_fids: fids of reference-features
+        """
+        ref_fids = list(ref_fids)
+        for ref_fid in ref_fids:
+            self._pending_data_fids.update(self._data_fids_by_ref_fid.get(ref_fid, []))
+
+        reference_layer = self.reference_layer
+        if reference_layer:
+            request = qgis.core.QgsFeatureRequest()
+            request.setFilterFids(ref_fids)
+            request.setFlags(qgis.core.QgsFeatureRequest.NoGeometry)
+            request.setSubsetOfAttributes([self.source_settings['reference_id_field']], reference_layer.fields())
+            self.update_route_ids([reference_feature[self.source_settings['reference_id_field']] for reference_feature in reference_layer.getFeatures(request)])
+
+        self._flush_timer.start()
+
+    def update_route_ids(self, ref_ids: typing.Iterable):
+        """schedules the recalculation of the events assigned to some reference-ids, see update_routes
+        :param ref_ids: values of the reference-id-field
+        """
+        data_layer = self.data_layer
+        if data_layer:
+            route_event_index = get_route_event_index(data_layer, self.source_settings['data_reference_field'], self.source_settings['stationing_from_field'], self.source_settings['stationing_to_field'])
+            for ref_id in ref_ids:
+                self._pending_data_fids.update(route_event_index.get_data_fids(ref_id))
+            self._flush_timer.start()
+
+    def refill(self, *args):
+        """schedules the complete refill
+        :param args: signal-arguments of refill_signals, not used
+        """
+        self._pending_refill = True
+        self._flush_timer.start()
+
+    def canvas_extent_changed(self):
+        """slot for canvas extentsChanged (extent_limited only), the routes inside the new extent are calculated on flush"""
+        self._pending_extent = True
+        self._flush_timer.start()
+
+    def data_feature_changed(self, fid: int):
+        """slot for data-layer featureAdded/featureDeleted, also emitted on commit (new positive fid added, temporary negative fid deleted)"""
+        self.update_events([fid])
+
+    def data_attribute_value_changed(self, fid: int, idx: int, value: typing.Any):
+        """slot for data-layer attributeValueChanged, only the fields copied to the show-layer are relevant"""
+        if self.data_layer.fields().at(idx).name() in self.field_names:
+            self.update_events([fid])
+
+    def reference_refill(self, *args):
+        """slot for reference-layer refill_signals and crsChanged
+        the cached route-indexes and reference-geometries of the layer are invalidated before the refill,
+        because they are keyed by fid and possibly belong to the former data-source/filter/CRS (the slots of the map-tools possibly run afterwards or are not connected)
+        :param args: signal-arguments, not used
+        """
+        invalidate_route_index(self.source_settings['reference_layer_id'])
+        invalidate_reference_geom(self.source_settings['reference_layer_id'])
+        self.refill()
+
+    def reference_geometry_changed(self, fid: int, geometry: qgis.core.QgsGeometry):
+        """slot for reference-layer geometryChanged
+        the cached route-index and reference-geometry are invalidated here too, because the slots of the map-tools possibly run afterwards
+        """
+        invalidate_route_index(self.source_settings['reference_layer_id'], fid)
+        invalidate_reference_geom(self.source_settings['reference_layer_id'], [fid])
+        self.update_routes([fid])
+
+    def reference_feature_added(self, fid: int):
+        """slot for reference-layer featureAdded, events possibly already assigned to the new route"""
+        self.update_routes([fid])
+
+    def reference_feature_deleted(self, fid: int):
+        """slot for reference-layer featureDeleted, the shown events of this route are removed on flush"""
+        self._pending_data_fids.update(self._data_fids_by_ref_fid.get(fid, []))
+        self._flush_timer.start()
+
+    def reference_attribute_value_changed(self, fid: int, idx: int, value: typing.Any):
+        """slot for reference-layer attributeValueChanged, altered reference-id => events of old and new route"""
+        if self.reference_layer.fields().at(idx).name() == self.source_settings['reference_id_field']:
+            self._pending_data_fids.update(self._data_fids_by_ref_fid.get(fid, []))
+            self.update_route_ids([value])
+
+    def flush(self):
+        """applies the pending changes to the show-layer: one attribute-only request on the data-layer, geometries calculated per route
+        called by the flush-timer, can be called directly to get a current show-layer
+        """
+        self._flush_timer.stop()
+        data_layer = self.data_layer
+        reference_layer = self.reference_layer
+        if not (data_layer and reference_layer and (self._pending_refill or self._pending_data_fids or self._pending_extent)):
+            return
+
+        # extent_limited: the events of visible routes without calculated geometries rsp. with altered geometry-version are recalculated
+        # checked on each flush, so also routes getting visible by edits are complete
+        visible_ref_fids = None
+        if self.extent_limited:
+            visible_ref_fids = self._get_visible_ref_fids(reference_layer)
+            if not self._pending_refill:
+                check_ref_fids = self._data_fids_by_ref_fid.keys()
+                if visible_ref_fids is not None:
+                    check_ref_fids = check_ref_fids & visible_ref_fids
+                for ref_fid in check_ref_fids:
+                    if self._calculated_route_versions.get(ref_fid) != get_geometry_version(reference_layer.id(), ref_fid):
+                        self._pending_data_fids.update(self._data_fids_by_ref_fid[ref_fid])
+        self._pending_extent = False
+
+        if not (self._pending_refill or self._pending_data_fids):
+            return
+
+        show_provider = self.show_layer.dataProvider()
+        if self._pending_refill:
+            show_provider.truncate()
+            self._show_fids = {}
+            self._ref_fids = {}
+            self._data_fids_by_ref_fid = {}
+            self._calculated_route_versions = {}
+            show_features = self._calculate_show_features(data_layer, reference_layer, None, visible_ref_fids)
+            removed_data_fids = []
+        else:
+            show_features = self._calculate_show_features(data_layer, reference_layer, self._pending_data_fids, visible_ref_fids)
+            removed_data_fids = [data_fid for data_fid in self._pending_data_fids if data_fid not in show_features]
+
+        self._pending_refill = False
+        self._pending_data_fids = set()
+
+        # existing show-features are altered in place, so the show-fids (and thereby selections in the show-layer) are kept
+        changed_attribute_values = {}
+        changed_geometries = {}
+        added_data_fids = []
+        added_features = []
+        for data_fid, (ref_fid, attributes, geometry) in show_features.items():
+            self._set_ref_fid(data_fid, ref_fid)
+            show_fid = self._show_fids.get(data_fid)
+            if show_fid is None:
+                show_feature = qgis.core.QgsFeature(show_provider.fields())
+                show_feature.setAttributes(attributes)
+                if geometry is not None:
+                    show_feature.setGeometry(geometry)
+                added_data_fids.append(data_fid)
+                added_features.append(show_feature)
+            else:
+                changed_attribute_values[show_fid] = dict(enumerate(attributes))
+                changed_geometries[show_fid] = geometry if geometry is not None else qgis.core.QgsGeometry()
+
+        deleted_show_fids = []
+        for data_fid in removed_data_fids:
+            self._set_ref_fid(data_fid, None)
+            show_fid = self._show_fids.pop(data_fid, None)
+            if show_fid is not None:
+                deleted_show_fids.append(show_fid)
+
+        if deleted_show_fids:
+            show_provider.deleteFeatures(deleted_show_fids)
+        if changed_attribute_values:
+            show_provider.changeAttributeValues(changed_attribute_values)
+            show_provider.changeGeometryValues(changed_geometries)
+        if added_features:
+            add_result, added_features = show_provider.addFeatures(added_features)
+            for data_fid, show_feature in zip(added_data_fids, added_features):
+                self._show_fids[data_fid] = show_feature.id()
+
+        # the show-layer has no edit-signals for provider-side changes:
+        # attribute-indexes (f.e. for the back-reference-field) rebuilt on next usage, attribute-tables reloaded, canvas repainted
+        set_feature_value_index_dirty(self.show_layer_id)
+        show_provider.dataChanged.emit()
+        self.show_layer.updateExtents()
+        self.show_layer.triggerRepaint()
+
+    def _set_ref_fid(self, data_fid: int, ref_fid: int | None):
+        """updates the assignment data_fid => ref_fid and its inverse"""
+        old_ref_fid = self._ref_fids.pop(data_fid, None)
+        if old_ref_fid is not None:
+            route_data_fids = self._data_fids_by_ref_fid.get(old_ref_fid)
+            if route_data_fids is not None:
+                route_data_fids.discard(data_fid)
+                if not route_data_fids:
+                    del self._data_fids_by_ref_fid[old_ref_fid]
+        if ref_fid is not None:
+            self._ref_fids[data_fid] = ref_fid
+            self._data_fids_by_ref_fid.setdefault(ref_fid, set()).add(data_fid)
+
+    def _get_visible_ref_fids(self, reference_layer: qgis.core.QgsVectorLayer) -> set | None:
+        """fids of the reference-features inside the current canvas-extent, queried via the spatial index of the reference-layer
+        :returns: None if the canvas-extent is not transformable into the CRS of the reference-layer => no limitation
+        """
+        try:
+            extent = get_transform(get_canvas_crs(), reference_layer.crs()).transformBoundingBox(qgis.utils.iface.mapCanvas().extent())
+        except qgis.core.QgsCsException:
+            return None
+        request = qgis.core.QgsFeatureRequest()
+        request.setFilterRect(extent)
+        request.setNoAttributes()
+        return {reference_feature.id() for reference_feature in reference_layer.getFeatures(request)}
+
+    def _calculate_show_features(self, data_layer: qgis.core.QgsVectorLayer, reference_layer: qgis.core.QgsVectorLayer, data_fids: typing.Iterable | None, visible_ref_fids: set | None = None) -> dict:
+        """queries the data-features and calculates their event-geometries grouped by route
+        :param data_layer:
+        :param reference_layer:
+        :param data_fids: None => all features of the data-layer (respecting its filter and edit-buffer)
+        :param visible_ref_fids: extent_limited: fids of the routes inside the canvas-extent, the events of other routes get no geometry, None => all routes
+        :returns: dict data_fid => tuple(ref_fid, list of attribute-values in order of field_names, QgsGeometry or None for invalid stationings),
+        data-features without existing reference-feature are not included (same as the INNER JOIN of the virtual Show-Layer)
+        """
+        field_idxs = [data_layer.fields().indexOf(field_name) for field_name in self.field_names]
+        if min(field_idxs) < 0:
+            return {}
+
+        request = qgis.core.QgsFeatureRequest()
+        if data_fids is not None:
+            request.setFilterFids(list(data_fids))
+        request.setFlags(qgis.core.QgsFeatureRequest.NoGeometry)
+        request.setSubsetOfAttributes(field_idxs)
+
+        # ref_id => list of tuple(data_fid, attribute-values)
+        route_events = {}
+        for data_feature in data_layer.getFeatures(request):
+            attributes = [data_feature[field_idx] for field_idx in field_idxs]
+            ref_id = attributes[1]
+            if isinstance(ref_id, QtCore.QVariant):
+                ref_id = None if ref_id.isNull() else ref_id.value()
+            if ref_id is not None:
+                route_events.setdefault(ref_id, []).append((data_feature.id(), attributes))
+
+        show_features = {}
+        reference_value_index = get_feature_value_index(reference_layer, self.source_settings['reference_id_field'])
+        for ref_id, events in route_events.items():
+            ref_fid = reference_value_index.get_fid(ref_id)
+            if ref_fid is None:
+                continue
+
+            if visible_ref_fids is not None and ref_fid not in visible_ref_fids:
+                # outside the canvas-extent: shown without geometry, calculated on flush, when the route gets visible
+                self._calculated_route_versions.pop(ref_fid, None)
+                for data_fid, attributes in events:
+                    show_features[data_fid] = (ref_fid, attributes, None)
+                continue
+
+            reference_geom = get_reference_geom(reference_layer, ref_fid)
+            if reference_geom is None:
+                continue
+
+            route_index = get_route_index(reference_geom, reference_layer.id(), ref_fid)
+            geometries = self._calculate_geometries(reference_geom, route_index, [attributes for data_fid, attributes in events])
+            for (data_fid, attributes), geometry in zip(events, geometries):
+                show_features[data_fid] = (ref_fid, attributes, geometry)
+            if self.extent_limited:
+                self._calculated_route_versions[ref_fid] = get_geometry_version(reference_layer.id(), ref_fid)
+
+        return show_features
+
+    def _calculate_geometries(self, reference_geom: qgis.core.QgsGeometry, route_index, events_attributes: list) -> list:
+        """event-geometries on one route, same results as the geometry-expressions of the virtual Show-Layer
+        stationings outside the range of the route result in None, same as ST_Line_Substring/ST_Line_Interpolate_Point
+        :param reference_geom:
+        :param route_index: RouteIndex of reference_geom, see get_route_index
+        :param events_attributes: list of attribute-values in order of field_names
+        :returns: list of 2D-QgsGeometry or None in order of events_attributes
+        """
+        lr_mode = self.source_settings['lr_mode']
+        num_events = len(events_attributes)
+        geometries = [None] * num_events
+        stationings_from = to_float_array([attributes[2] for attributes in events_attributes])
+
+        if self.is_pol:
+            stationing_arrays, error_msg = recalc_stationings(reference_geom, stationings_from, lr_mode, route_index, PoLOutputs.NONE)
+            if stationing_arrays:
+                for event_idx in np.flatnonzero(stationing_arrays.is_valid):
+                    geometries[event_idx] = qgis.core.QgsGeometry.fromPointXY(qgis.core.QgsPointXY(stationing_arrays.snap_x[event_idx], stationing_arrays.snap_y[event_idx]))
+            return geometries
+
+        stationings_to = to_float_array([attributes[3] for attributes in events_attributes])
+        offsets = [attributes[4] for attributes in events_attributes]
+
+        # stationings outside the route are set NaN => no segment
+        with np.errstate(invalid='ignore'):
+            if lr_mode == 'Nabs':
+                is_valid = (np.minimum(stationings_from, stationings_to) >= 0) & (np.maximum(stationings_from, stationings_to) <= route_index.length)
+            elif lr_mode == 'Nfract':
+                is_valid = (np.minimum(stationings_from, stationings_to) >= 0) & (np.maximum(stationings_from, stationings_to) <= 1)
+                stationings_from = stationings_from * route_index.length
+                stationings_to = stationings_to * route_index.length
+            elif lr_mode == 'Mabs':
+                is_valid = np.full(num_events, route_index.has_m)
+                if route_index.has_m:
+                    is_valid = (np.minimum(stationings_from, stationings_to) >= route_index.first_m) & (np.maximum(stationings_from, stationings_to) <= route_index.last_m)
+            else:
+                raise NotImplementedError(f"lr_mode '{lr_mode}' not implemented")
+
+        stationings_from[~is_valid] = np.nan
+        stationings_to[~is_valid] = np.nan
+
+        if lr_mode == 'Mabs':
+            segment_geoms, error_msg = get_segment_geoms_m(reference_geom, stationings_from, stationings_to, offsets, route_index)
+        else:
+            segment_geoms, error_msg = get_segment_geoms_n(reference_geom, stationings_from, stationings_to, offsets, route_index)
+
+        if segment_geoms:
+            for event_idx, segment_geom in enumerate(segment_geoms):
+                if segment_geom is not None and not segment_geom.isEmpty():
+                    # 2D-LineString, same as the virtual Show-Layer
+                    segment_geom.get().dropZValue()
+                    segment_geom.get().dropMValue()
+                    if segment_geom.isMultipart():
+                        segment_geom.convertToSingleType()
+                    geometries[event_idx] = segment_geom
+        return geometries
+
+    def close(self):
+        """stops the flush-timer and disconnects the layer-signals"""
+        self._flush_timer.stop()
+        for layer, conn_signal, slot in self._conns:
+            try:
+                getattr(layer, conn_signal).disconnect(slot)
+            except (TypeError, RuntimeError):
+                # already disconnected rsp. layer already deleted
+                pass
+        self._conns = []
+        self._pending_data_fids = set()
+
+    def __str__(self):
+        """stringify implemented for debug-purpose"""
+        extent_info = f", {len(self._calculated_route_versions)} routes calculated inside canvas-extent" if self.extent_limited else ''
+        return f"MaterializedShowLayer: layer '{self.show_layer_id}', {len(self._show_fids)} features, {len(self._data_fids_by_ref_fid)} routes{extent_info}, {'refill' if self._pending_refill else str(len(self._pending_data_fids)) + ' events'} pending"
+
+
+def get_materialized_show_layer(show_layer: qgis.core.QgsVectorLayer) -> MaterializedShowLayer | None:
+    """cached MaterializedShowLayer for show_layer, on first usage the layer is (re-)filled, f.e. after project-load, because memory-layers are not stored
+    :param show_layer:
+    :returns: None if show_layer is no materialized Show-Layer
+    """
+    materialized_show_layer = _materialized_show_layers.get(show_layer.id())
+    if materialized_show_layer is None and is_materialized_show_layer(show_layer):
+        close_slot = functools.partial(close_materialized_show_layers, show_layer.id())
+        show_layer.willBeDeleted.connect(close_slot)
+        _materialized_show_layer_conns[show_layer.id()] = (show_layer, close_slot)
+        materialized_show_layer = MaterializedShowLayer(show_layer)
+        _materialized_show_layers[show_layer.id()] = materialized_show_layer
+    return materialized_show_layer
+
+
+def close_materialized_show_layers(layer_id: str = None):
+    """removes the cached MaterializedShowLayer and disconnects their layer-signals
+    :param layer_id: layer_id of the show-layer, None => all, f.e. on plugin-unload
+    """
+    for close_id in [close_id for close_id in _materialized_show_layers if layer_id is None or close_id == layer_id]:
+        _materialized_show_layers.pop(close_id).close()
+
+    for close_id in [close_id for close_id in _materialized_show_layer_conns if layer_id is None or close_id == layer_id]:
+        layer, close_slot = _materialized_show_layer_conns.pop(close_id)
+        try:
+            layer.willBeDeleted.disconnect(close_slot)
+        except (TypeError, RuntimeError):
+            # already disconnected rsp. layer already deleted
+            pass
@@ -35,29 +35,135 @@ import numbers
 import typing
 import math
 import locale
-import inspect
+import collections
+import functools
+import numpy as np
 from PyQt5 import QtCore, QtWidgets, QtGui
 from qgis import core
 from LinearReferencing.tools.MyDebugFunctions import debug_print, debug_log
-# from enum import Flag, auto
+from enum import Flag
 import sqlite3
+import threading
 import re
 from LinearReferencing.i18n.SQLiteDict import SQLiteDict
+from LinearReferencing.tools.RouteIndex import RouteIndex, get_route_index
+from LinearReferencing.tools.TransformCache import get_crs, get_transform, get_canvas_crs
+from LinearReferencing.tools.GeometryCache import get_reference_geom as get_cached_reference_geom
 # global variable
 # get language-dependend error-messages
 MY_DICT = SQLiteDict()
 
-# one global sqlite/spatialite-connection for usage in some below functions
-sqlite_conn = sqlite3.connect(':memory:')
-sqlite_conn.enable_load_extension(True)
-sqlite_conn.execute('SELECT load_extension("mod_spatialite")')
-sqlite_conn.execute('SELECT InitSpatialMetaData();')
+# calculation-engine for M-stationing (get_point_m, get_stationing_n_from_m, check_geom_m_valid)
+# 'numpy' => default, vertex-arrays via LinearReferencing.tools.RouteIndex, no SQLite-round-trip
+# 'spatialite' => fallback, previous calculation via spatialite-queries, see get_sqlite_conn
+M_STATIONING_ENGINE = 'numpy'
+
+# WKB-types for reference-layers rsp. reference-geometries, module-level sets instead of lists rebuilt on every call
+# also multi-line-types because of shape-format, which doesn't distinguish between single- and multi-geometry-types
+SINGLE_LINESTRING_WKB_TYPES = frozenset([
+    qgis.core.QgsWkbTypes.LineString25D,
+    qgis.core.QgsWkbTypes.LineString,
+    qgis.core.QgsWkbTypes.LineStringZ,
+    qgis.core.QgsWkbTypes.LineStringM,
+    qgis.core.QgsWkbTypes.LineStringZM,
+])
+
+MULTI_LINESTRING_WKB_TYPES = frozenset([
+    qgis.core.QgsWkbTypes.MultiLineString25D,
+    qgis.core.QgsWkbTypes.MultiLineString,
+    qgis.core.QgsWkbTypes.MultiLineStringZ,
+    qgis.core.QgsWkbTypes.MultiLineStringM,
+    qgis.core.QgsWkbTypes.MultiLineStringZM,
+])
+
+LINESTRING_WKB_TYPES = SINGLE_LINESTRING_WKB_TYPES | MULTI_LINESTRING_WKB_TYPES
+
+LINESTRING_M_WKB_TYPES = frozenset([
+    qgis.core.QgsWkbTypes.LineStringM,
+    qgis.core.QgsWkbTypes.LineStringZM,
+    qgis.core.QgsWkbTypes.MultiLineStringM,
+    qgis.core.QgsWkbTypes.MultiLineStringZM,
+])
+
+# cached ReferenceLayerProfile, key: layer-id, see get_reference_layer_profile
+_layer_profiles = {}
+
+# layer-id => tuple(layer, slot) for the signal-connections of the profiled layers, see get_reference_layer_profile
+_layer_profile_conns = {}
+
+# layer-signals, which invalidate the cached ReferenceLayerProfile
+_layer_profile_signals = ['crsChanged', 'dataSourceChanged', 'willBeDeleted']
+
+# sqlite/spatialite-connections for usage in some below functions, one per thread, see get_sqlite_conn
+_sqlite_local = threading.local()
+
+# all opened connections of all threads, closed on plugin-unload, see close_sqlite_conns
+_sqlite_conns = []
+_sqlite_conns_lock = threading.Lock()
 
 locale.setlocale(locale.LC_ALL, '')
 
 
 
 
+def get_sqlite_conn() -> sqlite3.Connection:
+    """spatialite-enabled in-memory-connection for the current thread
+    opened on first usage in each thread and reused afterwards, so the spatialite-functions are usable in QgsTask/worker-threads
+    lazy: nothing is loaded on plugin-import, only if a spatialite-function is used (M_STATIONING_ENGINE 'spatialite')
+    (sqlite3-connections and their cursors must not be shared between threads)
+    :returns: sqlite3.Connection
+    """
+    sqlite_conn = getattr(_sqlite_local, 'sqlite_conn', None)
+    if sqlite_conn is None:
+        # check_same_thread=False only for close_sqlite_conns on plugin-unload from the main-thread,
+        # the connection itself is used exclusively by the thread, which opened it
+        sqlite_conn = sqlite3.connect(':memory:', check_same_thread=False)
+        sqlite_conn.enable_load_extension(True)
+        sqlite_conn.execute('SELECT load_extension("mod_spatialite")')
+        # lightweight init: no InitSpatialMetaData(), the used functions (ST_IsValidTrajectory, ST_TrajectoryInterpolatePoint, ST_Locate_Between_Measures...)
+        # work on WKB-parameters and need no spatial_ref_sys/geometry_columns-tables, whose creation took most of the init-time
+        # see docs/scripts/benchmark_spatialite_init.py
+        _sqlite_local.sqlite_conn = sqlite_conn
+        with _sqlite_conns_lock:
+            _sqlite_conns.append(sqlite_conn)
+
+    return sqlite_conn
+
+
+def close_sqlite_conns():
+    """closes the sqlite/spatialite-connections of all threads, called on plugin-unload
+    subsequent get_sqlite_conn-calls will open new connections
+    """
+    global _sqlite_local
+    with _sqlite_conns_lock:
+        for sqlite_conn in _sqlite_conns:
+            sqlite_conn.close()
+        _sqlite_conns.clear()
+        # forget the closed connections in all threads
+        _sqlite_local = threading.local()
+
+
+class PoLOutputs(Flag):
+    """derived measurements of a PoLFeature, which are not necessary for the location itself
+    calculated lazily on first access, see PoLFeature.recalc_by_stationing
+    batch-callers rsp. the dialog can restrict the outputs to the ones they need, not requested outputs stay None
+    """
+    # Rev. 2026-10-17
+    NONE = 0
+    N_FRACT = 1
+    M_ABS = 2
+    M_FRACT = 4
+    Z_ABS = 8
+    # map_x/map_y, recalculated snap-coordinates in canvas-projection
+    CANVAS_COORDS = 16
+    ALL = 31
+
+
+# PoLOutputs required to express a stationing in lr_mode, snap_n_abs is always calculated
+# f.e. for batch-callers, which only need the stationing in the current lr_mode, see recalc_stationings
+LR_MODE_OUTPUTS = {'Nabs': PoLOutputs.NONE, 'Nfract': PoLOutputs.N_FRACT, 'Mabs': PoLOutputs.M_ABS, 'Mfract': PoLOutputs.M_FRACT}
+
+
 class PoLFeature:
     """Point-On-Line-Feature
     Point snapped on a line with calculated stationings
@@ -66,66 +172,202 @@ class PoLFeature:
     or for editing of stored vector-layer-feature in case of PolEvt
     """
 
-    # optional fid of data-feature for edit/save-purpose
-    data_fid = None
+    # fixed set of instance-attributes: no per-instance __dict__, less memory and faster attribute-access/copy
+    # see docs/scripts/benchmark_feature_slots.py
+    __slots__ = (
+        'data_fid',
+        'geom_defined_by',
+        'screen_x',
+        'screen_y',
+        '_map_x',
+        '_map_y',
+        'ref_lyr_id',
+        'ref_fid',
+        'cached_geom',
+        'reference_authid',
+        'snap_x',
+        'snap_y',
+        '_snap_z_abs',
+        'snap_n_abs',
+        '_snap_n_fract',
+        '_snap_m_abs',
+        '_snap_m_fract',
+        'is_valid',
+        'last_error',
+        '_lazy_outputs',
+        '_lazy_source',
+    )
 
-    # allow multiple versions for geometry-input
-    # ref_fid =>  default, get geometry from layer by ref_lyr_id and ref_fid
-    # cache => cache any geometry
-    geom_defined_by = 'ref_fid'
+    def __init__(self):
+        # optional fid of data-feature for edit/save-purpose
+        self.data_fid = None
 
-    # pixel-on-screen-coordinates used for check mouse-down == mouse-up
-    screen_x = None
-    screen_y = None
+        # allow multiple versions for geometry-input
+        # ref_fid =>  default, get geometry from layer by ref_lyr_id and ref_fid
+        # cache => cache any geometry
+        self.geom_defined_by = 'ref_fid'
 
-    # mouse-coordinates in canvas projection
-    map_x = None
-    map_y = None
+        # pixel-on-screen-coordinates used for check mouse-down == mouse-up
+        self.screen_x = None
+        self.screen_y = None
 
+        # mouse-coordinates in canvas projection
+        self._map_x = None
+        self._map_y = None
 
-    # Layer on which the values are calculated
-    ref_lyr_id = None
+        # Layer on which the values are calculated
+        self.ref_lyr_id = None
 
-    # FID of snapped reference-line
-    ref_fid = None
+        # FID of snapped reference-line
+        self.ref_fid = None
 
-    # for geom_defined_by 'cache': reference-geometry (post-processing)
-    cached_geom = None
+        # for geom_defined_by 'cache': reference-geometry (post-processing)
+        self.cached_geom = None
 
-    # projection of reference_geom and cached_geom
-    # type str, f.e. 'EPSG:25832'
-    reference_authid = None
+        # projection of reference_geom and cached_geom
+        # type str, f.e. 'EPSG:25832'
+        self.reference_authid = None
 
+        # snap_x/snap_y => mouse-position snapped on reference-line, refLyr-projection
+        self.snap_x = None
+        self.snap_y = None
+        # interpolated Z-value of snapped point (if refLyr Z-enabled)
+        self._snap_z_abs = None
+
+        # absolute N-stationing of snapped point in refLyr-units
+        self.snap_n_abs = None
 
-    # snap_x/snap_y => mouse-position snapped on reference-line, refLyr-projection
-    snap_x = None
-    snap_y = None
-    # interpolated Z-value of snapped point (if refLyr Z-enabled)
-    snap_z_abs = None
+        # relative N-stationing 0...1 as fract of range 0...geometry-length
+        self._snap_n_fract = None
 
-    # absolute N-stationing of snapped point in refLyr-units
-    snap_n_abs = None
+        # interpolated M-value of snapped point (if refLyr M-enabled)
+        self._snap_m_abs = None
 
-    # relative N-stationing 0...1 as fract of range 0...geometry-length
-    snap_n_fract = None
+        # interpolated M-value of snapped point as fract of range minM...maxM
+        # if refLyr M-enabled and geometry is ST_IsValidTrajectory (single parted, ascending M-values, see https://postgis.net/docs/ST_IsValidTrajectory.html)
+        self._snap_m_fract = None
 
-    # interpolated M-value of snapped point (if refLyr M-enabled)
-    snap_m_abs = None
+        # validity
+        self.is_valid = False
 
-    # interpolated M-value of snapped point as fract of range minM...maxM
-    # if refLyr M-enabled and geometry is ST_IsValidTrajectory (single parted, ascending M-values, see https://postgis.net/docs/ST_IsValidTrajectory.html)
-    snap_m_fract = None
+        # reason for not is_valid
+        self.last_error = 'not_initialized'
 
-    # validity
-    is_valid = False
+        # PoLOutputs not yet calculated, see recalc_by_stationing and the properties below
+        self._lazy_outputs = PoLOutputs.NONE
 
-    # reason for not is_valid
-    last_error = 'not_initialized'
+        # source-values for the lazy calculation: tuple(snap_z_abs, snap_m_abs, length, first_m, last_m) from the interpolation, NaN if not Z/M-enabled
+        self._lazy_source = None
 
+    def _calc_lazy_outputs(self, outputs: PoLOutputs):
+        """calculates pending derived measurements, called on first access of the properties below
+        :param outputs: combination of PoLOutputs, only the pending ones are calculated
+        """
+        outputs &= self._lazy_outputs
+        self._lazy_outputs &= ~outputs
 
+        if self._lazy_source:
+            snap_z_abs, snap_m_abs, length, first_m, last_m = self._lazy_source
 
-    def __init__(self):
-        pass
+            if PoLOutputs.N_FRACT in outputs and length > 0:
+                self._snap_n_fract = self.snap_n_abs / length
+
+            # store calculated M-value, even if the geometry is not valid for m-stationing
+            if PoLOutputs.M_ABS in outputs and not math.isnan(snap_m_abs):
+                self._snap_m_abs = snap_m_abs
+
+            if PoLOutputs.M_FRACT in outputs and not math.isnan(snap_m_abs) and (last_m - first_m) != 0:
+                self._snap_m_fract = (snap_m_abs - first_m) / (last_m - first_m)
+
+            if PoLOutputs.Z_ABS in outputs and not math.isnan(snap_z_abs):
+                self._snap_z_abs = snap_z_abs
+
+        if PoLOutputs.CANVAS_COORDS in outputs:
+            interpolated_point = qgis.core.QgsGeometry(qgis.core.QgsPoint(self.snap_x, self.snap_y))
+            interpolated_point.transform(get_transform(self.reference_authid, get_canvas_crs()))
+            self._map_x = interpolated_point.constGet().x()
+            self._map_y = interpolated_point.constGet().y()
+
+    def _set_lazy_outputs(self, outputs: PoLOutputs, lazy_source: tuple = None):
+        """resets the derived measurements, which will be calculated on first access
+        :param outputs: requested PoLOutputs, PoLOutputs.CANVAS_COORDS keeps the current map_x/map_y until first access
+        :param lazy_source: see self._lazy_source
+        """
+        self._snap_n_fract = None
+        self._snap_m_abs = None
+        self._snap_m_fract = None
+        self._snap_z_abs = None
+        self._lazy_outputs = outputs
+        self._lazy_source = lazy_source
+
+    @property
+    def snap_n_fract(self):
+        if self._lazy_outputs & PoLOutputs.N_FRACT:
+            self._calc_lazy_outputs(PoLOutputs.N_FRACT)
+        return self._snap_n_fract
+
+    @snap_n_fract.setter
+    def snap_n_fract(self, value):
+        self._lazy_outputs &= ~PoLOutputs.N_FRACT
+        self._snap_n_fract = value
+
+    @property
+    def snap_m_abs(self):
+        if self._lazy_outputs & PoLOutputs.M_ABS:
+            self._calc_lazy_outputs(PoLOutputs.M_ABS)
+        return self._snap_m_abs
+
+    @snap_m_abs.setter
+    def snap_m_abs(self, value):
+        self._lazy_outputs &= ~PoLOutputs.M_ABS
+        self._snap_m_abs = value
+
+    @property
+    def snap_m_fract(self):
+        if self._lazy_outputs & PoLOutputs.M_FRACT:
+            self._calc_lazy_outputs(PoLOutputs.M_FRACT)
+        return self._snap_m_fract
+
+    @snap_m_fract.setter
+    def snap_m_fract(self, value):
+        self._lazy_outputs &= ~PoLOutputs.M_FRACT
+        self._snap_m_fract = value
+
+    @property
+    def snap_z_abs(self):
+        if self._lazy_outputs & PoLOutputs.Z_ABS:
+            self._calc_lazy_outputs(PoLOutputs.Z_ABS)
+        return self._snap_z_abs
+
+    @snap_z_abs.setter
+    def snap_z_abs(self, value):
+        self._lazy_outputs &= ~PoLOutputs.Z_ABS
+        self._snap_z_abs = value
+
+    @property
+    def map_x(self):
+        if self._lazy_outputs & PoLOutputs.CANVAS_COORDS:
+            self._calc_lazy_outputs(PoLOutputs.CANVAS_COORDS)
+        return self._map_x
+
+    @map_x.setter
+    def map_x(self, value):
+        # map_x/map_y are calculated together, a pending calculation would overwrite map_y afterwards
+        if self._lazy_outputs & PoLOutputs.CANVAS_COORDS:
+            self._calc_lazy_outputs(PoLOutputs.CANVAS_COORDS)
+        self._map_x = value
+
+    @property
+    def map_y(self):
+        if self._lazy_outputs & PoLOutputs.CANVAS_COORDS:
+            self._calc_lazy_outputs(PoLOutputs.CANVAS_COORDS)
+        return self._map_y
+
+    @map_y.setter
+    def map_y(self, value):
+        if self._lazy_outputs & PoLOutputs.CANVAS_COORDS:
+            self._calc_lazy_outputs(PoLOutputs.CANVAS_COORDS)
+        self._map_y = value
 
 
     def line_locate_event(self, event:qgis.gui.QgsMapMouseEvent, reference_layer:qgis.core.QgsVectorLayer, ref_fid:int):
@@ -137,27 +379,20 @@ class PoLFeature:
         """
         self.geom_defined_by = 'ref_fid'
         self.ref_fid = ref_fid
-        linestring_wkb_types = [
-            qgis.core.QgsWkbTypes.LineString25D,
-            qgis.core.QgsWkbTypes.MultiLineString25D,
-            qgis.core.QgsWkbTypes.LineString,
-            qgis.core.QgsWkbTypes.MultiLineString,
-            qgis.core.QgsWkbTypes.LineStringZ,
-            qgis.core.QgsWkbTypes.MultiLineStringZ,
-            qgis.core.QgsWkbTypes.LineStringM,
-            qgis.core.QgsWkbTypes.MultiLineStringM,
-            qgis.core.QgsWkbTypes.LineStringZM,
-            qgis.core.QgsWkbTypes.MultiLineStringZM,
-        ]
-        if reference_layer.type() == qgis.core.QgsMapLayerType.VectorLayer and reference_layer.dataProvider().wkbType() in linestring_wkb_types:
-            self.ref_lyr_id = reference_layer.id()
-            self.reference_authid = reference_layer.crs().authid()
+        layer_profile = get_reference_layer_profile(reference_layer)
+        if layer_profile.is_line:
+            self.ref_lyr_id = layer_profile.layer_id
+            self.reference_authid = layer_profile.authid
             reference_geom = self.get_reference_geom()
             if reference_geom:
                 point_geom = qgis.core.QgsGeometry.fromPointXY(event.mapPoint())
-                point_geom.transform(qgis.core.QgsCoordinateTransform(qgis.utils.iface.mapCanvas().mapSettings().destinationCrs(), qgis.core.QgsCoordinateReferenceSystem(self.reference_authid), qgis.core.QgsProject.instance()))
-                snap_n_abs = reference_geom.lineLocatePoint(point_geom)
-                self.recalc_by_stationing(snap_n_abs,'Nabs')
+                point_geom.transform(get_transform(get_canvas_crs(), self.reference_authid))
+                snap_n_abs = self.get_reference_route_index(reference_geom).locate_point(point_geom.constGet().x(), point_geom.constGet().y())
+                if snap_n_abs is not None:
+                    self.recalc_by_stationing(snap_n_abs,'Nabs')
+                else:
+                    self.is_valid = False
+                    self.last_error = MY_DICT.tr('exc_line_locate_point_failed')
         else:
             self.is_valid = False
             self.last_error = MY_DICT.tr('exc_reference_layer_type_not_suitable',reference_layer.type())
@@ -167,19 +402,7 @@ class PoLFeature:
     def snap_to_layer(self,event:qgis.gui.QgsMapMouseEvent,reference_layer:qgis.core.QgsVectorLayer,filter_feature_id:int = None, paranoid:bool = False)->qgis.core.QgsPointLocator.Match:
 
         if paranoid:
-            linestring_wkb_types = [
-                qgis.core.QgsWkbTypes.LineString25D,
-                qgis.core.QgsWkbTypes.MultiLineString25D,
-                qgis.core.QgsWkbTypes.LineString,
-                qgis.core.QgsWkbTypes.MultiLineString,
-                qgis.core.QgsWkbTypes.LineStringZ,
-                qgis.core.QgsWkbTypes.MultiLineStringZ,
-                qgis.core.QgsWkbTypes.LineStringM,
-                qgis.core.QgsWkbTypes.MultiLineStringM,
-                qgis.core.QgsWkbTypes.LineStringZM,
-                qgis.core.QgsWkbTypes.MultiLineStringZM,
-            ]
-            if reference_layer.type() == qgis.core.QgsMapLayerType.VectorLayer and reference_layer.dataProvider().wkbType() in linestring_wkb_types:
+            if get_reference_layer_profile(reference_layer).is_line:
                 # set and enable snapping-configuration for this layer, which always will be self.derived_settings.refLyr
                 # not necessary, cause already done for  by sys_check_settings > sys_connect_reference_layer
                 my_snap_config = qgis.core.QgsProject.instance().snappingConfig()
@@ -206,16 +429,20 @@ class PoLFeature:
                 # default: no ref_fid or ref_fid fitting to match
                 self.ref_lyr_id = match.layer().id()
                 self.ref_fid = match.featureId()
-                self.reference_authid = match.layer().crs().authid()
+                self.reference_authid = get_reference_layer_profile(match.layer()).authid
 
                 layer_point = qgis.core.QgsPoint(match.point())
-                layer_point.transform(qgis.core.QgsCoordinateTransform(qgis.utils.iface.mapCanvas().mapSettings().destinationCrs(), match.layer().crs(), qgis.core.QgsProject.instance()))
-
-                reference_geom = match.layer().getFeature(match.featureId()).geometry()
+                layer_point.transform(get_transform(get_canvas_crs(), self.reference_authid))
 
-                snap_n_abs = reference_geom.lineLocatePoint(qgis.core.QgsGeometry.fromPoint(layer_point))
-
-                self.recalc_by_stationing(snap_n_abs,'Nabs')
+                self.geom_defined_by = 'ref_fid'
+                reference_geom = self.get_reference_geom()
+                if reference_geom:
+                    snap_n_abs = self.get_reference_route_index(reference_geom).locate_point(layer_point.x(), layer_point.y())
+                    if snap_n_abs is not None:
+                        self.recalc_by_stationing(snap_n_abs,'Nabs')
+                    else:
+                        self.is_valid = False
+                        self.last_error = MY_DICT.tr('exc_line_locate_point_failed')
 
 
         return match
@@ -232,32 +459,27 @@ class PoLFeature:
         self.reference_authid = reference_authid
 
 
-    def set_ref_fid(self,reference_layer:qgis.core.QgsVectorLayer,ref_fid:int):
+    def set_ref_fid(self,reference_layer:qgis.core.QgsVectorLayer,ref_fid:int,reference_feature:qgis.core.QgsFeature = None):
+        """
+        :param reference_layer:
+        :param ref_fid:
+        :param reference_feature: optional already queried reference-feature, avoids an additional getFeature, f.e. in batch-processing with recalc_stationings
+        """
         self.ref_lyr_id = None
         self.reference_authid = None
         self.ref_fid = None
-        linestring_wkb_types = [
-            qgis.core.QgsWkbTypes.LineString25D,
-            qgis.core.QgsWkbTypes.MultiLineString25D,
-            qgis.core.QgsWkbTypes.LineString,
-            qgis.core.QgsWkbTypes.MultiLineString,
-            qgis.core.QgsWkbTypes.LineStringZ,
-            qgis.core.QgsWkbTypes.MultiLineStringZ,
-            qgis.core.QgsWkbTypes.LineStringM,
-            qgis.core.QgsWkbTypes.MultiLineStringM,
-            qgis.core.QgsWkbTypes.LineStringZM,
-            qgis.core.QgsWkbTypes.MultiLineStringZM,
-        ]
-        if reference_layer.type() == qgis.core.QgsMapLayerType.VectorLayer and reference_layer.dataProvider().wkbType() in linestring_wkb_types:
-            reference_feature = reference_layer.getFeature(ref_fid)
+        layer_profile = get_reference_layer_profile(reference_layer)
+        if layer_profile.is_line:
+            if reference_feature is None or reference_feature.id() != ref_fid:
+                reference_feature = reference_layer.getFeature(ref_fid)
             if reference_feature.isValid() and reference_feature.hasGeometry():
-                self.ref_lyr_id = reference_layer.id()
-                self.reference_authid = reference_layer.crs().authid()
+                self.ref_lyr_id = layer_profile.layer_id
+                self.reference_authid = layer_profile.authid
                 self.ref_fid = ref_fid
                 self.geom_defined_by = 'ref_fid'
             else:
                 self.is_valid = False
-                self.last_error = MY_DICT.tr('exc_reference_feature_invalid',self.ref_fid,self.reference_layer.name())
+                self.last_error = MY_DICT.tr('exc_reference_feature_invalid',ref_fid,reference_layer.name())
         else:
             self.is_valid = False
             self.last_error = MY_DICT.tr('exc_reference_layer_type_not_suitable',reference_layer.type())
@@ -276,9 +498,10 @@ class PoLFeature:
                 reference_layer = qgis.core.QgsProject.instance().mapLayer(self.ref_lyr_id)
                 if reference_layer:
                     if self.ref_fid is not None:
-                        reference_feature = reference_layer.getFeature(self.ref_fid)
-                        if reference_feature.isValid() and reference_feature.hasGeometry():
-                            return reference_feature.geometry()
+                        # Rev. 2026-10-17: LRU-cached, see GeometryCache
+                        reference_geom = get_cached_reference_geom(reference_layer, self.ref_fid)
+                        if reference_geom is not None:
+                            return reference_geom
                         else:
                             self.is_valid = False
                             self.last_error = MY_DICT.tr('exc_reference_feature_invalid',self.ref_fid,reference_layer.name())
@@ -302,6 +525,17 @@ class PoLFeature:
             self.is_valid = False
             self.last_error = MY_DICT.tr('exc_geom_defined_by',self.geom_defined_by)
 
+    def get_reference_route_index(self, reference_geom: qgis.core.QgsGeometry) -> RouteIndex:
+        """RouteIndex (vertex-arrays with cumulated segment-lengths) for the reference-geometry
+        'ref_fid': cached per reference-feature, see get_route_index
+        'cache': built for self.cached_geom
+        :param reference_geom: reference-geometry, see get_reference_geom
+        """
+        if self.geom_defined_by == 'ref_fid':
+            return get_route_index(reference_geom, self.ref_lyr_id, self.ref_fid)
+        else:
+            return RouteIndex(reference_geom)
+
     def recalc_by_point(self, point_geom: qgis.core.QgsGeometry):
         """recalculate additional stationing-meta-data for specific reference-feature by point-geometry, which will be snapped to the reference-geometry
         :param point_geom: point-geometry projection according to self.reference_layer
@@ -309,9 +543,9 @@ class PoLFeature:
         """
         reference_geom = self.get_reference_geom()
         if reference_geom:
-            snap_n_abs = reference_geom.lineLocatePoint(point_geom)
-            # lineLocatePoint => -1 on error
-            if snap_n_abs >= 0:
+            snap_n_abs = self.get_reference_route_index(reference_geom).locate_point(point_geom.constGet().x(), point_geom.constGet().y())
+            # None on error
+            if snap_n_abs is not None:
 
                 self.map_x = point_geom.constGet().x()
                 self.map_y = point_geom.constGet().y()
@@ -324,7 +558,7 @@ class PoLFeature:
 
 
 
-    def recalc_by_stationing(self, stationing_xyz, lr_mode: str, recalc_canvas_coords: bool = True):
+    def recalc_by_stationing(self, stationing_xyz, lr_mode: str, recalc_canvas_coords: bool = True, outputs: PoLOutputs = PoLOutputs.ALL):
         """recalculate additional stationing-meta-data for specific reference-feature (self.reference_layer + self.ref_fid) and a numeric stationing
         :param stationing_xyz: numerical stationing for various lr_modes
         :param lr_mode:
@@ -336,51 +570,46 @@ class PoLFeature:
         reference-layer m-enabled
         referenced-geometry ST_IsValidTrajectory (single-parted, ascending M-values)
         :param recalc_canvas_coords: replace original canvas-coords (click-position) with recalculated snap-coords
+        :param outputs: derived measurements (N-fract, M, Z, canvas-coords), calculated lazily on first access, not requested outputs stay None
+        Note: length, first/last-vertex-M and interpolation via RouteIndex, built once per reference-geometry
         """
         self.snap_n_abs = None
-        self.snap_n_fract = None
         self.snap_x = None
         self.snap_y = None
-        self.snap_m_abs = None
-        self.snap_m_fract = None
+        self._set_lazy_outputs(PoLOutputs.NONE)
         stationing_n = None
 
         reference_geom = self.get_reference_geom()
         if reference_geom:
+            route_index = self.get_reference_route_index(reference_geom)
             if lr_mode == 'Nabs':
-                if 0 <= stationing_xyz <= reference_geom.length():
+                if 0 <= stationing_xyz <= route_index.length:
                     stationing_n = stationing_xyz
                 else:
                     self.is_valid = False
                     self.last_error = MY_DICT.tr('exc_stationing_out_of_range',lr_mode,stationing_xyz)
             elif lr_mode == 'Nfract':
                 if 0 <= stationing_xyz <= 1:
-                    stationing_n = reference_geom.length() * stationing_xyz
+                    stationing_n = route_index.length * stationing_xyz
                 else:
                     self.is_valid = False
                     self.last_error = MY_DICT.tr('exc_stationing_out_of_range',lr_mode,stationing_xyz)
             elif lr_mode == 'Mabs':
-                first_vertex_m, last_vertex_m, error_msg = get_first_last_vertex_m(reference_geom)
-                if not error_msg:
-                    if first_vertex_m <= stationing_xyz <= last_vertex_m:
-                        stationing_n = get_stationing_n_from_m(reference_geom, stationing_xyz)
+                if route_index.has_m and route_index.num_vertices:
+                    if route_index.first_m <= stationing_xyz <= route_index.last_m:
+                        stationing_n = get_stationing_n_from_m(reference_geom, stationing_xyz, route_index)
                     else:
                         self.is_valid = False
                         self.last_error = MY_DICT.tr('exc_stationing_out_of_range',lr_mode,stationing_xyz)
                 else:
                     self.is_valid = False
-                    self.last_error = error_msg
+                    self.last_error = MY_DICT.tr('exc_geometry_type_without_m')
             elif lr_mode == 'Mfract':
-                geom_m_valid, error_msg = check_geom_m_valid(reference_geom)
+                geom_m_valid, error_msg = check_geom_m_valid(reference_geom, route_index=route_index)
                 if geom_m_valid:
                     if 0 <= stationing_xyz <= 1:
-                        first_vertex_m, last_vertex_m, error_msg = get_first_last_vertex_m(reference_geom)
-                        if not error_msg:
-                            current_m = first_vertex_m + (stationing_xyz * (last_vertex_m - first_vertex_m))
-                            stationing_n = get_stationing_n_from_m(reference_geom, current_m)
-                        else:
-                            self.is_valid = False
-                            self.last_error = error_msg
+                        current_m = route_index.first_m + (stationing_xyz * (route_index.last_m - route_index.first_m))
+                        stationing_n = get_stationing_n_from_m(reference_geom, current_m, route_index)
                     else:
                         self.is_valid = False
                         self.last_error = MY_DICT.tr('exc_stationing_out_of_range',lr_mode,stationing_xyz)
@@ -397,87 +626,95 @@ class PoLFeature:
                 # interpolate automatically calculates interpolated M- and Z-Values
                 # M-Z-values are interpolated in range M-Z-vertex-before/M-Z-vertex-after even if check_geom_m_valid returns false
                 # NaN, if geometry not M/Z-enabled
-                interpolated_point = reference_geom.interpolate(stationing_n)
+                interpolated = route_index.interpolate_n(stationing_n)
 
-                if not interpolated_point.isEmpty():
+                if interpolated:
+                    snap_x, snap_y, snap_z_abs, snap_m_abs, _ = interpolated
                     self.snap_n_abs = stationing_n
-                    self.snap_x = interpolated_point.constGet().x()
-                    self.snap_y = interpolated_point.constGet().y()
+                    self.snap_x = snap_x
+                    self.snap_y = snap_y
 
                     self.is_valid = True
                     self.last_error = ''
 
-                    linestring_m_wkb_types = [
-                        qgis.core.QgsWkbTypes.LineStringM,
-                        qgis.core.QgsWkbTypes.LineStringZM,
-                        qgis.core.QgsWkbTypes.MultiLineStringM,
-                        qgis.core.QgsWkbTypes.MultiLineStringZM,
-                    ]
-
-
-                    if reference_geom.wkbType() in linestring_m_wkb_types:
-                        # store calculated M-value, even if the geometry is not valid for m-stationing
-                        # @ToThink
-                        # if check_geom_m_valid(reference_geom):
-                        snap_m_abs = interpolated_point.constGet().m()
-                        if isinstance(snap_m_abs, numbers.Number) and not math.isnan(snap_m_abs):
-                            self.snap_m_abs = snap_m_abs
-                            first_vertex_m, last_vertex_m, error_msg = get_first_last_vertex_m(reference_geom)
-                            if not error_msg and (last_vertex_m - first_vertex_m) != 0:
-                                self.snap_m_fract = (self.snap_m_abs - first_vertex_m) / (last_vertex_m - first_vertex_m)
-                                #debug_print(self.snap_m_abs,first_vertex_m,last_vertex_m,self.snap_m_fract)
-
-
-
-                    linestring_z_wkb_types = [
-                        qgis.core.QgsWkbTypes.LineStringZ,
-                        qgis.core.QgsWkbTypes.LineStringZM,
-                        qgis.core.QgsWkbTypes.MultiLineStringZ,
-                        qgis.core.QgsWkbTypes.MultiLineStringZM,
-                    ]
-
-                    self.snap_z_abs = None
-                    if reference_geom.wkbType() in linestring_z_wkb_types:
-                        snap_z_abs = interpolated_point.constGet().z()
-                        if isinstance(snap_z_abs, numbers.Number) and not math.isnan(snap_z_abs):
-                            self.snap_z_abs = snap_z_abs
-
-                    if reference_geom.length() > 0:
-                        self.snap_n_fract = self.snap_n_abs / reference_geom.length()
-
-                    if recalc_canvas_coords:
-                        if self.reference_authid:
-                            interpolated_point.transform(qgis.core.QgsCoordinateTransform(qgis.core.QgsCoordinateReferenceSystem(self.reference_authid), qgis.utils.iface.mapCanvas().mapSettings().destinationCrs(), qgis.core.QgsProject.instance()))
-
-                            self.map_x = interpolated_point.constGet().x()
-                            self.map_y = interpolated_point.constGet().y()
-                        else:
-                            self.is_valid = False
-                            self.last_error = MY_DICT.tr('reference_authid_not_set')
+                    # M/Z/fract and canvas-coords are calculated on first access, see _calc_lazy_outputs
+                    # @ToThink
+                    # M-value stored even if the geometry is not valid for m-stationing (check_geom_m_valid)
+                    if not route_index.has_m:
+                        snap_m_abs = math.nan
+                    if not route_index.has_z:
+                        snap_z_abs = math.nan
+
+                    if not recalc_canvas_coords:
+                        outputs &= ~PoLOutputs.CANVAS_COORDS
+                    elif not self.reference_authid:
+                        outputs &= ~PoLOutputs.CANVAS_COORDS
+                        self.is_valid = False
+                        self.last_error = MY_DICT.tr('reference_authid_not_set')
+
+                    self._set_lazy_outputs(outputs, (snap_z_abs, snap_m_abs, route_index.length, route_index.first_m, route_index.last_m))
                 else:
                     self.is_valid = False
                     self.last_error = MY_DICT.tr('exc_interpolation_failed',lr_mode,stationing_n)
 
 
+    def set_by_stationing_arrays(self, stationing_arrays: StationingArrays, row_idx: int, lr_mode: str, stationing_xyz, recalc_canvas_coords: bool = True, outputs: PoLOutputs = PoLOutputs.ALL):
+        """same result as recalc_by_stationing, but with values taken from a previous batch-calculation
+        :param stationing_arrays: result of recalc_stationings on the reference-geometry of this PoLFeature
+        :param row_idx: index of the stationing inside stationing_arrays
+        :param lr_mode: lr_mode used for recalc_stationings, only for error-message
+        :param stationing_xyz: stationing used for recalc_stationings, only for error-message
+        :param recalc_canvas_coords: replace original canvas-coords (click-position) with recalculated snap-coords
+        :param outputs: derived measurements, already calculated in stationing_arrays except the canvas-coords, which are calculated lazily on first access
+            should not request more than the outputs of recalc_stationings, not calculated columns are NaN => None
+        """
+        self.snap_n_abs = None
+        self.snap_x = None
+        self.snap_y = None
+        self._set_lazy_outputs(PoLOutputs.NONE)
+
+        if stationing_arrays.is_valid[row_idx]:
+            self.snap_x = float(stationing_arrays.snap_x[row_idx])
+            self.snap_y = float(stationing_arrays.snap_y[row_idx])
+            self.snap_n_abs = float(stationing_arrays.n_abs[row_idx])
+            self.is_valid = True
+            self.last_error = ''
+
+            # NaN if not calculable or geometry not Z/M-enabled
+            if PoLOutputs.Z_ABS in outputs and not math.isnan(stationing_arrays.snap_z[row_idx]):
+                self._snap_z_abs = float(stationing_arrays.snap_z[row_idx])
+            if PoLOutputs.M_ABS in outputs and not math.isnan(stationing_arrays.snap_m[row_idx]):
+                self._snap_m_abs = float(stationing_arrays.snap_m[row_idx])
+            if PoLOutputs.M_FRACT in outputs and not math.isnan(stationing_arrays.m_fract[row_idx]):
+                self._snap_m_fract = float(stationing_arrays.m_fract[row_idx])
+            if PoLOutputs.N_FRACT in outputs and not math.isnan(stationing_arrays.n_fract[row_idx]):
+                self._snap_n_fract = float(stationing_arrays.n_fract[row_idx])
+
+            if recalc_canvas_coords and PoLOutputs.CANVAS_COORDS in outputs:
+                if self.reference_authid:
+                    self._lazy_outputs = PoLOutputs.CANVAS_COORDS
+                else:
+                    self.is_valid = False
+                    self.last_error = MY_DICT.tr('reference_authid_not_set')
+        else:
+            self.is_valid = False
+            self.last_error = MY_DICT.tr('exc_stationing_out_of_range', lr_mode, stationing_xyz)
+
     def __copy__(self):
         """implementation because of copy.deepcopy-problems if there was f.e. a missing offset in data:
-          TypeError: cannot pickle 'QVariant' object"""
-        my_clone = PoLFeature()
-
-        # no dunders, no functions, no objects => only literal-values
-        property_list = [prop for prop in dir(self) if not prop.startswith('__') and not callable(getattr(self, prop)) and not inspect.isclass(getattr(self, prop))]
+          TypeError: cannot pickle 'QVariant' object
+        field-wise copy of the __slots__, cached_geom is shared, not copied"""
+        my_clone = PoLFeature.__new__(PoLFeature)
 
-        for prop_name in property_list:
+        for prop_name in PoLFeature.__slots__:
             setattr(my_clone, prop_name, getattr(self, prop_name))
 
-        if self.cached_geom:
-            my_clone.cached_geom = self.cached_geom
-
         return my_clone
 
     def __str__(self):
         result_str = ''
-        property_list = [prop for prop in dir(self) if not prop.startswith('__') and not callable(getattr(self, prop))]
+        # public names of the lazy properties, pending outputs are calculated
+        property_list = sorted(prop.lstrip('_') for prop in self.__slots__ if not prop.startswith('_lazy'))
 
         longest_prop = max(property_list, key=len)
         max_len = len(longest_prop)
@@ -494,60 +731,80 @@ class LoLFeature:
     instantiated and stored in LolEvt as session_data.edit_feature via tool_select_feature
     """
 
-    # optional fid of data-feature for edit/save-purpose
-    data_fid = None
-
-    # allow multiple versions for geometry-input
-    # ref_fid =>  default, get geometry from layer by ref_lyr_id and ref_fid
-    # cache => cache any geometry
-    geom_defined_by = 'ref_fid'
+    # fixed set of instance-attributes, see PoLFeature
+    __slots__ = (
+        'data_fid',
+        'geom_defined_by',
+        'ref_lyr_id',
+        'ref_fid',
+        'cached_geom',
+        'reference_authid',
+        'pol_from',
+        'pol_to',
+        'offset',
+        'delta_n_abs',
+        'delta_n_fract',
+        'delta_m_abs',
+        'delta_m_fract',
+        'delta_z_abs',
+        'is_valid',
+        'last_error',
+    )
 
-    # Layer on which the values are calculated
-    ref_lyr_id = None
+    def __init__(self):
+        # optional fid of data-feature for edit/save-purpose
+        self.data_fid = None
 
-    # fid of assigned reference-feature
-    ref_fid = None
+        # allow multiple versions for geometry-input
+        # ref_fid =>  default, get geometry from layer by ref_lyr_id and ref_fid
+        # cache => cache any geometry
+        self.geom_defined_by = 'ref_fid'
 
-    # for geom_defined_by 'cache': reference-geometry (post-processing)
-    cached_geom = None
+        # Layer on which the values are calculated
+        self.ref_lyr_id = None
 
-    # projection of reference_geom and cached_geom
-    # type str, f.e. 'EPSG:25832'
-    reference_authid = None
+        # fid of assigned reference-feature
+        self.ref_fid = None
 
-    # stationing-from on assigned reference-line, type PoLFeature, ignoring their ref_lyr_id + ref_fid
-    pol_from = None
-    # stationing-to on assigned reference-line, type PoLFeature
-    pol_to = None
+        # for geom_defined_by 'cache': reference-geometry (post-processing)
+        self.cached_geom = None
 
-    # offset
-    offset = 0
+        # projection of reference_geom and cached_geom
+        # type str, f.e. 'EPSG:25832'
+        self.reference_authid = None
 
-    delta_n_abs = None
-    delta_n_fract = None
-    delta_m_abs = None
-    delta_m_fract = None
-    delta_z_abs = None
+        # stationing-from on assigned reference-line, type PoLFeature, ignoring their ref_lyr_id + ref_fid
+        self.pol_from = None
+        # stationing-to on assigned reference-line, type PoLFeature
+        self.pol_to = None
 
+        # offset
+        self.offset = 0
 
-    is_valid = True
+        self.delta_n_abs = None
+        self.delta_n_fract = None
+        self.delta_m_abs = None
+        self.delta_m_fract = None
+        self.delta_z_abs = None
 
-    # reason for not is_valid
-    last_error = ''
+        self.is_valid = True
 
+        # reason for not is_valid
+        self.last_error = ''
 
     def set_pol_from(self,pol_from):
         self.pol_from = pol_from
         self.ref_lyr_id = pol_from.ref_lyr_id
         self.ref_fid = pol_from.ref_fid
-        self.calculate_delta_measurements()
+        # only delta_n_abs, the derived delta-measurements would force the lazy outputs of the PoLFeatures
+        self.calculate_delta_measurements(PoLOutputs.NONE)
         self.check_is_valid()
 
     def set_pol_to(self,pol_to):
         self.pol_to = pol_to
         self.ref_lyr_id = pol_to.ref_lyr_id
         self.ref_fid = pol_to.ref_fid
-        self.calculate_delta_measurements()
+        self.calculate_delta_measurements(PoLOutputs.NONE)
         self.check_is_valid()
 
 
@@ -558,7 +815,10 @@ class LoLFeature:
 
         return self.is_valid
 
-    def calculate_delta_measurements(self):
+    def calculate_delta_measurements(self, outputs: PoLOutputs = PoLOutputs.ALL):
+        """calculates the delta-measurements pol_from => pol_to
+        :param outputs: PoLOutputs for the derived delta-measurements besides delta_n_abs, f.e. only the visible dialog-groups, the others stay None
+        """
         self.delta_n_abs = None
         self.delta_n_fract = None
         self.delta_m_abs = None
@@ -571,33 +831,27 @@ class LoLFeature:
                     if isinstance(self.pol_from.snap_n_abs, numbers.Number) and isinstance(self.pol_to.snap_n_abs, numbers.Number):
                         self.delta_n_abs = self.pol_to.snap_n_abs - self.pol_from.snap_n_abs
 
-                    if isinstance(self.pol_from.snap_n_fract, numbers.Number) and isinstance(self.pol_to.snap_n_fract, numbers.Number):
+                    if PoLOutputs.N_FRACT in outputs and isinstance(self.pol_from.snap_n_fract, numbers.Number) and isinstance(self.pol_to.snap_n_fract, numbers.Number):
                         self.delta_n_fract = self.pol_to.snap_n_fract - self.pol_from.snap_n_fract
 
-                    if isinstance(self.pol_from.snap_m_abs, numbers.Number) and isinstance(self.pol_to.snap_m_abs, numbers.Number):
+                    if PoLOutputs.M_ABS in outputs and isinstance(self.pol_from.snap_m_abs, numbers.Number) and isinstance(self.pol_to.snap_m_abs, numbers.Number):
                         self.delta_m_abs = self.pol_to.snap_m_abs - self.pol_from.snap_m_abs
 
-                    if isinstance(self.pol_from.snap_m_fract, numbers.Number) and isinstance(self.pol_to.snap_m_fract, numbers.Number):
+                    if PoLOutputs.M_FRACT in outputs and isinstance(self.pol_from.snap_m_fract, numbers.Number) and isinstance(self.pol_to.snap_m_fract, numbers.Number):
                         self.delta_m_fract = self.pol_to.snap_m_fract - self.pol_from.snap_m_fract
 
-                    if isinstance(self.pol_from.snap_z_abs, numbers.Number) and isinstance(self.pol_to.snap_z_abs, numbers.Number):
+                    if PoLOutputs.Z_ABS in outputs and isinstance(self.pol_from.snap_z_abs, numbers.Number) and isinstance(self.pol_to.snap_z_abs, numbers.Number):
                         self.delta_z_abs = self.pol_to.snap_z_abs - self.pol_from.snap_z_abs
 
     def __copy__(self):
         """implementation because of deepcopy-error if there was f.e. a missing offset in data:
-          TypeError: cannot pickle 'QVariant' object"""
-        my_clone = LoLFeature()
-
-        # no dunders, no functions, no objects => only literal-values
-        property_list = [prop for prop in dir(self) if not prop.startswith('__') and not callable(getattr(self, prop)) and not inspect.isclass(getattr(self, prop))]
+          TypeError: cannot pickle 'QVariant' object
+        field-wise copy of the __slots__, cached_geom is shared, pol_from/pol_to are copied"""
+        my_clone = LoLFeature.__new__(LoLFeature)
 
-        for prop_name in property_list:
+        for prop_name in LoLFeature.__slots__:
             setattr(my_clone, prop_name, getattr(self, prop_name))
 
-        # this property is an object, therefore not clonable
-        if self.cached_geom:
-            my_clone.cached_geom = self.cached_geom
-
         # Note: PoLFeature implements its own __copy__()-method
         if self.pol_from:
             my_clone.set_pol_from(self.pol_from.__copy__())
@@ -609,7 +863,7 @@ class LoLFeature:
 
     def __str__(self):
         result_str = ''
-        property_list = [prop for prop in dir(self) if not prop.startswith('__') and not callable(getattr(self, prop))]
+        property_list = sorted(self.__slots__)
 
         longest_prop = max(property_list, key=len)
         max_len = len(longest_prop)
@@ -629,7 +883,7 @@ def eval_crs_units(crs_authid: str) -> tuple:
     # Rev. 2024-06-24
     # enum class Qgis::DistanceUnit: https://api.qgis.org/api/classQgis.html#a3ea4b03a09f98ff39ea27ad0e5d50614
 
-    crs = qgis.core.QgsCoordinateReferenceSystem(crs_authid)
+    crs = get_crs(crs_authid)
     #mapUnits(self) -> Qgis.DistanceUnit
     # Returns the units for the projection used by the CRS.
     mu = crs.mapUnits()
@@ -694,6 +948,80 @@ def eval_crs_units(crs_authid: str) -> tuple:
     return unit, zoom_pan_tolerance, display_precision, measure_default_step
 
 
+class ReferenceLayerProfile:
+    """geometry- and CRS-metadata of a layer, queried once instead of dataProvider().wkbType(), crs().authid() and eval_crs_units on every call
+    cached per layer via get_reference_layer_profile, rebuilt after crsChanged rsp. dataSourceChanged
+    """
+    __slots__ = ('layer_id', 'wkb_type', 'is_line', 'has_m', 'has_z', 'is_multi', 'authid', 'unit', 'zoom_pan_tolerance', 'display_precision', 'measure_default_step')
+
+    def __init__(self, layer: qgis.core.QgsMapLayer):
+        """constructor
+        :param layer: any type of map-layer, is_line only True for vector-layers of type (Multi-)LineString
+        """
+        # Rev. 2026-10-17
+        self.layer_id = layer.id()
+
+        # WKB-type of the data-provider, NoGeometry for non-vector-layers
+        self.wkb_type = qgis.core.QgsWkbTypes.NoGeometry
+        if layer.type() == qgis.core.QgsMapLayerType.VectorLayer:
+            self.wkb_type = layer.dataProvider().wkbType()
+
+        # suitable as reference-layer
+        self.is_line = self.wkb_type in LINESTRING_WKB_TYPES
+
+        self.has_m = qgis.core.QgsWkbTypes.hasM(self.wkb_type)
+        self.has_z = qgis.core.QgsWkbTypes.hasZ(self.wkb_type)
+        self.is_multi = qgis.core.QgsWkbTypes.isMultiType(self.wkb_type)
+
+        # authority identifier for the CRS, f.e. 'EPSG:25832'
+        self.authid = layer.crs().authid()
+
+        # see eval_crs_units
+        self.unit, self.zoom_pan_tolerance, self.display_precision, self.measure_default_step = eval_crs_units(self.authid)
+
+    def __str__(self):
+        """stringify implemented for debug-purpose"""
+        return "\n".join(f"{prop:<20}    {getattr(self, prop)}" for prop in self.__slots__)
+
+
+def get_reference_layer_profile(layer: qgis.core.QgsMapLayer) -> ReferenceLayerProfile:
+    """cached ReferenceLayerProfile for layer
+    on first usage the signals crsChanged, dataSourceChanged and willBeDeleted of the layer are connected to invalidate_reference_layer_profile
+    :param layer:
+    """
+    layer_id = layer.id()
+    layer_profile = _layer_profiles.get(layer_id)
+    if layer_profile is None:
+        layer_profile = ReferenceLayerProfile(layer)
+        _layer_profiles[layer_id] = layer_profile
+        if layer_id not in _layer_profile_conns:
+            invalidate_slot = functools.partial(invalidate_reference_layer_profile, layer_id)
+            for conn_signal in _layer_profile_signals:
+                getattr(layer, conn_signal).connect(invalidate_slot)
+            _layer_profile_conns[layer_id] = (layer, invalidate_slot)
+    return layer_profile
+
+
+def invalidate_reference_layer_profile(layer_id: str = None):
+    """removes the cached ReferenceLayerProfile and disconnects the layer-signals, the profile is rebuilt on next get_reference_layer_profile
+    :param layer_id: None => all layers, f.e. on plugin-unload
+    """
+    layer_ids = list(_layer_profile_conns) if layer_id is None else [layer_id]
+    for invalidate_id in layer_ids:
+        _layer_profiles.pop(invalidate_id, None)
+        if invalidate_id in _layer_profile_conns:
+            layer, invalidate_slot = _layer_profile_conns.pop(invalidate_id)
+            # each signal separately, a failed disconnect must not leave the other connections
+            for conn_signal in _layer_profile_signals:
+                try:
+                    getattr(layer, conn_signal).disconnect(invalidate_slot)
+                except (TypeError, RuntimeError):
+                    # already disconnected rsp. layer already deleted
+                    pass
+    if layer_id is None:
+        _layer_profiles.clear()
+
+
 def set_layer_extent(layer: qgis.core.QgsVectorLayer) -> qgis.core.QgsRectangle:
     """there is a bug in QGis layer.updateExtents(), that this function only recalculates and sets a correct extent, if the new one is larger than before
     this function recalculates and sets the extent by iterating over all feature-geometries
@@ -751,6 +1079,15 @@ def to_float(value: typing.Any) -> tuple:
     return (numeric_value, convert_ok, not_ok_reason)
 
 
+def to_float_array(values: typing.Iterable) -> np.ndarray:
+    """converts a list of numerical values to a float-NumPy-array for batch-calculations
+    not numerical values (None, NULL-QVariant, str...) are converted to NaN
+    :param values:
+    :returns: np.ndarray dtype float
+    """
+    return np.array([value if isinstance(value, numbers.Real) else math.nan for value in values], dtype=float)
+
+
 def find_conn(conn_ids: dict, layer_id: str, conn_signal: str, conn_function: str) -> tuple:
     """searches a signal/slot-connection in conn_ids
     the plugin-used layers (reference/data/show) have some signals connected to slots, f. e. to refresh dialog-elements after inserts/updates/deletes
@@ -1082,14 +1419,7 @@ def get_first_last_vertex_m(in_geom: qgis.core.QgsGeometry) -> tuple:
     :returns: tuple(min, max, error_msg)
     """
 
-    linestring_m_wkb_types = [
-        qgis.core.QgsWkbTypes.LineStringM,
-        qgis.core.QgsWkbTypes.LineStringZM,
-        qgis.core.QgsWkbTypes.MultiLineStringM,
-        qgis.core.QgsWkbTypes.MultiLineStringZM,
-    ]
-
-    if in_geom.wkbType() in linestring_m_wkb_types:
+    if in_geom.wkbType() in LINESTRING_M_WKB_TYPES:
         abstr_geom = in_geom.constGet()
         if isinstance(abstr_geom, qgis.core.QgsLineString):
             # only one geometry
@@ -1111,13 +1441,26 @@ def get_first_last_vertex_m(in_geom: qgis.core.QgsGeometry) -> tuple:
 def get_point_m(in_geom: qgis.core.QgsGeometry, stationing_m: float) -> tuple:
     """returns the Linestring-M-stationed point
     similar as PostGis st_line_locate_point, but returns single-type-geometry and requires Geometries with ST_IsValidTrajectory (monotonuously ascending M-values)
+    calculated with M_STATIONING_ENGINE
     see https://www.gaia-gis.it/gaia-sins/spatialite-sql-latest.html
     :returns: tuple(qgis.core.QgsGeometry, error_msg)
     """
+    if M_STATIONING_ENGINE == 'spatialite':
+        return get_point_m_spatialite(in_geom, stationing_m)
+
+    point_geom, stationing_n, error_msg = get_point_and_stationing_n_from_m(in_geom, stationing_m)
+    return point_geom, error_msg
+
+
+def get_point_m_spatialite(in_geom: qgis.core.QgsGeometry, stationing_m: float) -> tuple:
+    """get_point_m via spatialite-query ST_TrajectoryInterpolatePoint
+    fallback for M_STATIONING_ENGINE 'spatialite'
+    :returns: tuple(qgis.core.QgsGeometry, error_msg)
+    """
     geom_m_valid, error_msg = check_geom_m_valid(in_geom)
     if geom_m_valid:
         # SQLite-pre-condition for ST_TrajectoryInterpolatePoint
-        sqlite_cur = sqlite_conn.cursor()
+        sqlite_cur = get_sqlite_conn().cursor()
         query = "SELECT ST_AsBinary(ST_TrajectoryInterpolatePoint(ST_GeomFromWkb(:geom_wkb),:stationing_m))"
         sqlite_result = sqlite_cur.execute(query, {'geom_wkb': in_geom.asWkb(), 'stationing_m': stationing_m})
         sqlite_row = sqlite_result.fetchone()
@@ -1131,6 +1474,29 @@ def get_point_m(in_geom: qgis.core.QgsGeometry, stationing_m: float) -> tuple:
         return None, error_msg
 
 
+def get_point_and_stationing_n_from_m(in_geom: qgis.core.QgsGeometry, stationing_m: float, route_index: RouteIndex = None) -> tuple:
+    """returns the Linestring-M-stationed point and its N-stationing in one step
+    vertex-arrays via RouteIndex, binary search on the M-values instead of spatialite-query + lineLocatePoint
+    results equal to spatialite ST_TrajectoryInterpolatePoint, stationing_m outside first-vertex-M...last-vertex-M is clamped to first rsp. last vertex
+    :param in_geom: Linestring-M-Geometry, must be valid trajectory, see check_geom_m_valid
+    :param stationing_m:
+    :param route_index: optional already built RouteIndex for in_geom, see get_route_index
+    :returns: tuple(qgis.core.QgsGeometry point_geom, float stationing_n, str error_msg)
+    """
+    if route_index is None:
+        route_index = RouteIndex(in_geom)
+    geom_m_valid, error_msg = check_geom_m_valid(in_geom, route_index=route_index)
+    if geom_m_valid:
+        interpolated = route_index.interpolate_m(stationing_m)
+        if interpolated:
+            x, y, z, m, stationing_n = interpolated
+            return route_index.point_geom(x, y, z, m), stationing_n, None
+        else:
+            return None, None, MY_DICT.tr('exc_interpolation_failed', 'Mabs', stationing_m)
+    else:
+        return None, None, error_msg
+
+
 def get_point_m_2(in_geom: qgis.core.QgsGeometry, stationing_m: float) -> qgis.core.QgsGeometry:
     """experimental
     same as get_point_m but without sqlite
@@ -1226,7 +1592,7 @@ def get_point_m_2(in_geom: qgis.core.QgsGeometry, stationing_m: float) -> qgis.c
 
 
 
-def get_stationing_n_from_m(in_geom: qgis.core.QgsGeometry, stationing_m: float) -> qgis.core.QgsGeometry:
+def get_stationing_n_from_m(in_geom: qgis.core.QgsGeometry, stationing_m: float, route_index: RouteIndex = None) -> float:
     """returns the N-stationing of a Linestring-M-stationed point without sqlite
     Notes:
     similar as PostGis or SQLite st_line_locate_point
@@ -1238,45 +1604,55 @@ def get_stationing_n_from_m(in_geom: qgis.core.QgsGeometry, stationing_m: float)
     replacement for former sqlite-calculation with query
     SELECT ST_Line_Locate_Point(ST_GeomFromWkb(:geom_wkb),ST_TrajectoryInterpolatePoint(ST_GeomFromWkb(:geom_wkb),:stationing_m))*ST_Length(ST_GeomFromWkb(:geom_wkb))
     see https://www.gaia-gis.it/gaia-sins/spatialite-sql-latest.html
+    M_STATIONING_ENGINE 'numpy': stationing_n taken directly from the M-interpolation, no additional lineLocatePoint
     :param in_geom:
     :param stationing_m:
+    :param route_index: optional already built RouteIndex for in_geom, see get_route_index
     :returns: unit-less stationing-n (running-distance from start-point to stationed point) or None
     """
-    point, error_msg = get_point_m(in_geom, stationing_m)
+    if M_STATIONING_ENGINE == 'spatialite':
+        point, error_msg = get_point_m_spatialite(in_geom, stationing_m)
 
-    if point:
-        return in_geom.lineLocatePoint(point)
+        if point:
+            return in_geom.lineLocatePoint(point)
+    else:
+        point, stationing_n, error_msg = get_point_and_stationing_n_from_m(in_geom, stationing_m, route_index)
+        return stationing_n
 
 
-def check_geom_m_valid(in_geom: qgis.core.QgsGeometry) -> tuple:
+def check_geom_m_valid(in_geom: qgis.core.QgsGeometry, layer_id: str = None, fid: int = None, route_index: RouteIndex = None) -> tuple:
     """check geometry-type M-enabled, single-parted and monotonuous ascending m-values,
     Only these geometries are suitable for M-stationing
     not OK: multi-part Multi-Line-Strings, ST_LineMerge would strip any vertex-m-values
     raises nothing, but returns False/None, if geometry is not valid
+    M_STATIONING_ENGINE 'numpy': np.diff on the vertex-M-array of the RouteIndex, memoized per reference-feature and geometry-version, if layer_id and fid are given
+    :param in_geom:
+    :param layer_id: optional ID of the reference-layer, in_geom must be the current geometry of this feature
+    :param fid: optional fid of the reference-feature
+    :param route_index: optional already built RouteIndex for in_geom
     :returns: (bool True/False => geometry is valid, str error_msg)
     """
     # https://postgis.net/docs/ST_IsValidTrajectory.html:
     # Tests if a geometry encodes a valid trajectory. A valid trajectory is represented as a LINESTRING with measures (M values). The measure values must increase from each vertex to the next.
-    # fastest, all trials with python need longer, because every vertex has to be compared with the vertex before
 
     geom_m_valid = True
     error_msg = ''
 
-    # two quick pre-checks without SQLite...
-    linestring_m_wkb_types = [
-        qgis.core.QgsWkbTypes.LineStringM,
-        qgis.core.QgsWkbTypes.LineStringZM,
-        qgis.core.QgsWkbTypes.MultiLineStringM,
-        qgis.core.QgsWkbTypes.MultiLineStringZM,
-    ]
+    # two quick pre-checks without vertex-iteration...
 
-    if in_geom.wkbType() in linestring_m_wkb_types:
+    if in_geom.wkbType() in LINESTRING_M_WKB_TYPES:
         if in_geom.constGet().partCount() == 1:
-            sqlite_cur = sqlite_conn.cursor()
-            query = "SELECT ST_IsValidTrajectory(ST_GeomFromWkb(:geom_wkb))"
-            sqlite_result = sqlite_cur.execute(query, {'geom_wkb': in_geom.asWkb()})
-            sqlite_row = sqlite_result.fetchone()
-            geom_m_valid = bool(sqlite_row[0])
+            if M_STATIONING_ENGINE == 'spatialite':
+                sqlite_cur = get_sqlite_conn().cursor()
+                query = "SELECT ST_IsValidTrajectory(ST_GeomFromWkb(:geom_wkb))"
+                sqlite_result = sqlite_cur.execute(query, {'geom_wkb': in_geom.asWkb()})
+                sqlite_row = sqlite_result.fetchone()
+                geom_m_valid = bool(sqlite_row[0])
+            else:
+                if route_index is None:
+                    route_index = get_route_index(in_geom, layer_id, fid)
+                geom_m_valid = route_index.m_strictly_ascending
+
             if not geom_m_valid:
                 error_msg = MY_DICT.tr('exc_vertex_m_not_strictly_ascending')
         else:
@@ -1290,41 +1666,39 @@ def check_geom_m_valid(in_geom: qgis.core.QgsGeometry) -> tuple:
 
 
 
-def check_geom_n_valid(in_geom: qgis.core.QgsGeometry) -> tuple:
+def check_geom_n_valid(in_geom: qgis.core.QgsGeometry, layer_id: str = None, fid: int = None, route_index: RouteIndex = None) -> tuple:
     """returns True for single LineString, single-parted MultiLineStrings and gapless connected MultiLineString-Geometries
     These geometries are suitable for N-stationing
+    the mergeLines-result for multi-parted geometries is memoized per reference-feature and geometry-version, if layer_id and fid are given, see RouteIndex.merged_route_index
+    :param in_geom:
+    :param layer_id: optional ID of the reference-layer, in_geom must be the current geometry of this feature
+    :param fid: optional fid of the reference-feature
+    :param route_index: optional already built RouteIndex for in_geom
     :returns: (bool geom_n_valid, str error_msg)"""
 
     geom_n_valid = True
     error_msg = ''
 
-    single_linestring_wkb_types = [
-        qgis.core.QgsWkbTypes.LineString25D,
-        qgis.core.QgsWkbTypes.LineString,
-        qgis.core.QgsWkbTypes.LineStringZ,
-        qgis.core.QgsWkbTypes.LineStringM,
-        qgis.core.QgsWkbTypes.LineStringZM,
-    ]
-
-    multi_linestring_wkb_types = [
-        qgis.core.QgsWkbTypes.MultiLineString25D,
-        qgis.core.QgsWkbTypes.MultiLineString,
-        qgis.core.QgsWkbTypes.MultiLineStringZ,
-        qgis.core.QgsWkbTypes.MultiLineStringM,
-        qgis.core.QgsWkbTypes.MultiLineStringZM,
-    ]
-    if in_geom.wkbType() in single_linestring_wkb_types:
+    geom_wkb_type = in_geom.wkbType()
+    if geom_wkb_type in SINGLE_LINESTRING_WKB_TYPES:
         pass
-    elif in_geom.wkbType() in multi_linestring_wkb_types:
+    elif geom_wkb_type in MULTI_LINESTRING_WKB_TYPES:
         abstr_geom = in_geom.constGet()
         if abstr_geom.partCount() == 1:
             pass
         else:
             # try to merge multi-parted segments, which will only return a QgsLineString, if there are no gaps
-            merged_geom = in_geom.mergeLines()
-            abstr_geom = merged_geom.constGet()
-            if not isinstance(abstr_geom, qgis.core.QgsLineString):
-                geom_n_valid = False
+            if route_index is None and layer_id is not None and fid is not None:
+                route_index = get_route_index(in_geom, layer_id, fid)
+
+            if route_index is not None:
+                geom_n_valid = route_index.merged_route_index is not None
+            else:
+                merged_geom = in_geom.mergeLines()
+                abstr_geom = merged_geom.constGet()
+                geom_n_valid = isinstance(abstr_geom, qgis.core.QgsLineString)
+
+            if not geom_n_valid:
                 error_msg = MY_DICT.tr('exc_multi_part_geometry_not_mergeable')
     else:
         geom_n_valid = False
@@ -1333,57 +1707,211 @@ def check_geom_n_valid(in_geom: qgis.core.QgsGeometry) -> tuple:
     return geom_n_valid, error_msg
 
 
-def get_segment_geom_n(in_geom: qgis.core.QgsGeometry, stationing_n_from: float, stationing_n_to: float, offset: float = 0) -> tuple:
+# columnar result of recalc_stationings, one item per stationing in order of the input-stationings
+# snap_z/snap_m/m_fract NaN if the reference-geometry is not Z/M-enabled, all values NaN where not is_valid
+StationingArrays = collections.namedtuple('StationingArrays', ['snap_x', 'snap_y', 'snap_z', 'snap_m', 'n_abs', 'n_fract', 'm_fract', 'is_valid'])
+
+
+def recalc_stationings(reference_geom: qgis.core.QgsGeometry, stationings: typing.Iterable, lr_mode: str, route_index: RouteIndex = None, outputs: PoLOutputs = PoLOutputs.ALL) -> tuple:
+    """batch-version of PoLFeature.recalc_by_stationing for any number of stationings on the same reference-geometry
+    geometry-type-, M-range- and trajectory-checks are done once for the whole batch instead of once per stationing
+    the stationings are sorted internally, so the binary searches in the RouteIndex run as one ascending sweep along the vertex-arrays
+    :param reference_geom:
+    :param stationings: list/array of numerical stationings, not numerical values (None, NULL-QVariant...) and stationings out of range are marked not is_valid
+    :param lr_mode: Nabs/Nfract/Mabs/Mfract, see PoLFeature.recalc_by_stationing
+    :param route_index: optional already built RouteIndex for reference_geom, see get_route_index
+    :param outputs: derived columns snap_z (Z_ABS), snap_m (M_ABS rsp. M_FRACT), n_fract (N_FRACT) and m_fract (M_FRACT), not requested columns are NaN, f.e. PoLOutputs.NONE for zoom-extents, see LR_MODE_OUTPUTS
+    :returns: tuple(StationingArrays, str error_msg), StationingArrays None if the whole batch failed (f.e. lr_mode M* with not M-valid geometry)
+    """
+    stationings = to_float_array(stationings)
+
+    if route_index is None:
+        route_index = RouteIndex(reference_geom)
+
+    if route_index.num_vertices < 2:
+        return None, MY_DICT.tr('exc_geometry_type_not_n_valid', qgis.core.QgsWkbTypes.displayString(reference_geom.wkbType()))
+
+    # comparisons with NaN are False => not numerical stationings are not is_valid
+    with np.errstate(invalid='ignore'):
+        if lr_mode == 'Nabs':
+            is_valid = (stationings >= 0) & (stationings <= route_index.length)
+        elif lr_mode == 'Nfract':
+            is_valid = (stationings >= 0) & (stationings <= 1)
+            stationings = stationings * route_index.length
+        elif lr_mode in ['Mabs', 'Mfract']:
+            geom_m_valid, error_msg = check_geom_m_valid(reference_geom, route_index=route_index)
+            if not geom_m_valid:
+                return None, error_msg
+            if lr_mode == 'Mabs':
+                is_valid = (stationings >= route_index.first_m) & (stationings <= route_index.last_m)
+            else:
+                is_valid = (stationings >= 0) & (stationings <= 1)
+                stationings = route_index.first_m + stationings * (route_index.last_m - route_index.first_m)
+        else:
+            return None, MY_DICT.tr('exc_lr_mode_not_implemented', lr_mode)
+
+    snap_x, snap_y, snap_z, snap_m, n_abs = (np.full(stationings.size, np.nan) for _ in range(5))
+
+    valid_idx = np.flatnonzero(is_valid)
+    if valid_idx.size:
+        # one sort for the whole batch, results are written back in input-order
+        sorted_idx = valid_idx[np.argsort(stationings[valid_idx], kind='stable')]
+        # binary search by N rsp. M, interpolated Z/M-values NaN if not Z/M-enabled or not requested
+        with_z = PoLOutputs.Z_ABS in outputs
+        with_m = bool(outputs & (PoLOutputs.M_ABS | PoLOutputs.M_FRACT))
+        if lr_mode in ['Nabs', 'Nfract']:
+            interpolated = route_index.interpolate_n(stationings[sorted_idx], with_z, with_m)
+        else:
+            interpolated = route_index.interpolate_m(stationings[sorted_idx], with_z, with_m)
+        for column, values in zip([snap_x, snap_y, snap_z, snap_m, n_abs], interpolated):
+            column[sorted_idx] = values
+
+    n_fract = np.full(stationings.size, np.nan)
+    if PoLOutputs.N_FRACT in outputs and route_index.length > 0:
+        n_fract = n_abs / route_index.length
+
+    m_fract = np.full(stationings.size, np.nan)
+    if PoLOutputs.M_FRACT in outputs and route_index.has_m and (route_index.last_m - route_index.first_m) != 0:
+        m_fract = (snap_m - route_index.first_m) / (route_index.last_m - route_index.first_m)
+
+    return StationingArrays(snap_x, snap_y, snap_z, snap_m, n_abs, n_fract, m_fract, is_valid), None
+
+
+def get_segment_geom_n(in_geom: qgis.core.QgsGeometry, stationing_n_from: float, stationing_n_to: float, offset: float = 0, layer_id: str = None, fid: int = None) -> tuple:
     """calculate line-segment stationing_n_from...stationing_to on in_geom with optional offset
     Note: stationing_n_from/stationing_n_to flipped, if in wrong order
+    single-segment-version of get_segment_geoms_n
     :param in_geom:
     :param stationing_n_from:
     :param stationing_n_to:
     :param offset: default 0
+    :param layer_id: optional ID of the reference-layer, in_geom must be the current geometry of this feature, the merged geometry is memoized per reference-feature
+    :param fid: optional fid of the reference-feature
     :returns: (qgis.core.QgsGeometry: segment_geom, str; segment_error)
     """
+    route_index = None
+    if layer_id is not None and fid is not None:
+        route_index = get_route_index(in_geom, layer_id, fid)
+
+    segment_geoms, error_msg = get_segment_geoms_n(in_geom, [stationing_n_from], [stationing_n_to], [offset], route_index)
+    if segment_geoms:
+        segment_geom = segment_geoms[0]
+        if segment_geom and not segment_geom.isEmpty():
+            return segment_geom, None
+        else:
+            # empty geometry
+            return segment_geom, MY_DICT.tr('exc_curve_substring_failed', stationing_n_from, stationing_n_to)
+    else:
+        return None, error_msg
+
+
+def get_segment_geoms_n(in_geom: qgis.core.QgsGeometry, stationings_n_from: typing.Iterable, stationings_n_to: typing.Iterable, offsets: typing.Iterable = None, route_index: RouteIndex = None) -> tuple:
+    """batch-version of get_segment_geom_n for any number of segments on the same reference-geometry
+    check_geom_n_valid and mergeLines once for the whole batch (memoized with route_index, see RouteIndex.merged_route_index),
+    the segments are sorted by their stationings and cut in one sweep along the vertex-arrays, see RouteIndex.substrings_n
+    offsetCurve once per identical segment and offset
+    Note: stationing_n_from/stationing_n_to flipped, if in wrong order
+    :param in_geom:
+    :param stationings_n_from: list/array of N-stationings
+    :param stationings_n_to: list/array of N-stationings, same size
+    :param offsets: optional list/array of offsets, same size, not numerical offsets are treated as 0
+    :param route_index: optional already built RouteIndex for in_geom, see get_route_index
+    :returns: (list segment_geoms, str error_msg), segment_geoms in order of the input-stationings, None for not numerical stationings, segment_geoms None if in_geom not n-valid
+    """
+    if route_index is None:
+        route_index = RouteIndex(in_geom)
+
     # single LineString, single-parted MultiLineStrings and connected MultiLineString-Geometries are converted to QgsLineString
-    geom_n_valid, error_msg = check_geom_n_valid(in_geom)
+    geom_n_valid, error_msg = check_geom_n_valid(in_geom, route_index=route_index)
     if geom_n_valid:
-        merged_geom = in_geom.mergeLines()
-        abstr_geom = merged_geom.constGet()
+        # mergeLines possibly alters order and direction of the parts
+        route_index = route_index.merged_route_index
 
-        # switch values, curveSubstring requires from <= to
-        n_from = min(stationing_n_from, stationing_n_to)
-        n_to = max(stationing_n_from, stationing_n_to)
-        segment_geom = qgis.core.QgsGeometry(abstr_geom.curveSubstring(n_from, n_to))
+        stationings_n_from = to_float_array(stationings_n_from)
+        stationings_n_to = to_float_array(stationings_n_to)
 
-        if segment_geom:
-            if offset:
-                # Bug on QGis in Windows: no Geometry with Offset 0
-                # distance – buffer distance
-                # segments – for round joins, number of segments to approximate quarter-circle
-                # joinStyle – join style for corners in geometry
-                # miterLimit – limit on the miter ratio used for very sharp corners (JoinStyleMiter only)
-                segment_geom = segment_geom.offsetCurve(offset, 8, qgis.core.Qgis.JoinStyle.Round, 0)
+        # switch values, curveSubstring requires from <= to
+        n_from = np.minimum(stationings_n_from, stationings_n_to)
+        n_to = np.maximum(stationings_n_from, stationings_n_to)
 
-            return segment_geom, None
-        else:
-            # empty geometry
-            return segment_geom, MY_DICT.tr('exc_curve_substring_failed', n_from, n_to)
+        return offset_substrings(route_index.substrings_n(n_from, n_to), n_from, n_to, offsets), None
     else:
         return None, error_msg
 
 
+def offset_substrings(substrings: list, stationings_from: np.ndarray, stationings_to: np.ndarray, offsets: typing.Iterable = None) -> list:
+    """converts the results of RouteIndex.substrings_n to geometries with optional offset
+    offsetCurve once per identical segment and offset
+    :param substrings: list of QgsLineString or None
+    :param stationings_from: stationings of the substrings, used to identify identical segments
+    :param stationings_to:
+    :param offsets: optional list/array of offsets, same size, not numerical offsets are treated as 0
+    :returns: list of QgsGeometry or None
+    """
+    if offsets is None:
+        offsets = np.zeros(len(substrings))
+    else:
+        offsets = np.nan_to_num(to_float_array(offsets))
+
+    segment_geoms = []
+    # key: tuple(stationing_from, stationing_to, offset), value: offset segment-geometry
+    offset_geoms = {}
+    for segment_idx, substring in enumerate(substrings):
+        segment_geom = None
+        if substring is not None:
+            offset = offsets[segment_idx]
+            if offset:
+                offset_key = (stationings_from[segment_idx], stationings_to[segment_idx], offset)
+                if offset_key not in offset_geoms:
+                    # Bug on QGis in Windows: no Geometry with Offset 0
+                    # distance – buffer distance
+                    # segments – for round joins, number of segments to approximate quarter-circle
+                    # joinStyle – join style for corners in geometry
+                    # miterLimit – limit on the miter ratio used for very sharp corners (JoinStyleMiter only)
+                    offset_geoms[offset_key] = qgis.core.QgsGeometry(substring).offsetCurve(float(offset), 8, qgis.core.Qgis.JoinStyle.Round, 0)
+                # copy, the result-geometries are possibly altered by the caller (f.e. transform)
+                segment_geom = qgis.core.QgsGeometry(offset_geoms[offset_key])
+            else:
+                segment_geom = qgis.core.QgsGeometry(substring)
+        segment_geoms.append(segment_geom)
+
+    return segment_geoms
+
+
 def get_segment_geom_m(in_geom: qgis.core.QgsGeometry, stationing_m_from: float, stationing_m_to: float, offset: float = 0) -> tuple:
     """calculate line-segment stationing_m_from...stationing_m_to on in_geom with optional offset
     Note: stationing_m_from/stationing_m_to flipped, if in wrong order
+    M_STATIONING_ENGINE 'numpy': single-segment-version of get_segment_geoms_m, start- and end-point interpolated by M
+    M_STATIONING_ENGINE 'spatialite': ST_Locate_Between_Measures, which does not interpolate and returns only the vertices inside the M-range
     see https://www.gaia-gis.it/gaia-sins/spatialite-sql-latest.html
-    Note 2: never used, because M-stationings are internally converted to N-stationings
     :param in_geom:
     :param stationing_m_from:
     :param stationing_m_to:
     :param offset: default 0
     :returns: tuple(QgsGeometry, error_msg)
     """
+    if M_STATIONING_ENGINE == 'spatialite':
+        return get_segment_geom_m_spatialite(in_geom, stationing_m_from, stationing_m_to, offset)
+
+    segment_geoms, error_msg = get_segment_geoms_m(in_geom, [stationing_m_from], [stationing_m_to], [offset])
+    if segment_geoms:
+        segment_geom = segment_geoms[0]
+        if segment_geom and not segment_geom.isEmpty():
+            return segment_geom, None
+        else:
+            return segment_geom, MY_DICT.tr('exc_interpolation_failed', 'Mabs', f"{stationing_m_from} ... {stationing_m_to}")
+    else:
+        return None, error_msg
+
+
+def get_segment_geom_m_spatialite(in_geom: qgis.core.QgsGeometry, stationing_m_from: float, stationing_m_to: float, offset: float = 0) -> tuple:
+    """get_segment_geom_m via spatialite-query ST_Locate_Between_Measures
+    fallback for M_STATIONING_ENGINE 'spatialite'
+    :returns: tuple(QgsGeometry, error_msg)
+    """
     geom_m_valid, error_msg = check_geom_m_valid(in_geom)
     if geom_m_valid:
-        sqlite_cur = sqlite_conn.cursor()
+        sqlite_cur = get_sqlite_conn().cursor()
         query = """SELECT ST_AsBinary(ST_OffsetCurve(ST_Locate_Between_Measures(ST_GeomFromWkb(:geom_wkb),:m_from,:m_to),:offset))"""
         m_from = min(stationing_m_from, stationing_m_to)
         m_to = max(stationing_m_from, stationing_m_to)
@@ -1399,6 +1927,39 @@ def get_segment_geom_m(in_geom: qgis.core.QgsGeometry, stationing_m_from: float,
         return None, error_msg
 
 
+def get_segment_geoms_m(in_geom: qgis.core.QgsGeometry, stationings_m_from: typing.Iterable, stationings_m_to: typing.Iterable, offsets: typing.Iterable = None, route_index: RouteIndex = None) -> tuple:
+    """M-version of get_segment_geoms_n, without SQLite
+    start- and end-point of each segment are interpolated by M (binary search on the vertex-M-values), the segments keep Z- and M-values
+    requires valid trajectory (single-parted, strictly ascending M-values, see check_geom_m_valid), checked once for the whole batch
+    Note: stationing_m_from/stationing_m_to flipped, if in wrong order
+    stationings outside range first-vertex-M...last-vertex-M are clamped to the first rsp. last vertex
+    :param in_geom:
+    :param stationings_m_from: list/array of M-stationings
+    :param stationings_m_to: list/array of M-stationings, same size
+    :param offsets: optional list/array of offsets, same size, not numerical offsets are treated as 0
+    :param route_index: optional already built RouteIndex for in_geom, see get_route_index
+    :returns: (list segment_geoms, str error_msg), segment_geoms in order of the input-stationings, None for not numerical stationings, segment_geoms None if in_geom not m-valid
+    """
+    if route_index is None:
+        route_index = RouteIndex(in_geom)
+
+    geom_m_valid, error_msg = check_geom_m_valid(in_geom, route_index=route_index)
+    if geom_m_valid:
+        stationings_m_from = to_float_array(stationings_m_from)
+        stationings_m_to = to_float_array(stationings_m_to)
+
+        m_from = np.minimum(stationings_m_from, stationings_m_to)
+        m_to = np.maximum(stationings_m_from, stationings_m_to)
+
+        # strictly ascending M => N-stationings of the interpolated points define the same substrings
+        n_from = route_index.interpolate_m(m_from)[4]
+        n_to = route_index.interpolate_m(m_to)[4]
+
+        return offset_substrings(route_index.substrings_n(n_from, n_to), m_from, m_to, offsets), None
+    else:
+        return None, error_msg
+
+
 def get_feature_by_value(vlayer: qgis.core.QgsVectorLayer, field: qgis.core.QgsField | str, value: typing.Any) -> qgis.core.QgsFeature | None:
     """Returns first feature from layer by query on a single value,
     intended for use on PK-field and PK-Value, where only one feature is expected
@@ -1468,6 +2029,58 @@ def get_unique_string(used_strings: list, template: str, start_i: int = 1) -> st
         start_i += 1
 
 
+def get_route_sub_select_sql(reference_layer_id: str, reference_id_field_name: str, lr_mode: str) -> str:
+    """SQL-sub-select for the virtual Show-Layers: one row per reference-feature with the route-geometry prepared once per route
+    replacement for expressions like st_linemerge(ref_lyr.geometry) and st_length(st_linemerge(ref_lyr.geometry)), which were evaluated up to three times per event
+    columns:
+        route_id: value of reference_id_field_name
+        N-stationing (Nabs/Nfract): merged_geom (ST_LineMerge) and merged_length
+        M-stationing (Mabs): route_geom, unaltered geometry, the virtual table converts the geometry on each access to ref_lyr.geometry
+    "LIMIT -1" (no limit) prevents the SQLite query-flattener from copying the expressions back into the outer query,
+    so the sub-select is materialized and evaluated once per route, the join uses an automatic index on route_id
+    :param reference_layer_id: ID of the reference-layer, table-name inside the virtual layer
+    :param reference_id_field_name:
+    :param lr_mode: Nabs/Nfract/Mabs
+    :returns: sub-select in brackets, usage: INNER JOIN {sub_select} as ref_lyr ON data_lyr.reference_field = ref_lyr.route_id
+    """
+    if lr_mode in ['Nabs', 'Nfract']:
+        return f"""(
+                SELECT route_id, merged_geom, ST_Length(merged_geom) as merged_length
+                FROM (
+                    SELECT ref_src.'{reference_id_field_name}' as route_id, ST_LineMerge(ref_src.geometry) as merged_geom
+                    FROM '{reference_layer_id}' as ref_src
+                    LIMIT -1
+                )
+                LIMIT -1
+            )"""
+    elif lr_mode == 'Mabs':
+        return f"""(
+                SELECT ref_src.'{reference_id_field_name}' as route_id, ref_src.geometry as route_geom
+                FROM '{reference_layer_id}' as ref_src
+                LIMIT -1
+            )"""
+    else:
+        raise NotImplementedError(f"lr_mode '{lr_mode}' not implemented")
+
+
+def get_data_sub_select_sql(data_layer_id: str, field_names: list) -> str:
+    """SQL-sub-select for the virtual Show-Layers with non-integer reference-keys, f.e. route-codes like 'A7-N-012'
+    replacement for the former workaround "ON (data_lyr.reference_field = ref_lyr.id) = True", which prevented the wrong results with non-integer join-fields,
+    but also any index-usage, so every event was compared with every route
+    "LIMIT -1" materializes the Data-Layer like the route-sub-select (see get_route_sub_select_sql),
+    so the join-constraint is not passed to the virtual table of the Data-Layer and the join can use an automatic index as with integer-keys
+    :param data_layer_id: ID of the Data-Layer, table-name inside the virtual layer
+    :param field_names: the fields used in the Show-Layer-query, ID-, reference- and stationing-fields
+    :returns: sub-select in brackets, usage: FROM {sub_select} as data_lyr INNER JOIN ... ON data_lyr.reference_field = ref_lyr.route_id
+    """
+    select_sql = ', '.join(f"data_src.'{field_name}' as '{field_name}'" for field_name in field_names)
+    return f"""(
+                SELECT {select_sql}
+                FROM '{data_layer_id}' as data_src
+                LIMIT -1
+            )"""
+
+
 def get_data_layers() -> dict:
     """return dictionary of all loaded non-geometry-layers
     :returns dict key: layer_id value: layer (qgis.core.QgsVectorLayer)
@@ -1490,23 +2103,12 @@ def get_linestring_layers() -> dict:
     """
 
     ld = {}
-    linestring_wkb_types = [
-        qgis.core.QgsWkbTypes.LineString25D,
-        qgis.core.QgsWkbTypes.MultiLineString25D,
-        qgis.core.QgsWkbTypes.LineString,
-        qgis.core.QgsWkbTypes.MultiLineString,
-        qgis.core.QgsWkbTypes.LineStringZ,
-        qgis.core.QgsWkbTypes.MultiLineStringZ,
-        qgis.core.QgsWkbTypes.LineStringM,
-        qgis.core.QgsWkbTypes.MultiLineStringM,
-        qgis.core.QgsWkbTypes.LineStringZM,
-        qgis.core.QgsWkbTypes.MultiLineStringZM,
-    ]
     for cl in qgis.core.QgsProject.instance().mapLayers().values():
         # -> https://api.qgis.org/api/classQgsDataProvider.html -> memory/virtual/ogr
         #  Skip Virtual-layers: and cl.dataProvider().name() != 'virtual'
-        if cl.isValid():
-            if cl.type() == qgis.core.QgsMapLayerType.VectorLayer and cl.dataProvider().wkbType() in linestring_wkb_types:
+        # only vector-layers are profiled, raster-, mesh-layers... would get needless profiles and signal-connections
+        if cl.isValid() and cl.type() == qgis.core.QgsMapLayerType.VectorLayer:
+            if get_reference_layer_profile(cl).is_line:
                 ld[cl.id()] = cl
     return ld
 
@@ -0,0 +1,404 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+********************************************************************
+
+* Part of the QGis-Plugin LinearReferencing:
+* vertex-array-based stationing-calculations with NumPy
+
+********************************************************************
+
+* Date                 : 2026-10-17
+* Copyright            : (C) 2026 by Ludwig Kniprath
+* Email                : ludwig at kni minus online dot de
+
+********************************************************************
+
+this program is free software; you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation; either version 2 of the License, or
+(at your option) any later version.
+
+.. note::
+    * usage in python console:
+    * from LinearReferencing.tools.RouteIndex import RouteIndex
+    * route_index = RouteIndex(iface.activeLayer().getFeature(1).geometry())
+    * x, y, z, m, n = route_index.interpolate_m(1234.5)
+
+********************************************************************
+"""
+from __future__ import annotations
+import collections
+import math
+import threading
+import qgis
+import numpy as np
+
+# cache for RouteIndex-instances of reference-features, key: tuple(layer_id, fid), value: RouteIndex
+# least recently used first, see get_route_index
+# invalidated by the signals of the watched reference-layers (geometryChanged, afterRollBack, crsChanged...), see invalidate_route_index and GeometryCache.watch_reference_layer
+_route_index_cache = collections.OrderedDict()
+
+# max number of cached RouteIndex-instances, the least recently used ones are removed
+max_route_index_cache_size = 1000
+
+# geometry-versions of reference-features, incremented by invalidate_route_index
+# key: layer_id rsp. tuple(layer_id, fid), value: int, see get_geometry_version
+_global_version = 0
+_layer_versions = {}
+_feature_versions = {}
+
+# guards the cache and the versions, get_route_index is also used from render-threads, see ExpressionFunctions
+_route_index_lock = threading.RLock()
+
+
+class RouteIndex:
+    """X/Y/Z/M-vertex-arrays of a reference-geometry, queried once from QGis and stored as NumPy-arrays
+    replacement for the former spatialite-round-trip (WKB-export, ST_TrajectoryInterpolatePoint, WKB-import, lineLocatePoint)
+    the parts of Multi-LineStrings are concatenated, the cumulated length continues from part to part without the gaps
+    (same behaviour as QgsGeometry.length()/interpolate()/lineLocatePoint())
+    built once per reference-geometry (see get_route_index), afterwards
+    stationing => point: binary search in the prefix-summed segment-lengths (N) rsp. the M-values (M), O(log n)
+    point => stationing: vectorized projection on all segments, no Python-loop over the vertices
+    cached instances are shared between threads (render-threads, see ExpressionFunctions), the lazily calculated properties have the same result in each thread
+    """
+
+    def __init__(self, in_geom: qgis.core.QgsGeometry):
+        """constructor, reads the vertices of in_geom part by part
+        :param in_geom: LineString/MultiLineString-geometry with optional Z/M-values
+        """
+        x_parts = []
+        y_parts = []
+        z_parts = []
+        m_parts = []
+
+        # index of the first vertex of each part inside the concatenated arrays
+        part_starts = []
+
+        # Note: Vertex-Z/M-vectors are filled with NaN, if the geometry has no Z/M-values
+        self.has_z = qgis.core.QgsWkbTypes.hasZ(in_geom.wkbType())
+        self.has_m = qgis.core.QgsWkbTypes.hasM(in_geom.wkbType())
+
+        num_vertices = 0
+        for geom_part in self._get_parts(in_geom):
+            part_num_vertices = geom_part.numPoints()
+            if part_num_vertices:
+                part_starts.append(num_vertices)
+                num_vertices += part_num_vertices
+                x_parts.append(np.array(geom_part.xVector(), dtype=float))
+                y_parts.append(np.array(geom_part.yVector(), dtype=float))
+                if self.has_z:
+                    z_parts.append(np.array(geom_part.zVector(), dtype=float))
+                else:
+                    z_parts.append(np.full(part_num_vertices, np.nan))
+                if self.has_m:
+                    m_parts.append(np.array(geom_part.mVector(), dtype=float))
+                else:
+                    m_parts.append(np.full(part_num_vertices, np.nan))
+
+        self.num_parts = len(part_starts)
+        self.part_starts = np.array(part_starts, dtype=np.int64)
+
+        if num_vertices:
+            self.x = np.concatenate(x_parts)
+            self.y = np.concatenate(y_parts)
+            self.z = np.concatenate(z_parts)
+            self.m = np.concatenate(m_parts)
+        else:
+            self.x = self.y = self.z = self.m = np.empty(0)
+
+        # cumulated 2D-length for each vertex (N-stationing of the vertex)
+        # the first vertex of each part gets the same N-stationing as the last vertex of the previous part
+        seg_len = np.zeros(num_vertices)
+        if num_vertices > 1:
+            seg_len[1:] = np.hypot(np.diff(self.x), np.diff(self.y))
+            seg_len[self.part_starts] = 0
+        self.cum_len = np.cumsum(seg_len)
+
+        # segment-arrays for locate_point, calculated on first usage
+        self._seg_arrays = None
+
+        # memoized result of m_strictly_ascending
+        self._m_strictly_ascending = None
+
+        # source-geometry for the lazily merged geometry, see merged_route_index
+        # copy because QgsGeometry is mutable (f.e. transform), cheap because of implicit sharing
+        self._in_geom = qgis.core.QgsGeometry(in_geom)
+        self._merged_route_index = None
+        self._merged_checked = False
+
+        # version of the reference-feature, this RouteIndex was built from, see get_geometry_version
+        self.geometry_version = None
+
+    @staticmethod
+    def _get_parts(in_geom: qgis.core.QgsGeometry) -> list:
+        """returns the single QgsLineString-parts of in_geom
+        :param in_geom:
+        :returns: list of QgsLineString, empty for empty or not linestring-geometries
+        """
+        abstr_geom = in_geom.constGet()
+        if isinstance(abstr_geom, qgis.core.QgsLineString):
+            return [abstr_geom]
+        elif isinstance(abstr_geom, qgis.core.QgsMultiLineString):
+            return [abstr_geom.geometryN(part_idx) for part_idx in range(abstr_geom.numGeometries())]
+        return []
+
+    @property
+    def num_vertices(self) -> int:
+        return self.x.size
+
+    @property
+    def length(self) -> float:
+        """2D-length, same as QgsGeometry.length()"""
+        if self.num_vertices:
+            return float(self.cum_len[-1])
+        return 0.0
+
+    @property
+    def first_m(self) -> float | None:
+        """M-value of first vertex, None if not M-enabled"""
+        if self.has_m and self.num_vertices:
+            return float(self.m[0])
+
+    @property
+    def last_m(self) -> float | None:
+        """M-value of last vertex, None if not M-enabled"""
+        if self.has_m and self.num_vertices:
+            return float(self.m[-1])
+
+    @property
+    def m_strictly_ascending(self) -> bool:
+        """vertex-M-values strictly ascending inside each part, calculated once per RouteIndex
+        replacement for spatialite ST_IsValidTrajectory, which additionally requires single-parted geometries, see check_geom_m_valid
+        False if not M-enabled, less than two vertices or any NaN-M-value
+        """
+        if self._m_strictly_ascending is None:
+            if self.has_m and self.num_vertices > 1:
+                delta_m = np.diff(self.m)
+                # the steps from the last vertex of a part to the first vertex of the next part are not checked
+                delta_m = np.delete(delta_m, self.part_starts[1:] - 1)
+                # NaN > 0 is False
+                self._m_strictly_ascending = bool(np.all(delta_m > 0))
+            else:
+                self._m_strictly_ascending = False
+        return self._m_strictly_ascending
+
+    @property
+    def merged_route_index(self) -> RouteIndex | None:
+        """RouteIndex of the single-parted merged geometry for N-stationing, calculated once per RouteIndex
+        single-parted geometries: self
+        multi-parted geometries: RouteIndex of QgsGeometry.mergeLines(), which possibly alters order and direction of the parts
+        None, if the parts are not mergeable to one LineString (gaps, branches)
+        """
+        if not self._merged_checked:
+            if self.num_parts <= 1:
+                self._merged_route_index = self
+            else:
+                merged_geom = self._in_geom.mergeLines()
+                if isinstance(merged_geom.constGet(), qgis.core.QgsLineString):
+                    self._merged_route_index = RouteIndex(merged_geom)
+            self._merged_checked = True
+        return self._merged_route_index
+
+    def _interpolate(self, key_array: np.ndarray, values) -> tuple:
+        """binary search (np.searchsorted) of values inside the ascending key_array
+        :param key_array: self.cum_len or self.m, values ascending (not necessarily strictly, f.e. part-gaps in self.cum_len)
+        :param values: scalar or array of search-values, expected inside range key_array[0]...key_array[-1]
+        :returns: tuple(idx_before, idx_after, fract) => arrays, interpolated values = vertex_before + fract * (vertex_after - vertex_before)
+        """
+        values = np.asarray(values, dtype=float)
+        # side='left' => first matching vertex, so a search-value at a part-gap returns the last vertex of the previous part
+        idx_after = np.clip(np.searchsorted(key_array, values, side='left'), 1, key_array.size - 1)
+        idx_before = idx_after - 1
+        delta = key_array[idx_after] - key_array[idx_before]
+        # zero-length-segments: no interpolation, take vertex before
+        fract = np.divide(values - key_array[idx_before], delta, out=np.zeros_like(delta), where=delta > 0)
+        fract = np.clip(fract, 0, 1)
+        return idx_before, idx_after, fract
+
+    def _vertex_values(self, idx_before: np.ndarray, idx_after: np.ndarray, fract: np.ndarray, with_z: bool = True, with_m: bool = True) -> tuple:
+        """linear interpolation of all vertex-arrays
+        :param with_z: False => z not interpolated, NaN
+        :param with_m: False => m not interpolated, NaN
+        :returns: tuple(x, y, z, m, n) of arrays, z/m NaN if not Z/M-enabled
+        """
+        x = self.x[idx_before] + fract * (self.x[idx_after] - self.x[idx_before])
+        y = self.y[idx_before] + fract * (self.y[idx_after] - self.y[idx_before])
+        z = self.z[idx_before] + fract * (self.z[idx_after] - self.z[idx_before]) if with_z else np.full_like(fract, np.nan)
+        m = self.m[idx_before] + fract * (self.m[idx_after] - self.m[idx_before]) if with_m else np.full_like(fract, np.nan)
+        n = self.cum_len[idx_before] + fract * (self.cum_len[idx_after] - self.cum_len[idx_before])
+        return x, y, z, m, n
+
+    def interpolate_m(self, stationing_m, with_z: bool = True, with_m: bool = True) -> tuple | None:
+        """M-stationed point(s), same as spatialite ST_TrajectoryInterpolatePoint + ST_Line_Locate_Point
+        requires a valid trajectory (single-parted, strictly ascending M-values, see check_geom_m_valid)
+        stationings outside range first-vertex-M...last-vertex-M are clamped to the first rsp. last vertex (same as spatialite)
+        :param stationing_m: scalar or array of M-stationings
+        :param with_z: False => z not interpolated, NaN
+        :param with_m: False => m not interpolated, NaN
+        :returns: tuple(x, y, z, m, n) scalars or arrays dependend on stationing_m, z NaN if not Z-enabled, None if not M-enabled or less than two vertices
+        """
+        if self.has_m and self.num_vertices > 1:
+            clamped_m = np.clip(stationing_m, self.m[0], self.m[-1])
+            x, y, z, m, n = self._vertex_values(*self._interpolate(self.m, clamped_m), with_z, with_m)
+            if np.ndim(stationing_m) == 0:
+                return float(x), float(y), float(z), float(m), float(n)
+            return x, y, z, m, n
+
+    def interpolate_n(self, stationing_n, with_z: bool = True, with_m: bool = True) -> tuple | None:
+        """N-stationed point(s), same as QgsGeometry.interpolate() with interpolated Z/M-values
+        stationings outside range 0...length are clamped to the first rsp. last vertex
+        :param stationing_n: scalar or array of N-stationings
+        :param with_z: False => z not interpolated, NaN
+        :param with_m: False => m not interpolated, NaN
+        :returns: tuple(x, y, z, m, n) scalars or arrays dependend on stationing_n, z/m NaN if not Z/M-enabled, None if less than two vertices
+        """
+        if self.num_vertices > 1:
+            clamped_n = np.clip(stationing_n, 0, self.cum_len[-1])
+            x, y, z, m, n = self._vertex_values(*self._interpolate(self.cum_len, clamped_n), with_z, with_m)
+            if np.ndim(stationing_n) == 0:
+                return float(x), float(y), float(z), float(m), float(n)
+            return x, y, z, m, n
+
+    def substrings_n(self, stationings_from, stationings_to) -> list:
+        """cuts many sub-lines stationing_from...stationing_to, same as QgsLineString.curveSubstring() with interpolated Z/M-values
+        the stationings are sorted, so the sub-lines are cut in one sweep along the vertex-arrays, identical sub-lines are cut only once
+        requires single-parted RouteIndex (f.e. built from QgsGeometry.mergeLines()), multi-parted ones would bridge the gaps
+        stationings outside range 0...length are clamped to the first rsp. last vertex
+        :param stationings_from: array of N-stationings, each <= stationings_to
+        :param stationings_to: array of N-stationings
+        :returns: list of QgsLineString in order of the input-stationings, None for NaN-stationings or less than two vertices
+        """
+        stationings_from = np.asarray(stationings_from, dtype=float)
+        stationings_to = np.asarray(stationings_to, dtype=float)
+        substrings = [None] * stationings_from.size
+
+        if self.num_vertices > 1:
+            is_valid = ~(np.isnan(stationings_from) | np.isnan(stationings_to))
+            valid_idx = np.flatnonzero(is_valid)
+            n_from = np.clip(stationings_from[valid_idx], 0, self.cum_len[-1])
+            n_to = np.clip(stationings_to[valid_idx], 0, self.cum_len[-1])
+
+            # interpolated start- and end-points
+            start_x, start_y, start_z, start_m, start_n = self._vertex_values(*self._interpolate(self.cum_len, n_from))
+            end_x, end_y, end_z, end_m, end_n = self._vertex_values(*self._interpolate(self.cum_len, n_to))
+
+            # range of the vertices between start- and end-point: n_from < cum_len < n_to
+            first_inner_idx = np.searchsorted(self.cum_len, n_from, side='right')
+            last_inner_idx = np.searchsorted(self.cum_len, n_to, side='left')
+
+            last_key = last_substring = None
+            for sort_idx in np.lexsort((n_to, n_from)):
+                key = (n_from[sort_idx], n_to[sort_idx])
+                if key != last_key:
+                    inner = slice(first_inner_idx[sort_idx], max(first_inner_idx[sort_idx], last_inner_idx[sort_idx]))
+                    x = np.concatenate(([start_x[sort_idx]], self.x[inner], [end_x[sort_idx]]))
+                    y = np.concatenate(([start_y[sort_idx]], self.y[inner], [end_y[sort_idx]]))
+                    # empty Z/M-lists => QgsLineString without Z/M
+                    z = np.concatenate(([start_z[sort_idx]], self.z[inner], [end_z[sort_idx]])).tolist() if self.has_z else []
+                    m = np.concatenate(([start_m[sort_idx]], self.m[inner], [end_m[sort_idx]])).tolist() if self.has_m else []
+                    last_substring = qgis.core.QgsLineString(x.tolist(), y.tolist(), z, m)
+                    last_key = key
+                    substrings[valid_idx[sort_idx]] = last_substring
+                else:
+                    substrings[valid_idx[sort_idx]] = last_substring.clone()
+
+        return substrings
+
+    def _get_seg_arrays(self) -> tuple:
+        """start-coordinates, deltas and squared lengths of all segments, gaps between parts excluded
+        :returns: tuple(x0, y0, dx, dy, len_sq, is_gap)
+        """
+        if self._seg_arrays is None:
+            x0 = self.x[:-1]
+            y0 = self.y[:-1]
+            dx = np.diff(self.x)
+            dy = np.diff(self.y)
+            len_sq = dx * dx + dy * dy
+            # segment i connects vertex i and vertex i + 1, gap if vertex i + 1 is the first vertex of a part
+            is_gap = np.zeros(dx.size, dtype=bool)
+            is_gap[self.part_starts[1:] - 1] = True
+            self._seg_arrays = (x0, y0, dx, dy, len_sq, is_gap)
+        return self._seg_arrays
+
+    def locate_point(self, x: float, y: float) -> float | None:
+        """N-stationing of the point on the reference-geometry nearest to x/y, same as QgsGeometry.lineLocatePoint()
+        :param x: coordinates in the projection of the reference-geometry
+        :param y:
+        :returns: N-stationing, None if less than two vertices
+        """
+        if self.num_vertices > 1:
+            x0, y0, dx, dy, len_sq, is_gap = self._get_seg_arrays()
+            fract = np.divide((x - x0) * dx + (y - y0) * dy, len_sq, out=np.zeros_like(len_sq), where=len_sq > 0)
+            fract = np.clip(fract, 0, 1)
+            dist_sq = (x0 + fract * dx - x) ** 2 + (y0 + fract * dy - y) ** 2
+            dist_sq[is_gap] = np.inf
+            # first nearest segment
+            seg_idx = int(np.argmin(dist_sq))
+            return float(self.cum_len[seg_idx] + fract[seg_idx] * (self.cum_len[seg_idx + 1] - self.cum_len[seg_idx]))
+
+    def point_geom(self, x: float, y: float, z: float, m: float) -> qgis.core.QgsGeometry:
+        """creates a point-geometry with the Z/M-dimensions of the reference-geometry
+        :returns: QgsGeometry Point/PointZ/PointM/PointZM
+        """
+        # QgsPoint-constructor derives the wkbType from the not-NaN-values
+        return qgis.core.QgsGeometry(qgis.core.QgsPoint(x, y, z if self.has_z else math.nan, m if self.has_m else math.nan))
+
+
+def get_geometry_version(layer_id: str, fid: int) -> tuple:
+    """current version of a reference-feature-geometry, changed with each invalidate_route_index for this feature or layer
+    usable as part of cache-keys for values derived from the reference-geometry
+    :returns: tuple(global_version, layer_version, feature_version)
+    """
+    with _route_index_lock:
+        return _global_version, _layer_versions.get(layer_id, 0), _feature_versions.get((layer_id, fid), 0)
+
+
+def get_route_index(in_geom: qgis.core.QgsGeometry, layer_id: str = None, fid: int = None) -> RouteIndex:
+    """returns the cached RouteIndex for a reference-feature or builds and caches a new one
+    :param in_geom: reference-geometry, only used, if there is no cached RouteIndex for the current geometry-version
+    :param layer_id: ID of the reference-layer
+    :param fid: fid of the reference-feature
+    without layer_id/fid (f.e. cached geometries for post-processing) and for uncommitted features (negative fid) a not-cached RouteIndex is returned
+    """
+    if layer_id is None or fid is None or fid < 0:
+        return RouteIndex(in_geom)
+
+    cache_key = (layer_id, fid)
+    with _route_index_lock:
+        geometry_version = get_geometry_version(layer_id, fid)
+        route_index = _route_index_cache.get(cache_key)
+        if route_index is not None and route_index.geometry_version == geometry_version:
+            _route_index_cache.move_to_end(cache_key)
+            return route_index
+
+    # built outside the lock, so parallel render-threads are not blocked by the vertex-array-construction
+    route_index = RouteIndex(in_geom)
+    route_index.geometry_version = geometry_version
+    with _route_index_lock:
+        # not cached, if the geometry was invalidated in the meantime
+        if get_geometry_version(layer_id, fid) == geometry_version:
+            _route_index_cache[cache_key] = route_index
+            while len(_route_index_cache) > max_route_index_cache_size:
+                _route_index_cache.popitem(last=False)
+
+    return route_index
+
+
+def invalidate_route_index(layer_id: str = None, fid: int = None):
+    """removes cached RouteIndex-instances and increments the geometry-version, called on geometry-edits in the reference-layer
+    :param layer_id: without: clear complete cache
+    :param fid: without: remove all cached features of this layer
+    """
+    global _global_version
+    with _route_index_lock:
+        if layer_id is None:
+            _global_version += 1
+            _route_index_cache.clear()
+        elif fid is None:
+            _layer_versions[layer_id] = _layer_versions.get(layer_id, 0) + 1
+            for cache_key in [cache_key for cache_key in _route_index_cache if cache_key[0] == layer_id]:
+                del _route_index_cache[cache_key]
+        else:
+            _feature_versions[(layer_id, fid)] = _feature_versions.get((layer_id, fid), 0) + 1
+            _route_index_cache.pop((layer_id, fid), None)
@@ -0,0 +1,267 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+********************************************************************
+
+* Part of the QGis-Plugin LinearReferencing:
+* bulk-location of points on the features of a reference-layer
+
+********************************************************************
+
+* Date                 : 2026-10-17
+* Copyright            : (C) 2026 by Ludwig Kniprath
+* Email                : ludwig at kni minus online dot de
+
+********************************************************************
+
+this program is free software; you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation; either version 2 of the License, or
+(at your option) any later version.
+
+.. note::
+    * usage in python console:
+    * from LinearReferencing.tools.RouteLocator import RouteLocator
+    * route_locator = RouteLocator(iface.activeLayer())
+    * located_points = route_locator.locate([x_1, x_2...], [y_1, y_2...], 10)
+    * for located_points in route_locator.locate_stream(((x, y) for x, y in some_csv_reader), 10): ...
+
+********************************************************************
+"""
+from __future__ import annotations
+import collections
+import itertools
+import typing
+import qgis
+import numpy as np
+from LinearReferencing.i18n.SQLiteDict import SQLiteDict
+from LinearReferencing.tools.RouteIndex import RouteIndex
+from LinearReferencing.tools.MyTools import get_linestring_layers
+
+# global variable
+# get language-dependend error-messages
+MY_DICT = SQLiteDict()
+
+# columnar result of RouteLocator.locate, one item per point in order of the input-points
+# ref_fid -1 and all other values NaN, where not is_valid (no reference-feature inside tolerance)
+# offset: signed lateral distance, positive left, negative right of the reference-line (same as offsetCurve)
+LocatedPoints = collections.namedtuple('LocatedPoints', ['ref_fid', 'n_abs', 'm_abs', 'offset', 'distance', 'is_valid'])
+
+
+class RouteLocator:
+    """nearest-reference-feature-search for many points, f.e. GPS- or inspection-points
+    replacement for the interactive location via canvas-snapping (PoLFeature.snap_to_layer) rsp. a known ref_fid (PoLFeature.line_locate_event)
+    the segments of all reference-features are stored in NumPy-arrays and indexed chunk-wise in a QgsSpatialIndex
+    the points are bucketed in grid-cells, one spatial-index-query per occupied cell,
+    the distances of all points of a cell to all segments of the found chunks are calculated as one NumPy-matrix
+    """
+
+    # number of consecutive segments of a reference-feature indexed together as one rectangle in the QgsSpatialIndex
+    # small values => exact pre-selection but large index, large values => small index but more segments to evaluate per point
+    segment_chunk_size = 32
+
+    # max. number of point-segment-pairs evaluated in one NumPy-operation, limits the memory for cells with many points
+    max_matrix_size = 1000000
+
+    # validity
+    is_valid = False
+
+    # reason for not is_valid
+    last_error = 'not_initialized'
+
+    def __init__(self, reference_layer: qgis.core.QgsVectorLayer, feature_request: qgis.core.QgsFeatureRequest = None):
+        """constructor, reads all reference-features and builds the spatial index
+        :param reference_layer: one of get_linestring_layers(), the current subsetString is respected
+        :param feature_request: optional request to restrict the reference-features (f.e. filter-expression), geometries are required
+        """
+        self.reference_layer = reference_layer
+
+        # segment-arrays of all reference-features concatenated, gaps between the parts of multi-linestrings excluded
+        self._seg_fid = np.empty(0, dtype=np.int64)
+        self._seg_x0 = self._seg_y0 = self._seg_dx = self._seg_dy = self._seg_len_sq = np.empty(0)
+        self._seg_n0 = self._seg_n1 = self._seg_m0 = self._seg_m1 = np.empty(0)
+
+        # chunk-id (== index in these lists) => range of segments
+        self._chunk_first_seg = np.empty(0, dtype=np.int64)
+        self._chunk_last_seg = np.empty(0, dtype=np.int64)
+
+        # edge-length of the grid-cells for the point-bucketing in locate, median extent of the chunk-rectangles
+        self._cell_size = 0
+
+        self._spatial_index = qgis.core.QgsSpatialIndex()
+
+        if reference_layer.id() in get_linestring_layers():
+            if feature_request is None:
+                feature_request = qgis.core.QgsFeatureRequest()
+            feature_request.setNoAttributes()
+            self._build(reference_layer.getFeatures(feature_request))
+            self.is_valid = True
+            self.last_error = ''
+        else:
+            self.is_valid = False
+            self.last_error = MY_DICT.tr('exc_reference_layer_type_not_suitable', reference_layer.type())
+
+    def _build(self, reference_features: qgis.core.QgsFeatureIterator):
+        """reads the vertices of all reference-features and fills segment-arrays and spatial index
+        :param reference_features:
+        """
+        seg_arrays = collections.defaultdict(list)
+        chunk_first_seg = []
+        chunk_last_seg = []
+        chunk_extents = []
+        num_segments = 0
+        for reference_feature in reference_features:
+            if reference_feature.hasGeometry():
+                route_index = RouteIndex(reference_feature.geometry())
+                if route_index.num_vertices > 1:
+                    # segment i connects vertex i and vertex i + 1, segments bridging the gaps between the parts are removed
+                    seg_valid = np.ones(route_index.num_vertices - 1, dtype=bool)
+                    seg_valid[route_index.part_starts[1:] - 1] = False
+                    seg_start = np.flatnonzero(seg_valid)
+                    seg_end = seg_start + 1
+
+                    seg_arrays['fid'].append(np.full(seg_start.size, reference_feature.id(), dtype=np.int64))
+                    seg_arrays['x0'].append(route_index.x[seg_start])
+                    seg_arrays['y0'].append(route_index.y[seg_start])
+                    seg_arrays['x1'].append(route_index.x[seg_end])
+                    seg_arrays['y1'].append(route_index.y[seg_end])
+                    seg_arrays['n0'].append(route_index.cum_len[seg_start])
+                    seg_arrays['n1'].append(route_index.cum_len[seg_end])
+                    seg_arrays['m0'].append(route_index.m[seg_start])
+                    seg_arrays['m1'].append(route_index.m[seg_end])
+
+                    # chunks never span two reference-features
+                    for first_seg in range(0, seg_start.size, self.segment_chunk_size):
+                        last_seg = min(first_seg + self.segment_chunk_size, seg_start.size)
+                        chunk_x = np.concatenate((route_index.x[seg_start[first_seg:last_seg]], route_index.x[seg_end[first_seg:last_seg]]))
+                        chunk_y = np.concatenate((route_index.y[seg_start[first_seg:last_seg]], route_index.y[seg_end[first_seg:last_seg]]))
+                        chunk_rect = qgis.core.QgsRectangle(float(chunk_x.min()), float(chunk_y.min()), float(chunk_x.max()), float(chunk_y.max()))
+                        self._spatial_index.addFeature(len(chunk_first_seg), chunk_rect)
+                        chunk_extents.append(max(chunk_rect.width(), chunk_rect.height()))
+                        chunk_first_seg.append(num_segments + first_seg)
+                        chunk_last_seg.append(num_segments + last_seg)
+
+                    num_segments += seg_start.size
+
+        if num_segments:
+            self._seg_fid = np.concatenate(seg_arrays['fid'])
+            self._seg_x0 = np.concatenate(seg_arrays['x0'])
+            self._seg_y0 = np.concatenate(seg_arrays['y0'])
+            self._seg_dx = np.concatenate(seg_arrays['x1']) - self._seg_x0
+            self._seg_dy = np.concatenate(seg_arrays['y1']) - self._seg_y0
+            self._seg_len_sq = self._seg_dx * self._seg_dx + self._seg_dy * self._seg_dy
+            self._seg_n0 = np.concatenate(seg_arrays['n0'])
+            self._seg_n1 = np.concatenate(seg_arrays['n1'])
+            self._seg_m0 = np.concatenate(seg_arrays['m0'])
+            self._seg_m1 = np.concatenate(seg_arrays['m1'])
+            self._chunk_first_seg = np.array(chunk_first_seg, dtype=np.int64)
+            self._chunk_last_seg = np.array(chunk_last_seg, dtype=np.int64)
+            self._cell_size = float(np.median(chunk_extents))
+
+    @property
+    def num_segments(self) -> int:
+        return self._seg_fid.size
+
+    def _candidate_segments(self, x_min: float, y_min: float, x_max: float, y_max: float) -> np.ndarray:
+        """indices of the segments inside the chunks intersecting the rectangle
+        :returns: int-array, empty if no chunk intersects
+        """
+        chunk_ids = np.array(self._spatial_index.intersects(qgis.core.QgsRectangle(x_min, y_min, x_max, y_max)), dtype=np.int64)
+        if chunk_ids.size:
+            # concatenated ranges first_seg...last_seg of the chunks without python-loop
+            first_segs = self._chunk_first_seg[chunk_ids]
+            num_segs = self._chunk_last_seg[chunk_ids] - first_segs
+            range_starts = np.cumsum(num_segs) - num_segs
+            return np.repeat(first_segs - range_starts, num_segs) + np.arange(num_segs.sum())
+        return np.empty(0, dtype=np.int64)
+
+    def _locate_on_segments(self, points_x: np.ndarray, points_y: np.ndarray, seg_idx: np.ndarray) -> tuple:
+        """nearest of the segments seg_idx for each point, distances calculated as matrix points x segments
+        :returns: tuple(nearest_seg, nearest_fract, nearest_dist, side) arrays, one item per point, side +1 left, -1 right of the segment
+        """
+        x = points_x[:, np.newaxis]
+        y = points_y[:, np.newaxis]
+        x0 = self._seg_x0[seg_idx]
+        y0 = self._seg_y0[seg_idx]
+        dx = self._seg_dx[seg_idx]
+        dy = self._seg_dy[seg_idx]
+        len_sq = self._seg_len_sq[seg_idx]
+        # projection of the points on all candidate-segments
+        fract = np.divide((x - x0) * dx + (y - y0) * dy, len_sq, out=np.zeros((points_x.size, seg_idx.size)), where=len_sq > 0)
+        fract = np.clip(fract, 0, 1)
+        dist_sq = (x0 + fract * dx - x) ** 2 + (y0 + fract * dy - y) ** 2
+
+        point_range = np.arange(points_x.size)
+        nearest = np.argmin(dist_sq, axis=1)
+        nearest_seg = seg_idx[nearest]
+        nearest_fract = fract[point_range, nearest]
+        nearest_dist = np.sqrt(dist_sq[point_range, nearest])
+        # cross-product segment-direction x segment-start=>point: positive => point left of the segment, points on the segment count as left
+        side = np.sign(self._seg_dx[nearest_seg] * (points_y - self._seg_y0[nearest_seg]) - self._seg_dy[nearest_seg] * (points_x - self._seg_x0[nearest_seg]))
+        side[side == 0] = 1
+        return nearest_seg, nearest_fract, nearest_dist, side
+
+    def locate(self, points_x: typing.Iterable, points_y: typing.Iterable, tolerance: float) -> LocatedPoints:
+        """nearest reference-feature, stationings and lateral offset for each point
+        :param points_x: list/array of x-coordinates, projection of the reference-layer
+        :param points_y: list/array of y-coordinates, same size
+        :param tolerance: max. distance point => reference-feature in reference-layer-units
+        :returns: LocatedPoints
+        """
+        points_x = np.asarray(points_x, dtype=float)
+        points_y = np.asarray(points_y, dtype=float)
+
+        ref_fid = np.full(points_x.size, -1, dtype=np.int64)
+        n_abs, m_abs, offset, distance = (np.full(points_x.size, np.nan) for _ in range(4))
+
+        point_idx = np.flatnonzero(np.isfinite(points_x) & np.isfinite(points_y))
+        if self.num_segments and point_idx.size:
+            # bucketing of the points in grid-cells, at least tolerance, so the cell-rectangle + tolerance finds few chunks
+            cell_size = max(self._cell_size, tolerance, 1e-9)
+            cell_x = np.floor(points_x[point_idx] / cell_size).astype(np.int64)
+            cell_y = np.floor(points_y[point_idx] / cell_size).astype(np.int64)
+            cell_order = np.lexsort((cell_y, cell_x))
+            point_idx = point_idx[cell_order]
+            cell_x = cell_x[cell_order]
+            cell_y = cell_y[cell_order]
+            cell_starts = np.flatnonzero(np.diff(cell_x, prepend=cell_x[0] - 1) | np.diff(cell_y, prepend=cell_y[0] - 1))
+            cell_ends = np.append(cell_starts[1:], point_idx.size)
+
+            for cell_start, cell_end in zip(cell_starts.tolist(), cell_ends.tolist()):
+                # one spatial-index-query for all points of the cell
+                x_min = cell_x[cell_start] * cell_size
+                y_min = cell_y[cell_start] * cell_size
+                seg_idx = self._candidate_segments(x_min - tolerance, y_min - tolerance, x_min + cell_size + tolerance, y_min + cell_size + tolerance)
+                if seg_idx.size:
+                    block_size = max(1, self.max_matrix_size // seg_idx.size)
+                    for block_start in range(cell_start, cell_end, block_size):
+                        block_idx = point_idx[block_start:min(block_start + block_size, cell_end)]
+                        nearest_seg, nearest_fract, nearest_dist, side = self._locate_on_segments(points_x[block_idx], points_y[block_idx], seg_idx)
+
+                        inside = nearest_dist <= tolerance
+                        block_idx = block_idx[inside]
+                        nearest_seg = nearest_seg[inside]
+                        nearest_fract = nearest_fract[inside]
+                        ref_fid[block_idx] = self._seg_fid[nearest_seg]
+                        n_abs[block_idx] = self._seg_n0[nearest_seg] + nearest_fract * (self._seg_n1[nearest_seg] - self._seg_n0[nearest_seg])
+                        # NaN if the reference-layer is not M-enabled
+                        m_abs[block_idx] = self._seg_m0[nearest_seg] + nearest_fract * (self._seg_m1[nearest_seg] - self._seg_m0[nearest_seg])
+                        distance[block_idx] = nearest_dist[inside]
+                        offset[block_idx] = nearest_dist[inside] * side[inside]
+
+        return LocatedPoints(ref_fid, n_abs, m_abs, offset, distance, ref_fid >= 0)
+
+    def locate_stream(self, points: typing.Iterable, tolerance: float, chunk_size: int = 10000) -> typing.Iterator:
+        """chunk-wise version of locate for large or streamed inputs (f.e. csv-reader, QgsFeatureIterator), only one chunk is held in memory
+        :param points: iterable of tuple(x, y), projection of the reference-layer
+        :param tolerance: max. distance point => reference-feature in reference-layer-units
+        :param chunk_size: number of points per yielded result
+        :returns: generator of LocatedPoints, one per chunk, in order of the input-points
+        """
+        points = iter(points)
+        while True:
+            chunk = list(itertools.islice(points, chunk_size))
+            if not chunk:
+                break
+            points_x, points_y = zip(*chunk)
+            yield self.locate(points_x, points_y, tolerance)
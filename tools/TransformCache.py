@@ -0,0 +1,157 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+********************************************************************
+
+* Part of the QGis-Plugin LinearReferencing:
+* shared cache for coordinate-reference-systems and coordinate-transforms
+
+********************************************************************
+
+* Date                 : 2026-10-17
+* Copyright            : (C) 2026 by Ludwig Kniprath
+* Email                : ludwig at kni minus online dot de
+
+********************************************************************
+
+this program is free software; you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation; either version 2 of the License, or
+(at your option) any later version.
+
+.. note::
+    * usage in python console:
+    * from LinearReferencing.tools.TransformCache import get_transform, get_canvas_crs, transform_coords
+    * point_geom.transform(get_transform(iface.activeLayer().crs(), get_canvas_crs()))
+    * x_array, y_array = transform_coords([x_1, x_2...], [y_1, y_2...], 'EPSG:25832', get_canvas_crs())
+
+********************************************************************
+"""
+from __future__ import annotations
+import typing
+import qgis
+import numpy as np
+
+# cached QgsCoordinateReferenceSystem, key: authid rsp. WKT for CRS without authid
+_crs_cache = {}
+
+# cached QgsCoordinateTransform, key: tuple(source-key, destination-key), keys see _get_crs_key
+_transform_cache = {}
+
+# cached destination-CRS of the map-canvas, None => not yet queried rsp. invalidated
+_canvas_crs = None
+
+# the canvas-signal destinationCrsChanged is connected on first usage of get_canvas_crs
+_canvas_connected = False
+
+# the project-signals transformContextChanged (datum-transformations edited, project loaded) and cleared are connected on first usage of get_transform
+# the cached transforms keep the transform-context of the project at their creation
+_project_signals = ['transformContextChanged', 'cleared']
+_project_connected = False
+
+
+def _get_crs_key(crs: typing.Union[qgis.core.QgsCoordinateReferenceSystem, str]) -> str:
+    """cache-key for crs
+    :param crs: QgsCoordinateReferenceSystem or authid, f.e. 'EPSG:25832'
+    :returns: authid, WKT for custom CRS without authid
+    """
+    if isinstance(crs, str):
+        return crs
+    return crs.authid() or crs.toWkt()
+
+
+def get_crs(crs: typing.Union[qgis.core.QgsCoordinateReferenceSystem, str]) -> qgis.core.QgsCoordinateReferenceSystem:
+    """cached QgsCoordinateReferenceSystem, replacement for QgsCoordinateReferenceSystem(authid) which queries the srs-database on every call
+    :param crs: QgsCoordinateReferenceSystem or authid, f.e. 'EPSG:25832'
+    """
+    crs_key = _get_crs_key(crs)
+    if crs_key not in _crs_cache:
+        _crs_cache[crs_key] = qgis.core.QgsCoordinateReferenceSystem(crs)
+    return _crs_cache[crs_key]
+
+
+def get_transform(source_crs: typing.Union[qgis.core.QgsCoordinateReferenceSystem, str], destination_crs: typing.Union[qgis.core.QgsCoordinateReferenceSystem, str]) -> qgis.core.QgsCoordinateTransform:
+    """cached QgsCoordinateTransform with the transform-context of the current project
+    replacement for QgsCoordinateTransform(source_crs, destination_crs, QgsProject.instance()), which creates a new proj-pipeline on every call
+    invalidated by the project-signals transformContextChanged and cleared
+    :param source_crs: QgsCoordinateReferenceSystem or authid
+    :param destination_crs: QgsCoordinateReferenceSystem or authid
+    """
+    global _project_connected
+    if not _project_connected:
+        for conn_signal in _project_signals:
+            getattr(qgis.core.QgsProject.instance(), conn_signal).connect(invalidate_transforms)
+        _project_connected = True
+    transform_key = (_get_crs_key(source_crs), _get_crs_key(destination_crs))
+    if transform_key not in _transform_cache:
+        _transform_cache[transform_key] = qgis.core.QgsCoordinateTransform(get_crs(source_crs), get_crs(destination_crs), qgis.core.QgsProject.instance())
+    return _transform_cache[transform_key]
+
+
+def get_canvas_crs() -> qgis.core.QgsCoordinateReferenceSystem:
+    """cached destination-CRS of the map-canvas, replacement for iface.mapCanvas().mapSettings().destinationCrs()
+    invalidated by the canvas-signal destinationCrsChanged
+    """
+    global _canvas_crs, _canvas_connected
+    if _canvas_crs is None:
+        canvas = qgis.utils.iface.mapCanvas()
+        if not _canvas_connected:
+            canvas.destinationCrsChanged.connect(invalidate_canvas_crs)
+            _canvas_connected = True
+        _canvas_crs = canvas.mapSettings().destinationCrs()
+    return _canvas_crs
+
+
+def invalidate_canvas_crs():
+    """slot for canvas destinationCrsChanged, the transforms are keyed by authid and stay valid"""
+    global _canvas_crs
+    _canvas_crs = None
+
+
+def invalidate_transforms():
+    """clears all cached CRS and transforms, f.e. on layer crsChanged (possibly changed custom CRS rsp. datum-transformations)
+    slot for the project-signals transformContextChanged and cleared
+    """
+    global _canvas_crs
+    _canvas_crs = None
+    _crs_cache.clear()
+    _transform_cache.clear()
+
+
+def close_transform_cache():
+    """clears the caches and disconnects the canvas- and project-signals, called on plugin-unload"""
+    global _canvas_connected, _project_connected
+    invalidate_transforms()
+    if _project_connected:
+        for conn_signal in _project_signals:
+            try:
+                getattr(qgis.core.QgsProject.instance(), conn_signal).disconnect(invalidate_transforms)
+            except TypeError:
+                # already disconnected
+                pass
+        _project_connected = False
+    if _canvas_connected:
+        try:
+            qgis.utils.iface.mapCanvas().destinationCrsChanged.disconnect(invalidate_canvas_crs)
+        except TypeError:
+            # already disconnected
+            pass
+        _canvas_connected = False
+
+
+def transform_coords(x_coords: typing.Iterable, y_coords: typing.Iterable, source_crs: typing.Union[qgis.core.QgsCoordinateReferenceSystem, str], destination_crs: typing.Union[qgis.core.QgsCoordinateReferenceSystem, str]) -> tuple:
+    """batch-transformation of coordinate-arrays with one call into QGis instead of one QgsGeometry.transform per point
+    Note: QgsCoordinateTransform.transformCoords with its pointer-arguments is not usable from python, the coordinates are transformed as vertices of one QgsLineString
+    :param x_coords: list/array of x-coordinates
+    :param y_coords: list/array of y-coordinates, same size
+    :param source_crs: QgsCoordinateReferenceSystem or authid
+    :param destination_crs: QgsCoordinateReferenceSystem or authid
+    :returns: tuple(x-array, y-array) dtype float
+    """
+    x_coords = np.asarray(x_coords, dtype=float)
+    y_coords = np.asarray(y_coords, dtype=float)
+    if x_coords.size and _get_crs_key(source_crs) != _get_crs_key(destination_crs):
+        vertices = qgis.core.QgsLineString(x_coords.tolist(), y_coords.tolist())
+        vertices.transform(get_transform(source_crs, destination_crs))
+        return np.array(vertices.xVector(), dtype=float), np.array(vertices.yVector(), dtype=float)
+    return x_coords, y_coords
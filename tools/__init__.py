@@ -1,2 +1,10 @@
 from LinearReferencing.tools import MyDebugFunctions
 from LinearReferencing.tools import MyTools
+from LinearReferencing.tools import EventTable
+from LinearReferencing.tools import RouteIndex
+from LinearReferencing.tools import RouteLocator
+from LinearReferencing.tools import TransformCache
+from LinearReferencing.tools import GeometryCache
+from LinearReferencing.tools import FeatureIndex
+from LinearReferencing.tools import MaterializedShowLayer
+from LinearReferencing.tools import ExpressionFunctions